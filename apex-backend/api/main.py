@@ -1,16 +1,35 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import asyncio
 import json
 import time
 import sys
 import os
+from dataclasses import asdict
+
+IMPORT_STARTED = time.perf_counter()
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aioredis
+
+from runtime.snapshots import read_snapshot, read_snapshots, merge_scanner_stats
+from runtime.leader import LeaderElection
+from runtime.warmup import Warmup, DONE, FAILED, SKIPPED
+from runtime import archive
+from executor.journal import TradeJournal, KIND_OPEN, KIND_CLOSE
 
-from scanner.hyperscan import scanner
-from brain.ai_predictor import predictor
-from executor.trade_executor import executor
+ROLE = os.getenv('APEX_ROLE', 'auto')
+snapshot_redis = None
+local_engines = False
+election = None
+engine_tasks = set()
+scanner = predictor = executor = None
+trade_journal = TradeJournal(os.getenv('JOURNAL_DIR', 'data/journal'))
+warmup = Warmup(['imports', 'redis', 'scanner', 'predictor', 'executor', 'model'])
+warmup.mark('imports', DONE, time.perf_counter() - IMPORT_STARTED)
 
 app = FastAPI()
 
@@ -49,10 +68,88 @@ manager = ConnectionManager()
 
 @app.on_event("startup")
 async def startup():
-    await scanner.init()
-    await predictor.init()
-    await executor.init()
+    global snapshot_redis, local_engines, election
+    async with warmup.stage('redis'):
+        try:
+            snapshot_redis = aioredis.from_url("redis://localhost:6379")
+            await snapshot_redis.ping()
+        except:
+            snapshot_redis = None
+        
+    if snapshot_redis is None and ROLE == 'api':
+        warmup.mark('redis', FAILED, error="Redis unavailable, API-only workers do not run engines")
+        for name in ('scanner', 'predictor', 'executor', 'model'):
+            warmup.mark(name, SKIPPED)
+        asyncio.create_task(reconnect_redis())
+    elif snapshot_redis is None:
+        local_engines = True
+        asyncio.create_task(start_engines())
+    else:
+        for name in ('scanner', 'predictor', 'executor', 'model'):
+            warmup.mark(name, SKIPPED)
+        if ROLE != 'api':
+            election = LeaderElection(snapshot_redis)
+            asyncio.create_task(election.campaign(start_engines, stop_engines))
+        
     asyncio.create_task(broadcast_loop())
+    
+async def reconnect_redis():
+    global snapshot_redis
+    while snapshot_redis is None:
+        await asyncio.sleep(5)
+        try:
+            redis = aioredis.from_url("redis://localhost:6379")
+            await redis.ping()
+            snapshot_redis = redis
+            warmup.mark('redis', DONE)
+        except Exception as e:
+            pass
+    
+@app.on_event("shutdown")
+async def shutdown():
+    if election:
+        await election.release()
+    
+def load_engines():
+    global scanner, predictor, executor
+    from scanner.hyperscan import HyperScanner
+    from brain.ai_predictor import AIPredictor
+    from executor.trade_executor import TradeExecutor
+    scanner, predictor, executor = HyperScanner(), AIPredictor(), TradeExecutor()
+    
+async def start_engines():
+    existing = asyncio.all_tasks()
+    try:
+        load_engines()
+        if snapshot_redis is None:
+            scanner.position_source = executor.held_tokens
+        async with warmup.stage('scanner'):
+            await scanner.init()
+        async with warmup.stage('predictor'):
+            await predictor.init()
+        async with warmup.stage('executor'):
+            await executor.init()
+        async with warmup.stage('model'):
+            await asyncio.to_thread(predictor.inference.store.current)
+    finally:
+        engine_tasks.update(asyncio.all_tasks() - existing)
+    
+async def stop_engines():
+    global scanner, predictor, executor
+    for task in engine_tasks:
+        task.cancel()
+    await asyncio.gather(*engine_tasks, return_exceptions=True)
+    engine_tasks.clear()
+    if executor is None:
+        return
+    executor.journal.close()
+    for engine in (scanner, predictor, executor):
+        await engine.close()
+        if engine.archive:
+            engine.archive.flush()
+            await asyncio.to_thread(engine.archive.close)
+            engine.archive = None
+    scanner = predictor = executor = None
 
 async def broadcast_loop():
     while True:
@@ -98,27 +195,98 @@ async def api_stats():
 
 @app.get("/api/performance")
 async def api_performance():
-    return await executor.get_performance()
+    return await get_performance()
+
+@app.get("/api/ready")
+async def api_ready():
+    status = warmup.snapshot()
+    return JSONResponse(status, status_code=200 if status['ready'] else 503)
+
+@app.get("/api/leader")
+async def api_leader():
+    return {
+        'worker': election.token if election else None,
+        'is_leader': local_engines or bool(election and election.is_leader),
+        'leader': await election.current_leader() if election else None
+    }
+
+@app.get("/api/trades")
+async def api_trades(limit: int = 100, start: float = None, end: float = None):
+    if executor is not None:
+        return await executor.get_trade_history(min(limit, 1000), start, end)
+        
+    await asyncio.to_thread(trade_journal.refresh_index)
+    records = await asyncio.to_thread(trade_journal.query, start, end, (KIND_OPEN, KIND_CLOSE), min(limit, 1000), True)
+    return [payload['trade'] for kind, timestamp, payload in records]
+
+@app.get("/api/history")
+async def api_history(table: str = 'predictions', start: float = None, end: float = None, token: str = None,
+                      chain: str = None, strategy: str = None, columns: str = None, points: int = 500,
+                      limit: int = 5000):
+    if table not in archive.TABLES:
+        return JSONResponse({'error': f"unknown table {table}", 'tables': list(archive.TABLES)}, status_code=400)
+    end = end or time.time()
+    start = start or end - 3600
+    filters = {archive.KEY_COLUMNS[table]: token, 'chain': chain, 'strategy': strategy}
+    return await asyncio.to_thread(
+        archive.query, os.getenv('ARCHIVE_DIR', 'data/archive'), table, start, end,
+        columns.split(',') if columns else None, filters, points or None, min(limit, 20000)
+    )
+
+async def get_top_predictions(limit):
+    if local_engines:
+        return [asdict(p) for p in await predictor.get_top_predictions(limit)]
+        
+    snapshots = await read_snapshots(snapshot_redis, 'predictor:')
+    predictions = [p for snapshot in snapshots for p in snapshot['predictions']]
+    predictions.sort(key=lambda x: x['confidence'] * x['expected_return'], reverse=True)
+    return predictions[:limit]
+    
+async def get_positions():
+    if local_engines:
+        return [asdict(p) for p in await executor.get_positions()]
+        
+    snapshot = await read_snapshot(snapshot_redis, 'executor')
+    return snapshot['positions'] if snapshot else []
+    
+async def get_performance():
+    if local_engines:
+        return await executor.get_performance()
+        
+    snapshot = await read_snapshot(snapshot_redis, 'executor')
+    return snapshot['performance'] if snapshot else {}
+    
+async def get_scanner_stats():
+    if local_engines:
+        return await scanner.get_stats()
+        
+    return merge_scanner_stats(await read_snapshots(snapshot_redis, 'scanner:'))
+
+async def get_predictor_stats():
+    if local_engines:
+        return [predictor.get_stats()]
+        
+    return [snapshot['stats'] for snapshot in await read_snapshots(snapshot_redis, 'predictor:') if 'stats' in snapshot]
 
 async def get_buy_signals():
     try:
-        predictions = await predictor.get_top_predictions(20)
+        predictions = await get_top_predictions(20)
         signals = []
         
         for pred in predictions:
             signals.append({
-                'address': pred.token_address,
-                'symbol': f"TOKEN_{pred.token_address[:6]}",
-                'current_price': pred.entry_price,
-                'predicted_return': pred.expected_return,
-                'confidence': pred.confidence,
-                'urgency': min(int(pred.confidence * 10), 10),
-                'risk_score': pred.risk_score,
-                'social_score': pred.social_score,
-                'technical_score': pred.technical_score,
-                'whale_score': pred.whale_score,
-                'target_price': pred.target_price,
-                'time_horizon': pred.time_horizon
+                'address': pred['token_address'],
+                'symbol': f"TOKEN_{pred['token_address'][:6]}",
+                'current_price': pred['entry_price'],
+                'predicted_return': pred['expected_return'],
+                'confidence': pred['confidence'],
+                'urgency': min(int(pred['confidence'] * 10), 10),
+                'risk_score': pred['risk_score'],
+                'social_score': pred['social_score'],
+                'technical_score': pred['technical_score'],
+                'whale_score': pred['whale_score'],
+                'target_price': pred['target_price'],
+                'time_horizon': pred['time_horizon']
             })
             
         return signals
@@ -127,22 +295,22 @@ async def get_buy_signals():
 
 async def get_sell_signals():
     try:
-        positions = await executor.get_positions()
+        positions = await get_positions()
         signals = []
         
         for pos in positions:
             signals.append({
-                'address': pos.token_address,
-                'symbol': pos.symbol,
-                'entry_price': pos.entry_price,
-                'current_price': pos.current_price,
-                'pnl_percent': pos.pnl_percent,
-                'pnl_usd': pos.pnl_usd,
-                'amount_usd': pos.amount_usd,
-                'holding_time': int(time.time() - pos.entry_time),
-                'stop_loss': pos.stop_loss,
-                'take_profit': pos.take_profit,
-                'status': pos.status
+                'address': pos['token_address'],
+                'symbol': pos['symbol'],
+                'entry_price': pos['entry_price'],
+                'current_price': pos['current_price'],
+                'pnl_percent': pos['pnl_percent'],
+                'pnl_usd': pos['pnl_usd'],
+                'amount_usd': pos['amount_usd'],
+                'holding_time': int(time.time() - pos['entry_time']),
+                'stop_loss': pos['stop_loss'],
+                'take_profit': pos['take_profit'],
+                'status': pos['status']
             })
             
         return signals
@@ -151,8 +319,8 @@ async def get_sell_signals():
 
 async def get_system_stats():
     try:
-        scanner_stats = await scanner.get_stats()
-        performance = await executor.get_performance()
+        scanner_stats = await get_scanner_stats()
+        performance = await get_performance()
         
         return {
             'tokens_scanned': scanner_stats.get('tokens_scanned', 0),
@@ -162,7 +330,8 @@ async def get_system_stats():
             'total_pnl': performance.get('total_pnl', 0.0),
             'win_rate': performance.get('win_rate', 0.0),
             'total_trades': performance.get('total_trades', 0),
-            'uptime': scanner_stats.get('uptime_seconds', 0)
+            'uptime': scanner_stats.get('uptime_seconds', 0),
+            'predictors': await get_predictor_stats()
         }
     except Exception as e:
         return {}
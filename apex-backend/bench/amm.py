@@ -0,0 +1,48 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from executor.amm import AMMSimulator
+
+def bench_swaps(pools, swaps, seed):
+    rng = random.Random(seed)
+    amm = AMMSimulator(block_time=0)
+    tokens = [f"0x{i:040x}" for i in range(pools)]
+    for token in tokens:
+        amm.sync(token, rng.uniform(0.0001, 2), rng.uniform(10000, 500000))
+
+    orders = [(rng.choice(tokens), rng.uniform(1, 500), rng.random() < 0.5) for _ in range(swaps)]
+    started = time.perf_counter()
+    for token, amount, is_buy in orders:
+        if is_buy:
+            amm.buy(token, amount)
+        else:
+            amm.sell(token, amount / amm.price(token))
+    elapsed = time.perf_counter() - started
+    print(f"{swaps} swaps over {pools} pools in {elapsed * 1000:.0f}ms: {swaps / elapsed:,.0f} swaps/s")
+
+def slippage_table(liquidities, sizes):
+    amm = AMMSimulator(block_time=0)
+    print(f"{'liquidity':>12} " + ' '.join(f"{f'${size:,.0f}':>9}" for size in sizes))
+    for liquidity in liquidities:
+        impacts = []
+        for size in sizes:
+            amm.drop('token')
+            amm.sync('token', 1.0, liquidity)
+            impacts.append(amm.buy('token', size).price - 1)
+        print(f"{f'${liquidity:,.0f}':>12} " + ' '.join(f"{impact:>9.2%}" for impact in impacts))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the constant-product AMM simulator")
+    parser.add_argument('--pools', type=int, default=1000)
+    parser.add_argument('--swaps', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    bench_swaps(args.pools, args.swaps, args.seed)
+    print("\nEffective buy price premium (fee + impact) by pool liquidity and order size:")
+    slippage_table([10000, 50000, 250000, 1000000], [10, 100, 1000, 10000])
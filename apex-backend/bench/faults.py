@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner.providers import DexScreenerAdapter
+from bench.providers import dex_payload
+
+CHAINS = ['ethereum', 'bsc', 'polygon', 'arbitrum', 'base', 'solana']
+
+def build_app(rng, slow_rate, error_rate, outage_chain, body):
+    async def pairs(request):
+        chain = request.match_info['chain']
+        if chain == outage_chain:
+            await asyncio.sleep(30)
+        roll = rng.random()
+        if roll < error_rate:
+            return web.Response(status=503)
+        await asyncio.sleep(rng.uniform(1.0, 3.0) if roll < error_rate + slow_rate else rng.uniform(0.01, 0.03))
+        return web.Response(body=body, content_type='application/json')
+
+    app = web.Application()
+    app.router.add_get('/pairs/{chain}', pairs)
+    return app
+
+class StubDexAdapter(DexScreenerAdapter):
+    def __init__(self, base_url):
+        super().__init__(CHAINS)
+        self.base_url = base_url
+
+    def requests(self):
+        for chain in self.chains:
+            yield chain, f"{self.base_url}/pairs/{chain}"
+
+async def baseline_cycle(session, adapter):
+    try:
+        for chain, url in adapter.requests():
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=2)) as resp:
+                if resp.status == 200:
+                    adapter.parse(adapter.decode(await resp.read()), chain)
+    except Exception as e:
+        await asyncio.sleep(adapter.error_backoff)
+
+async def resilient_cycle(session, adapter):
+    adapter.rescore_interval = 0
+    async for chain, data in adapter.fetch(session):
+        adapter.parse(data, chain)
+
+async def measure(name, cycle, adapter, cycles):
+    timings = []
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=100)) as session:
+        for _ in range(cycles):
+            started = time.perf_counter()
+            await cycle(session, adapter)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{name:<10} p50 {statistics.median(timings):>8.1f}ms  p95 {p95:>8.1f}ms  p99 {p99:>8.1f}ms  max {timings[-1]:>8.1f}ms")
+    return timings
+
+async def main(args):
+    rng = random.Random(args.seed)
+    body = orjson.dumps(dex_payload(rng, args.pairs))
+    app = build_app(rng, args.slow_rate, args.error_rate, args.outage_chain, body)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', args.port)
+    await site.start()
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"Stub: {args.slow_rate:.0%} slow, {args.error_rate:.0%} errors, outage on {args.outage_chain or 'none'}, "
+          f"{args.cycles} cycles over {len(CHAINS)} chains")
+    await measure('baseline', baseline_cycle, StubDexAdapter(base_url), args.cycles)
+    adapter = StubDexAdapter(base_url)
+    await measure('resilient', resilient_cycle, adapter, args.cycles)
+    client = adapter.client.get_stats()
+    print(f"hedged {client['hedged']} (won {client['hedge_wins']}), timeouts {client['timeouts']}, "
+          f"errors {client['errors']}, rejected {client['rejected']}, timeout budget {client['timeout'] * 1000:.0f}ms")
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare scan cycle tail latency against a fault-injecting stub")
+    parser.add_argument('--cycles', type=int, default=100)
+    parser.add_argument('--pairs', type=int, default=100)
+    parser.add_argument('--slow-rate', type=float, default=0.03)
+    parser.add_argument('--error-rate', type=float, default=0.03)
+    parser.add_argument('--outage-chain', default='solana')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(args))
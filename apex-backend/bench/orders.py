@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from executor.orders import OrderSubmitter, RPCError, WRAPPED_NATIVE
+
+TEST_KEY = '0x' + '4c' * 32
+
+def build_stub(latency, fail_rate, rng):
+    state = {'nonce': 0, 'sent': 0, 'calls': 0}
+
+    async def rpc(request):
+        body = await request.json()
+        state['calls'] += 1
+        await asyncio.sleep(latency)
+        method = body['method']
+        if method == 'eth_getTransactionCount':
+            result = hex(state['nonce'])
+        elif method == 'eth_gasPrice':
+            result = hex(30 * 10 ** 9)
+        elif method == 'eth_sendRawTransaction':
+            if rng.random() < fail_rate:
+                return web.json_response({'jsonrpc': '2.0', 'id': body['id'], 'error': {'code': -32000, 'message': 'transaction underpriced'}})
+            state['nonce'] += 1
+            state['sent'] += 1
+            result = '0x' + os.urandom(32).hex()
+        else:
+            return web.json_response({'jsonrpc': '2.0', 'id': body['id'], 'error': {'code': -32601, 'message': 'method not found'}})
+        return web.json_response({'jsonrpc': '2.0', 'id': body['id'], 'result': result})
+
+    app = web.Application()
+    app.router.add_post('/', rpc)
+    return app, state
+
+async def naive_order(submitter, token):
+    from eth_abi import encode
+    started = time.perf_counter()
+    nonce = int(await submitter.rpc('eth_getTransactionCount', [submitter.address, 'pending']), 16)
+    gas_price = int(await submitter.rpc('eth_gasPrice', []), 16)
+    data = bytes.fromhex('7ff36ab5') + encode(
+        ['uint256', 'address[]', 'address', 'uint256'],
+        [1, [WRAPPED_NATIVE['polygon'], token], submitter.address, int(time.time()) + 120]
+    )
+    raw = submitter.account.sign_transaction({
+        'to': submitter.template.router, 'data': data, 'value': 10 ** 15, 'gas': 300000,
+        'gasPrice': gas_price, 'nonce': nonce, 'chainId': submitter.chain_id
+    }).rawTransaction
+    await submitter.rpc('eth_sendRawTransaction', ['0x' + raw.hex()])
+    return time.perf_counter() - started
+
+async def pipelined_order(submitter, token):
+    started = time.perf_counter()
+    await submitter.buy(token, 10 ** 15, 1)
+    return time.perf_counter() - started
+
+async def run(name, order, submitter, tokens, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(token):
+        async with semaphore:
+            try:
+                latencies.append(await order(submitter, token))
+            except RPCError:
+                pass
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(token) for token in tokens])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    print(f"{name:<10} {len(latencies) / elapsed:>8.0f} orders/s  p50 {statistics.median(latencies) * 1000:>7.1f}ms  "
+          f"p99 {p99 * 1000:>7.1f}ms  ({len(latencies)}/{len(tokens)} sent)")
+
+async def main(args):
+    rng = random.Random(args.seed)
+    app, state = build_stub(args.latency / 1000, args.fail_rate, rng)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', args.port).start()
+    url = f"http://127.0.0.1:{args.port}/"
+    tokens = [f"0x{rng.getrandbits(160):040x}" for _ in range(args.orders)]
+
+    print(f"Stub RPC: {args.latency}ms per call, {args.fail_rate:.0%} send failures, {args.orders} orders")
+    async with aiohttp.ClientSession() as session:
+        naive = OrderSubmitter(url, TEST_KEY)
+        naive.session = session
+        await run('naive', naive_order, naive, tokens, 1)
+
+        submitter = OrderSubmitter(url, TEST_KEY)
+        await submitter.start(session)
+        await run('pipelined', pipelined_order, submitter, tokens, args.concurrency)
+        stats = submitter.get_stats()
+        print(f"nonce {stats['nonce']}, stub nonce {state['nonce']}, sign {stats['sign_seconds'] / max(stats['submitted'], 1) * 1000:.2f}ms/order")
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark order submission against a local stub RPC")
+    parser.add_argument('--orders', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=20.0, help="stub RPC latency per call in ms")
+    parser.add_argument('--fail-rate', type=float, default=0.02)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(args))
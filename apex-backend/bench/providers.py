@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner.providers import PROVIDERS, create_provider
+
+def dex_payload(rng, count):
+    now_ms = time.time() * 1000
+    return {'pairs': [
+        {
+            'chainId': 'bsc',
+            'baseToken': {'address': f"0x{rng.getrandbits(160):040x}", 'symbol': f"T{i}"},
+            'priceUsd': str(rng.uniform(0.00001, 2)),
+            'priceChange': {'m5': rng.uniform(-5, 25), 'h1': rng.uniform(-20, 40), 'h24': rng.uniform(-50, 50)},
+            'volume': {'h1': rng.uniform(0, 50000), 'h24': rng.uniform(0, 500000)},
+            'liquidity': {'usd': rng.uniform(1000, 200000)},
+            'marketCap': rng.uniform(1e4, 1e7),
+            'pairCreatedAt': now_ms - rng.uniform(0, 86400) * 1000
+        }
+        for i in range(count)
+    ]}
+
+def tools_payload(rng, count):
+    return {'data': [
+        {
+            'id': f"0x{rng.getrandbits(160):040x}",
+            'symbol': f"T{i}",
+            'price': rng.uniform(0.00001, 2),
+            'variation1h': rng.uniform(-20, 60),
+            'volume': rng.uniform(0, 100000),
+            'liquidity': rng.uniform(1000, 200000),
+            'mcap': rng.uniform(1e4, 1e7)
+        }
+        for i in range(count)
+    ]}
+
+def gecko_payload(rng, count):
+    return {'data': [
+        {
+            'attributes': {
+                'name': f"T{i} / WETH",
+                'base_token_price_usd': str(rng.uniform(0.00001, 2)),
+                'price_change_percentage': {'h24': str(rng.uniform(-80, 80))},
+                'volume_usd': {'h24': str(rng.uniform(0, 200000))},
+                'reserve_in_usd': str(rng.uniform(1000, 200000))
+            },
+            'relationships': {'base_token': {'data': {'id': f"eth_0x{rng.getrandbits(160):040x}"}}}
+        }
+        for i in range(count)
+    ]}
+
+PAYLOADS = {'dex': dex_payload, 'tools': tools_payload, 'gecko': gecko_payload}
+
+def bench_provider(name, count, rounds):
+    adapter = create_provider(name)
+    body = orjson.dumps(PAYLOADS[name](random.Random(7), count))
+    chain = adapter.chains[0]
+    now = time.time()
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        data = adapter.decode(body)
+    decode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        records = adapter.parse(data, chain)
+    parse_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    tokens = 0
+    for _ in range(rounds):
+        for record in records:
+            tokens += adapter.classify(record, now) is not None
+    classify_seconds = time.perf_counter() - started
+
+    total = count * rounds
+    return {
+        'records': len(records),
+        'decode_per_s': total / decode_seconds,
+        'parse_per_s': total / parse_seconds,
+        'classify_per_s': total / classify_seconds,
+        'tokens': tokens // rounds
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark provider adapters on synthetic payloads")
+    parser.add_argument('providers', nargs='*', default=list(PAYLOADS))
+    parser.add_argument('--pairs', type=int, default=300)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'provider':>10} {'records':>8} {'decode/s':>12} {'parse/s':>12} {'classify/s':>12} {'tokens':>7}")
+    for name in args.providers:
+        if name not in PROVIDERS or name not in PAYLOADS:
+            print(f"{name:>10} no synthetic payload")
+            continue
+        result = bench_provider(name, args.pairs, args.rounds)
+        print(f"{name:>10} {result['records']:>8} {result['decode_per_s']:>12,.0f} {result['parse_per_s']:>12,.0f} "
+              f"{result['classify_per_s']:>12,.0f} {result['tokens']:>7}")
@@ -0,0 +1,37 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from executor.risk import PortfolioRisk
+
+CHAINS = ['ethereum', 'bsc', 'polygon', 'arbitrum', 'base', 'solana']
+TYPES = ['NEW_LAUNCH', 'MOMENTUM', 'VOLUME_SPIKE', 'WHALE_ACCUMULATION', 'BREAKOUT']
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark portfolio risk checks")
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--checks', type=int, default=100000)
+    parser.add_argument('--equity', type=float, default=100000.0)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    risk = PortfolioRisk()
+    for _ in range(args.positions):
+        risk.add(rng.choice(CHAINS), rng.choice(TYPES), rng.uniform(10, args.equity / args.positions))
+
+    candidates = [(rng.choice(CHAINS), rng.choice(TYPES), rng.uniform(1, args.equity * 0.05))
+                  for _ in range(args.checks)]
+    started = time.perf_counter()
+    for chain, opportunity_type, amount in candidates:
+        risk.check(chain, opportunity_type, amount, args.equity, 0.05)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.checks} checks against {args.positions} open positions: "
+          f"{elapsed / args.checks * 1e6:.2f}us per check")
+    stats = risk.get_stats()
+    print({key: value for key, value in stats.items() if key not in ('by_chain', 'by_opportunity_type')})
@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REDIS_URL = os.getenv('BENCH_REDIS_URL', 'redis://localhost:6379/15')
+
+def make_pairs(count, seed):
+    rng = random.Random(seed)
+    now_ms = time.time() * 1000
+    return [
+        {
+            'chainId': 'bsc',
+            'baseToken': {'address': f"0x{rng.getrandbits(160):040x}", 'symbol': f"S{seed}T{i}"},
+            'priceUsd': str(rng.uniform(0.00001, 2)),
+            'priceChange': {'h1': rng.uniform(10, 60)},
+            'volume': {'h1': rng.uniform(20000, 80000)},
+            'liquidity': {'usd': rng.uniform(20000, 200000)},
+            'marketCap': rng.uniform(1e5, 1e7),
+            'pairCreatedAt': now_ms - rng.uniform(60, 1800) * 1000
+        }
+        for i in range(count)
+    ]
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+async def scanner_worker(redis, index, options, wait_start):
+    from scanner.hyperscan import HyperScanner
+    from scanner.providers import create_provider
+
+    scanner = HyperScanner()
+    scanner.redis = redis
+    scanner.shard = f"scanner-{index}"
+    adapter = scanner.adapters['dex'] = create_provider('dex', ['bsc'])
+    pairs = make_pairs(options['pairs'], index)
+    rng = random.Random(index)
+    changed = max(int(len(pairs) * options['churn']), 1)
+    scanner.opportunity_log.logger.disabled = True
+
+    deadline = await wait_start()
+    while time.time() < deadline:
+        cycle_started = time.time()
+        for pair in rng.sample(pairs, changed):
+            pair['priceUsd'] = str(float(pair['priceUsd']) * rng.uniform(0.95, 1.05))
+        body = json.dumps({'pairs': pairs}).encode()
+        records = adapter.changed(adapter.parse_timed(adapter.decode(body), 'bsc'), time.time())
+        await scanner.process_records(adapter, records)
+        await asyncio.sleep(max(options['interval'] - (time.time() - cycle_started), 0))
+    return {'pairs': adapter.stats['records'], 'writes': scanner.changes.stats['writes']}
+
+async def predictor_worker(redis, index, options, wait_start):
+    from brain.ai_predictor import AIPredictor
+
+    predictor = AIPredictor()
+    predictor.redis = predictor.social.redis = redis
+    predictor.shard, predictor.shards = index, options['predictors']
+    generate = predictor.generate_prediction
+    ages = []
+
+    async def timed(token):
+        prediction = await generate(token)
+        ages.append(time.time() - token['detected_at'])
+        return prediction
+    predictor.generate_prediction = timed
+
+    deadline = await wait_start()
+    while time.time() < deadline:
+        await predictor.refresh_queue()
+        await predictor.drain_queue()
+        await asyncio.sleep(predictor.cycle_interval)
+    return {'scored': predictor.queue.stats['processed'], 'scan_to_score': ages}
+
+async def executor_worker(redis, index, options, wait_start):
+    from executor.trade_executor import TradeExecutor
+
+    executor = TradeExecutor()
+    executor.redis = redis
+    seen = set()
+    ages = []
+
+    deadline = await wait_start()
+    while time.time() < deadline:
+        selected = await executor.poll_predictions()
+        now = time.time()
+        for prediction, strategy in selected:
+            key = (prediction['token_address'], prediction['timestamp'])
+            if key not in seen:
+                seen.add(key)
+                ages.append(now - prediction['timestamp'])
+        await asyncio.sleep(1)
+    return {'selected': len(seen), 'score_to_select': ages}
+
+WORKERS = {'scanner': scanner_worker, 'predictor': predictor_worker, 'executor': executor_worker}
+
+def run_worker(role, index, options, ready, start, results):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import aioredis
+
+    async def wait_start():
+        ready.put(role)
+        started = await asyncio.to_thread(start.get)
+        return started + options['duration']
+
+    async def run():
+        redis = aioredis.from_url(REDIS_URL)
+        results.put((role, await WORKERS[role](redis, index, options, wait_start)))
+
+    asyncio.run(run())
+
+async def prepare_redis(options):
+    import aioredis
+
+    if urlparse(REDIS_URL).path.strip('/') in ('', '0'):
+        raise SystemExit(f"Refusing to flush {REDIS_URL}: db 0 is the live system's, set BENCH_REDIS_URL to another db")
+    redis = aioredis.from_url(REDIS_URL)
+    await redis.flushdb()
+    pipe = redis.pipeline(transaction=False)
+    for index in range(options['scanners']):
+        for pair in make_pairs(options['pairs'], index):
+            address = pair['baseToken']['address']
+            pipe.setex(f"whale:{address}", 3600, json.dumps({
+                'whale_wallet': '0xbench', 'success_rate': 0.9, 'transaction_value': 0, 'timestamp': time.time()
+            }))
+            pipe.hset(f"social:{address}", mapping={
+                'ts': time.time(), 'twitter_sum': 9.0, 'twitter_weight': 10.0,
+                'reddit_sum': 9.0, 'reddit_weight': 10.0, 'mention_count': 10
+            })
+    await pipe.execute()
+
+def measure(scanners, predictors, options):
+    options = {**options, 'scanners': scanners, 'predictors': predictors}
+    asyncio.run(prepare_redis(options))
+
+    context = multiprocessing.get_context('spawn')
+    ready, results = context.Queue(), context.Queue()
+    roles = [('scanner', index) for index in range(scanners)]
+    roles += [('predictor', index) for index in range(predictors)]
+    roles += [('executor', 0)]
+    starts = [context.Queue() for _ in roles]
+    processes = [
+        context.Process(target=run_worker, args=(role, index, options, ready, start, results), daemon=True)
+        for (role, index), start in zip(roles, starts)
+    ]
+    for process in processes:
+        process.start()
+    for _ in roles:
+        ready.get()
+    started = time.time()
+    for start in starts:
+        start.put(started)
+
+    totals = {'pairs': 0, 'writes': 0, 'scored': 0, 'selected': 0, 'scan_to_score': [], 'score_to_select': []}
+    for _ in roles:
+        role, result = results.get()
+        for key, value in result.items():
+            totals[key] += value
+    for process in processes:
+        process.join(10)
+
+    duration = options['duration']
+    return {
+        'pairs': totals['pairs'] / duration,
+        'writes': totals['writes'] / duration,
+        'scored': totals['scored'] / duration,
+        'selected': totals['selected'] / duration,
+        'scan_to_score': percentile(totals['scan_to_score'], 0.5),
+        'score_to_select': percentile(totals['score_to_select'], 0.5)
+    }
+
+def ms(value):
+    return f"{value * 1000:.0f}ms" if value is not None else '-'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure end-to-end pipeline throughput (scanner -> Redis -> predictor -> executor) "
+                    "as scanner and predictor processes are added. Flushes BENCH_REDIS_URL (default db 15 on localhost)."
+    )
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--pairs', type=int, default=300, help="pairs per scanner shard")
+    parser.add_argument('--churn', type=float, default=0.1, help="fraction of pairs repriced per scan")
+    parser.add_argument('--interval', type=float, default=0.1, help="seconds between scans per shard, 0 for flat out")
+    parser.add_argument('--scanners', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--predictors', type=int, nargs='+', default=[1, 2])
+    args = parser.parse_args()
+
+    options = {'duration': args.duration, 'pairs': args.pairs, 'churn': args.churn, 'interval': args.interval}
+    print(f"{os.cpu_count()} cores, {args.pairs} pairs per scanner every {args.interval}s, "
+          f"{args.churn:.0%} repriced per scan")
+    print(f"{'scanners':>8} {'predictors':>10} {'pairs/s':>10} {'writes/s':>9} {'scored/s':>9} "
+          f"{'selected/s':>10} {'speedup':>8} {'scan>score':>10} {'score>exec':>10}")
+    baseline = None
+    for scanners, predictors in itertools.product(args.scanners, args.predictors):
+        result = measure(scanners, predictors, options)
+        baseline = baseline or result['scored'] or None
+        speedup = result['scored'] / baseline if baseline else 0.0
+        print(f"{scanners:>8} {predictors:>10} {result['pairs']:>10,.0f} {result['writes']:>9,.0f} "
+              f"{result['scored']:>9,.0f} {result['selected']:>10,.1f} {speedup:>8.2f} "
+              f"{ms(result['scan_to_score']):>10} {ms(result['score_to_select']):>10}")
@@ -0,0 +1,69 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = ['numpy', 'web3', 'textblob', 'torch', 'transformers', 'sentence_transformers', 'sklearn', 'onnxruntime', 'pyarrow']
+
+def parse_importtime(output):
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+def measure(module, env):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return elapsed, parse_importtime(result.stderr)
+
+def run(module, rounds, budget_ms, top):
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.getenv('PYTHONPATH')])), 'APEX_ROLE': 'api'}
+    env.pop('PRIVATE_KEY', None)
+
+    timings = []
+    modules = {}
+    for _ in range(rounds):
+        elapsed, modules = measure(module, env)
+        timings.append(elapsed * 1000)
+
+    median = statistics.median(timings)
+    print(f"Startup import of {module}: median {median:.0f}ms, min {min(timings):.0f}ms over {rounds} runs")
+    print(f"{'module':<50} {'self ms':>9} {'cumul ms':>9}")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][1])[:top]:
+        print(f"{name:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+    failures = []
+    if median > budget_ms:
+        failures.append(f"median startup {median:.0f}ms exceeds budget of {budget_ms:.0f}ms")
+    eager = [name for name in DEFERRED_MODULES if name in modules]
+    if eager:
+        failures.append(f"deferred modules imported at startup: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print(f"✅ Within budget of {budget_ms:.0f}ms")
+    return not failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure API startup import time against a budget")
+    parser.add_argument('--module', default='api.main')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('STARTUP_BUDGET_MS', 1500)))
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.module, args.rounds, args.budget_ms, args.top) else 1)
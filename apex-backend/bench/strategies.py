@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from executor.strategies import Strategy, StrategySet, MIN_ORDER_USD
+
+def make_strategies(count, rng):
+    return StrategySet(
+        Strategy(f"s{index}", min_confidence=rng.uniform(0.5, 0.95), min_expected_return=rng.uniform(0.05, 0.5),
+                 max_risk_score=rng.uniform(0.2, 0.7))
+        for index in range(count)
+    )
+
+def make_predictions(count, rng):
+    return [
+        {'token_address': f"0x{index:040x}", 'confidence': rng.random(), 'expected_return': rng.uniform(0, 1),
+         'risk_score': rng.random()}
+        for index in range(count)
+    ]
+
+def naive_select(strategies, predictions):
+    selected = []
+    for prediction in predictions:
+        for strategy in strategies:
+            params = strategy.risk_params
+            if prediction['confidence'] < params['min_confidence']:
+                continue
+            if prediction['expected_return'] < params['min_expected_return']:
+                continue
+            if prediction['risk_score'] > params['max_risk_score']:
+                continue
+            if strategy.open_slots() <= 0:
+                continue
+            room = strategy.risk.check(prediction.get('chain', ''), prediction.get('opportunity_type', ''),
+                                       float('inf'), strategy.equity(), strategy.analytics.current_drawdown())
+            if room < MIN_ORDER_USD:
+                continue
+            selected.append((prediction, strategy))
+    return selected
+
+def timed(fn, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - started) / repeats, result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-prediction strategy selection")
+    parser.add_argument('--predictions', type=int, default=500)
+    parser.add_argument('--strategies', type=int, nargs='+', default=[1, 4, 16, 64, 256])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    predictions = make_predictions(args.predictions, rng)
+    print(f"{args.predictions} predictions per cycle")
+    print(f"{'strategies':>10} {'naive':>10} {'vectorized':>11} {'selected':>9}")
+    for count in args.strategies:
+        strategies = make_strategies(count, rng)
+        naive, expected = timed(lambda: naive_select(strategies, predictions), args.repeats)
+        vectorized, selected = timed(lambda: strategies.select(predictions), args.repeats)
+        assert len(selected) == len(expected)
+        print(f"{count:>10} {naive * 1000:>8.2f}ms {vectorized * 1000:>9.2f}ms {len(selected):>9}")
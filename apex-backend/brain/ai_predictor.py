@@ -6,8 +6,20 @@ import time
 import numpy as np
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
+import os
 import re
-from textblob import TextBlob
+import zlib
+
+from runtime.snapshots import snapshot_loop
+from brain.social_store import SocialAggregator
+from scanner.symbol_index import symbol_index
+from brain.whale_tracker import WhaleTracker, load_wallets
+from brain.features import build_features, calc_technical_score, calc_time_horizon
+from brain.inference import InferenceService, ModelStore
+from brain.work_queue import PredictionQueue
+from brain.trending import TrendingDetector
+from runtime.archive import open_archive
+from scanner.recorder import ScanRecorder
 
 @dataclass
 class Prediction:
@@ -24,6 +36,9 @@ class Prediction:
     technical_score: float
     whale_score: float
     timestamp: float
+    opportunity_type: str = ''
+    chain: str = ''
+    liquidity: float = 0.0
 
 class AIPredictor:
     def __init__(self):
@@ -35,22 +50,68 @@ class AIPredictor:
             '0x267be1C1D684F78cb4F6a176C4911b741E4Ffdc0': 0.71,
             '0x40ec5B33f54e0E8A33A975908C5BA1c14e5BbbDf': 0.85
         }
+        self.whale_wallets.update(load_wallets(os.getenv('WHALE_WALLETS_FILE', 'data/whales.json')))
+        self.whale_tracker = WhaleTracker(
+            self.whale_wallets,
+            self.analyze_whale_tx,
+            cursor_path=os.getenv('WHALE_CURSOR_FILE', 'data/whale_cursors.json'),
+            rate_per_second=float(os.getenv('ETHERSCAN_RATE_LIMIT', 5))
+        )
         self.predictions = {}
+        self.social = SocialAggregator(resolve=symbol_index.resolve)
+        self.trending = TrendingDetector()
+        self.inference = InferenceService(
+            ModelStore(os.getenv('MODEL_PATH', 'data/models/predictor.joblib')),
+            max_batch=int(os.getenv('INFERENCE_MAX_BATCH', 256)),
+            window=float(os.getenv('INFERENCE_WINDOW_MS', 5)) / 1000
+        )
+        self.queue = PredictionQueue()
+        self.cycle_interval = 1.0
+        self.cycle_budget = float(os.getenv('PREDICTION_BUDGET_MS', 1000)) / 1000
+        self.batch_size = int(os.getenv('PREDICTION_BATCH', 64))
+        self.shard = 0
+        self.shards = 1
+        self.archive = None
+        self.recorder = None
         
-    async def init(self):
+    async def init(self, shard=0, shards=1, monitors=True):
         try:
             self.redis = aioredis.from_url("redis://localhost:6379")
             await self.redis.ping()
         except:
             pass
             
+        self.shard = shard
+        self.shards = shards
+        self.social.redis = self.redis
+        self.archive = open_archive(f"predictor-{shard}")
+        if os.getenv('SCAN_RECORD_DIR'):
+            self.recorder = ScanRecorder(os.getenv('SCAN_RECORD_DIR'), f"predictor-{shard}")
+            asyncio.create_task(self.recorder.flush_loop())
+            
         timeout = aiohttp.ClientTimeout(total=3)
         self.sessions['social'] = aiohttp.ClientSession(timeout=timeout)
         self.sessions['whale'] = aiohttp.ClientSession(timeout=timeout)
         
-        asyncio.create_task(self.social_monitor())
-        asyncio.create_task(self.whale_monitor())
+        if monitors:
+            asyncio.create_task(symbol_index.refresh_loop())
+            asyncio.create_task(self.social.flush_loop())
+            asyncio.create_task(self.social_monitor())
+            asyncio.create_task(self.whale_monitor())
         asyncio.create_task(self.prediction_loop())
+        asyncio.create_task(snapshot_loop(self.redis, f"predictor:{shard}", self.build_snapshot))
+        
+    async def close(self):
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+        
+    def owns_token(self, address):
+        return self.shards <= 1 or zlib.crc32(address.encode()) % self.shards == self.shard
+        
+    async def build_snapshot(self):
+        predictions = await self.get_top_predictions(20)
+        return {'predictions': [asdict(p) for p in predictions], 'stats': self.get_stats()}
         
     async def social_monitor(self):
         while True:
@@ -89,7 +150,7 @@ class AIPredictor:
             sentiment = self.analyze_sentiment(text)
             
             for token in tokens:
-                await self.update_social_score(token, sentiment, 'twitter')
+                self.update_social_score(token, sentiment, 'twitter')
         except Exception as e:
             pass
             
@@ -116,10 +177,10 @@ class AIPredictor:
             tokens = self.extract_tokens(title)
             sentiment = self.analyze_sentiment(title)
             
-            weighted_sentiment = sentiment * min(score / 100, 5)
+            weight = max(min(score / 100, 5), 0.1)
             
             for token in tokens:
-                await self.update_social_score(token, weighted_sentiment, 'reddit')
+                self.update_social_score(token, sentiment, 'reddit', weight)
         except Exception as e:
             pass
             
@@ -130,6 +191,7 @@ class AIPredictor:
         
     def analyze_sentiment(self, text):
         try:
+            from textblob import TextBlob
             blob = TextBlob(text)
             sentiment = (blob.sentiment.polarity + 1) / 2
             
@@ -149,53 +211,12 @@ class AIPredictor:
         except:
             return 0.5
             
-    async def update_social_score(self, token, sentiment, source):
-        try:
-            if self.redis:
-                key = f"social:{token}"
-                existing = await self.redis.get(key)
-                
-                if existing:
-                    data = json.loads(existing)
-                else:
-                    data = {
-                        'twitter_sentiment': 0.5,
-                        'reddit_sentiment': 0.5,
-                        'mention_count': 0,
-                        'last_updated': time.time()
-                    }
-                
-                data[f'{source}_sentiment'] = sentiment
-                data['mention_count'] += 1
-                data['last_updated'] = time.time()
-                
-                overall = data['twitter_sentiment'] * 0.6 + data['reddit_sentiment'] * 0.4
-                data['overall_sentiment'] = overall
-                
-                await self.redis.setex(key, 1800, json.dumps(data))
-        except Exception as e:
-            pass
+    def update_social_score(self, token, sentiment, source, weight=1.0):
+        self.trending.add(token)
+        self.social.add(token, sentiment, source, weight)
             
     async def whale_monitor(self):
-        while True:
-            try:
-                for wallet in self.whale_wallets:
-                    await self.track_whale_wallet(wallet)
-                await asyncio.sleep(60)
-            except Exception as e:
-                await asyncio.sleep(120)
-                
-    async def track_whale_wallet(self, wallet):
-        try:
-            url = f"https://api.etherscan.io/api?module=account&action=txlist&address={wallet}&sort=desc&page=1&offset=10"
-            
-            async with self.sessions['whale'].get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    for tx in data.get('result', []):
-                        await self.analyze_whale_tx(tx, wallet)
-        except Exception as e:
-            pass
+        await self.whale_tracker.run(self.sessions['whale'])
             
     async def analyze_whale_tx(self, tx, wallet):
         try:
@@ -223,19 +244,58 @@ class AIPredictor:
         while True:
             try:
                 if self.redis:
-                    keys = await self.redis.keys("token:*")
-                    for key in keys:
-                        token_data = await self.redis.get(key)
-                        if token_data:
-                            token = json.loads(token_data)
-                            prediction = await self.generate_prediction(token)
-                            if prediction:
-                                await self.cache_prediction(prediction)
-                                
-                await asyncio.sleep(5)
+                    await self.refresh_queue()
+                    await self.drain_queue()
+                await asyncio.sleep(self.cycle_interval)
             except Exception as e:
                 await asyncio.sleep(10)
                 
+    async def refresh_queue(self):
+        keys = await self.redis.keys("token:*")
+        addresses = [key.decode().split(':', 1)[1] for key in keys]
+        owned = [(key, address) for key, address in zip(keys, addresses) if self.owns_token(address)]
+        values = await self.redis.mget([key for key, address in owned]) if owned else []
+        
+        now = time.time()
+        present = set()
+        for (key, address), value in zip(owned, values):
+            if not value:
+                continue
+            present.add(address)
+            if self.queue.changed(address, value, now):
+                self.queue.push(address, json.loads(value), now)
+        self.queue.retain(present)
+        
+    async def drain_queue(self):
+        started = time.monotonic()
+        while len(self.queue) and time.monotonic() - started < self.cycle_budget:
+            batch = []
+            while len(batch) < self.batch_size:
+                item = self.queue.pop()
+                if item is None:
+                    break
+                batch.append(item)
+                
+            now = time.time()
+            for address, token, enqueued_at in batch:
+                self.queue.record_wait(token, enqueued_at, now)
+            predictions = await asyncio.gather(*[self.generate_prediction(token) for address, token, enqueued_at in batch])
+            for prediction in predictions:
+                if prediction:
+                    await self.cache_prediction(prediction)
+        self.queue.stats['deferred'] += len(self.queue)
+        
+    def get_stats(self):
+        return {
+            'shard': self.shard,
+            'predictions': len(self.predictions),
+            'queue': self.queue.get_stats(),
+            'inference': self.inference.get_stats(),
+            'archive': self.archive.get_stats() if self.archive else None,
+            'recorder': self.recorder.get_stats() if self.recorder else None,
+            'trending': {**self.trending.get_stats(), 'top': self.trending.top(10)}
+        }
+        
     async def generate_prediction(self, token):
         try:
             address = token['address']
@@ -247,11 +307,10 @@ class AIPredictor:
             social_score = social_data.get('overall_sentiment', 0.5)
             whale_score = whale_data.get('success_rate', 0.5) if whale_data else 0.5
             
-            combined_confidence = (
-                technical_score * 0.4 +
-                social_score * 0.3 +
-                whale_score * 0.3
-            )
+            features = build_features(token, technical_score, social_score, whale_score, social_data)
+            if self.recorder:
+                self.recorder.record_features(address, token['price'], calc_time_horizon(token), features, time.time())
+            combined_confidence = await self.inference.score(features)
             
             if combined_confidence < 0.7:
                 return None
@@ -263,7 +322,6 @@ class AIPredictor:
             stop_loss = entry_price * 0.8
             
             risk_score = 1 - combined_confidence
-            time_horizon = min(int(3600 / token['urgency']), 3600)
             
             action = 'BUY' if combined_confidence > 0.75 else 'HOLD'
             
@@ -272,7 +330,7 @@ class AIPredictor:
                 action=action,
                 confidence=combined_confidence,
                 expected_return=expected_return,
-                time_horizon=time_horizon,
+                time_horizon=calc_time_horizon(token),
                 risk_score=risk_score,
                 entry_price=entry_price,
                 target_price=target_price,
@@ -280,7 +338,10 @@ class AIPredictor:
                 social_score=social_score,
                 technical_score=technical_score,
                 whale_score=whale_score,
-                timestamp=time.time()
+                timestamp=time.time(),
+                opportunity_type=token.get('opportunity_type', ''),
+                chain=token.get('chain', ''),
+                liquidity=token.get('liquidity', 0.0)
             )
             
         except Exception as e:
@@ -289,8 +350,7 @@ class AIPredictor:
     async def get_social_data(self, address):
         try:
             if self.redis:
-                data = await self.redis.get(f"social:{address}")
-                return json.loads(data) if data else {}
+                return await self.social.get(address)
             return {}
         except:
             return {}
@@ -306,27 +366,22 @@ class AIPredictor:
             
     def calc_technical_score(self, token):
         try:
-            momentum = token.get('momentum', 0)
-            confidence = token.get('confidence', 0)
-            urgency = token.get('urgency', 0) / 10
-            
-            volume_score = min(token.get('volume_1h', 0) / 50000, 1.0)
-            liquidity_score = min(token.get('liquidity', 0) / 100000, 1.0)
-            
-            return (momentum * 0.3 + confidence * 0.3 + urgency * 0.2 + 
-                   volume_score * 0.1 + liquidity_score * 0.1)
+            return calc_technical_score(token)
         except:
             return 0.5
             
     async def cache_prediction(self, prediction):
         try:
             self.predictions[prediction.token_address] = prediction
+            data = asdict(prediction)
+            if self.archive:
+                self.archive.append('predictions', data)
             
             if self.redis:
                 await self.redis.setex(
                     f"prediction:{prediction.token_address}",
                     600,
-                    json.dumps(asdict(prediction))
+                    json.dumps(data)
                 )
         except Exception as e:
             pass
@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+
+FEATURE_NAMES = [
+    'technical_score', 'social_score', 'whale_score',
+    'momentum', 'confidence', 'urgency',
+    'log_volume_1h', 'log_liquidity', 'log_market_cap',
+    'change_1m', 'change_5m', 'change_1h', 'change_15m',
+    'volatility_5m', 'vwap_deviation',
+    'mentions_5m', 'velocity_1m', 'providers'
+]
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+BLEND_WEIGHTS = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+BLEND_WEIGHTS[[0, 1, 2]] = (0.4, 0.3, 0.3)
+
+def calc_technical_score(token):
+    momentum = token.get('momentum', 0)
+    confidence = token.get('confidence', 0)
+    urgency = token.get('urgency', 0) / 10
+
+    volume_score = min(token.get('volume_1h', 0) / 50000, 1.0)
+    liquidity_score = min(token.get('liquidity', 0) / 100000, 1.0)
+
+    score = (momentum * 0.3 + confidence * 0.3 + urgency * 0.2 +
+             volume_score * 0.1 + liquidity_score * 0.1)
+
+    volatility = token.get('volatility_5m', 0)
+    if volatility:
+        score *= 1 - min(volatility * 5, 0.3)
+    return score
+
+def calc_time_horizon(token):
+    return min(int(3600 / max(token['urgency'], 1)), 3600)
+
+def build_features(token, technical_score, social_score, whale_score, social_data=None, out=None):
+    social_data = social_data or {}
+    price = token.get('price', 0) or 0
+    vwap = token.get('vwap_5m', 0) or 0
+    features = out if out is not None else np.empty(len(FEATURE_NAMES), dtype=np.float32)
+    features[:] = (
+        technical_score,
+        social_score,
+        whale_score,
+        token.get('momentum', 0),
+        token.get('confidence', 0),
+        token.get('urgency', 0) / 10,
+        math.log1p(max(token.get('volume_1h', 0), 0)),
+        math.log1p(max(token.get('liquidity', 0), 0)),
+        math.log1p(max(token.get('market_cap', 0), 0)),
+        token.get('change_1m', 0),
+        token.get('change_5m', 0),
+        token.get('change_1h', 0),
+        token.get('change_15m', 0),
+        token.get('volatility_5m', 0),
+        price / vwap - 1 if vwap > 0 else 0.0,
+        social_data.get('mentions_5m', 0),
+        social_data.get('velocity_1m', 0),
+        token.get('providers', 1)
+    )
+    return features
+
+def blend(matrix):
+    return matrix @ BLEND_WEIGHTS
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from brain.features import FEATURE_INDEX, blend
+
+def load_sidecar_features(path):
+    sidecar = path + '.features.json'
+    if not os.path.exists(sidecar):
+        return None
+    with open(sidecar) as f:
+        return json.load(f)
+
+def load_sklearn(path):
+    import joblib
+    artifact = joblib.load(path)
+    if isinstance(artifact, dict):
+        model, features = artifact['model'], artifact.get('features')
+    else:
+        model, features = artifact, None
+    if hasattr(model, 'predict_proba'):
+        return lambda matrix: model.predict_proba(matrix)[:, -1], features
+    return model.predict, features
+
+def load_onnx(path):
+    import onnxruntime
+    session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+
+    def run(matrix):
+        output = session.run(None, {input_name: matrix})[-1]
+        output = np.asarray(output)
+        return output[:, -1] if output.ndim == 2 else output
+    return run, load_sidecar_features(path)
+
+def load_torchscript(path):
+    import torch
+    model = torch.jit.load(path, map_location='cpu')
+    model.eval()
+
+    def run(matrix):
+        with torch.inference_mode():
+            return model(torch.from_numpy(matrix)).numpy()
+    return run, load_sidecar_features(path)
+
+LOADERS = {
+    '.joblib': load_sklearn,
+    '.pkl': load_sklearn,
+    '.onnx': load_onnx,
+    '.pt': load_torchscript,
+    '.ts': load_torchscript
+}
+
+class ModelStore:
+    def __init__(self, path, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.runner = None
+        self.columns = None
+        self.mtime = None
+        self.checked = 0.0
+        self.stats = {'loads': 0, 'load_errors': 0, 'version': None}
+
+    def current(self, now=None):
+        now = now or time.monotonic()
+        if now - self.checked >= self.check_interval:
+            self.checked = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except (FileNotFoundError, TypeError):
+                self.runner = self.mtime = self.stats['version'] = None
+                return None
+            if mtime != self.mtime:
+                self.load(mtime)
+        return self.runner
+
+    def load(self, mtime):
+        loader = LOADERS.get(os.path.splitext(self.path)[1])
+        try:
+            runner, features = loader(self.path)
+        except Exception as e:
+            self.stats['load_errors'] += 1
+            self.mtime = mtime
+            return
+        self.columns = np.array([FEATURE_INDEX[name] for name in features]) if features else None
+        self.runner = runner
+        self.mtime = mtime
+        self.stats['loads'] += 1
+        self.stats['version'] = f"{os.path.basename(self.path)}@{int(mtime)}"
+
+    def predict(self, matrix):
+        runner = self.current()
+        if runner is None:
+            return None
+        if self.columns is not None:
+            matrix = np.ascontiguousarray(matrix[:, self.columns])
+        return np.clip(np.asarray(runner(matrix), dtype=np.float64).ravel(), 0.0, 1.0)
+
+class InferenceService:
+    def __init__(self, store, max_batch=256, window=0.005):
+        self.store = store
+        self.max_batch = max_batch
+        self.window = window
+        self.pending = []
+        self.arrived = asyncio.Event()
+        self.filled = asyncio.Event()
+        self.task = None
+        self.stats = {
+            'batches': 0, 'items': 0, 'largest_batch': 0, 'fallback_batches': 0,
+            'errors': 0, 'inference_seconds': 0.0, 'wait_seconds': 0.0
+        }
+
+    async def score(self, features):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((features, future, time.perf_counter()))
+        self.arrived.set()
+        if len(self.pending) >= self.max_batch:
+            self.filled.set()
+        return await future
+
+    def predict(self, matrix):
+        scores = self.store.predict(matrix)
+        if scores is None:
+            self.stats['fallback_batches'] += 1
+            return blend(matrix)
+        return scores
+
+    async def run(self):
+        while True:
+            await self.arrived.wait()
+            if len(self.pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self.filled.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+            if len(self.pending) < self.max_batch:
+                self.filled.clear()
+            if not self.pending:
+                self.arrived.clear()
+            if not batch:
+                continue
+
+            matrix = np.stack([features for features, future, queued_at in batch])
+            started = time.perf_counter()
+            try:
+                scores = await asyncio.to_thread(self.predict, matrix)
+            except Exception as e:
+                self.stats['errors'] += 1
+                scores = blend(matrix)
+            finished = time.perf_counter()
+
+            self.stats['batches'] += 1
+            self.stats['items'] += len(batch)
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+            self.stats['inference_seconds'] += finished - started
+            for (features, future, queued_at), score in zip(batch, scores):
+                self.stats['wait_seconds'] += started - queued_at
+                if not future.done():
+                    future.set_result(float(score))
+
+    def get_stats(self):
+        batches = self.stats['batches'] or 1
+        items = self.stats['items'] or 1
+        return {
+            **self.stats,
+            'model': self.store.stats,
+            'mean_batch': self.stats['items'] / batches,
+            'mean_wait_ms': self.stats['wait_seconds'] / items * 1000,
+            'mean_inference_ms': self.stats['inference_seconds'] / batches * 1000,
+            'pending': len(self.pending)
+        }
@@ -0,0 +1,144 @@
+import asyncio
+import math
+import time
+
+SOURCES = ('twitter', 'reddit')
+SOURCE_WEIGHTS = {'twitter': 0.6, 'reddit': 0.4}
+VELOCITY_WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+
+UPDATE_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local tau = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local mentions = tonumber(ARGV[4])
+
+if redis.call('type', key).ok == 'string' then
+    redis.call('del', key)
+end
+
+local last = tonumber(redis.call('hget', key, 'ts') or now)
+local dt = math.max(now - last, 0)
+local decay = math.exp(-dt / tau)
+local fields = {'ts', now, 'last_updated', now}
+
+local i = 5
+while i <= #ARGV and ARGV[i] ~= '|' do
+    local name = ARGV[i]
+    local sum = tonumber(redis.call('hget', key, name .. '_sum') or 0) * decay + tonumber(ARGV[i + 1])
+    local weight = tonumber(redis.call('hget', key, name .. '_weight') or 0) * decay + tonumber(ARGV[i + 2])
+    table.insert(fields, name .. '_sum')
+    table.insert(fields, sum)
+    table.insert(fields, name .. '_weight')
+    table.insert(fields, weight)
+    i = i + 3
+end
+
+i = i + 1
+while i <= #ARGV do
+    local name = 'm_' .. ARGV[i]
+    local window = tonumber(ARGV[i + 1])
+    local count = tonumber(redis.call('hget', key, name) or 0) * math.exp(-dt / window) + mentions
+    table.insert(fields, name)
+    table.insert(fields, count)
+    i = i + 2
+end
+
+redis.call('hset', key, unpack(fields))
+redis.call('hincrby', key, 'mention_count', mentions)
+redis.call('expire', key, ttl)
+return 1
+"""
+
+class SocialAggregator:
+    def __init__(self, redis=None, resolve=None, decay_seconds=900, ttl=1800, flush_interval=1.0):
+        self.redis = redis
+        self.resolve = resolve
+        self.decay_seconds = decay_seconds
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.buffer = {}
+        self.script = None
+        self.stats = {'mentions': 0, 'flushes': 0, 'writes': 0, 'unresolved': 0}
+
+    def add(self, token, sentiment, source, weight=1.0):
+        entry = self.buffer.get(token)
+        if entry is None:
+            entry = self.buffer[token] = {'mentions': 0, **{name: [0.0, 0.0] for name in SOURCES}}
+        entry[source][0] += sentiment * weight
+        entry[source][1] += weight
+        entry['mentions'] += 1
+        self.stats['mentions'] += 1
+
+    def script_args(self, entry, now):
+        args = [now, self.decay_seconds, self.ttl, entry['mentions']]
+        for name in SOURCES:
+            args.extend((name, entry[name][0], entry[name][1]))
+        args.append('|')
+        for name, seconds in VELOCITY_WINDOWS.items():
+            args.extend((name, seconds))
+        return args
+
+    async def flush(self):
+        if not self.buffer or not self.redis:
+            return 0
+        if self.script is None:
+            self.script = self.redis.register_script(UPDATE_SCRIPT)
+
+        batch, self.buffer = self.buffer, {}
+        now = time.time()
+        writes = 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for token, entry in batch.items():
+            target = self.resolve(token) if self.resolve else token
+            if not target:
+                self.stats['unresolved'] += 1
+                continue
+            await self.script(keys=[self.key(target)], args=self.script_args(entry, now), client=pipe)
+            writes += 1
+        if writes:
+            await pipe.execute()
+
+        self.stats['flushes'] += 1
+        self.stats['writes'] += writes
+        return writes
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+            except Exception as e:
+                await asyncio.sleep(self.flush_interval * 5)
+
+    def key(self, token):
+        return f"social:{token}"
+
+    async def get(self, token):
+        data = await self.redis.hgetall(self.key(token))
+        if not data:
+            return {}
+        return self.decode(data, time.time())
+
+    def decode(self, data, now):
+        fields = {key.decode() if isinstance(key, bytes) else key: float(value) for key, value in data.items()}
+        dt = max(now - fields.get('ts', now), 0)
+        decay = math.exp(-dt / self.decay_seconds)
+
+        result = {'mention_count': int(fields.get('mention_count', 0)), 'last_updated': fields.get('last_updated', 0)}
+        overall = 0.0
+        for name in SOURCES:
+            weight = fields.get(f'{name}_weight', 0) * decay
+            sentiment = fields.get(f'{name}_sum', 0) / fields[f'{name}_weight'] if weight > 1e-6 else 0.5
+            result[f'{name}_sentiment'] = sentiment
+            result[f'{name}_weight'] = weight
+            overall += sentiment * SOURCE_WEIGHTS[name]
+        result['overall_sentiment'] = overall
+
+        for name, seconds in VELOCITY_WINDOWS.items():
+            count = fields.get(f'm_{name}', 0) * math.exp(-dt / seconds)
+            result[f'mentions_{name}'] = count
+            result[f'velocity_{name}'] = count / (seconds / 60)
+
+        return result
@@ -0,0 +1,201 @@
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from array import array
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from brain.features import FEATURE_NAMES, build_features, calc_technical_score, calc_time_horizon
+from scanner.recorder import recorded_hours, read_hour
+
+REQUIRED_FEATURES = ('social_score', 'whale_score')
+
+def build_dataset(record_dir, dataset_dir, chunk_rows=65536, tolerance=300.0, from_scans=False):
+    os.makedirs(dataset_dir, exist_ok=True)
+    width = len(FEATURE_NAMES)
+    buffer = np.empty((chunk_rows, width), dtype=np.float32)
+    filled = 0
+    rows = 0
+    labels = array('f')
+    timestamps = array('d')
+    pending = {}
+    stats = {'hours': 0, 'entries': 0, 'labelled': 0, 'expired': 0, 'mismatched': 0}
+
+    with open(os.path.join(dataset_dir, 'features.f32'), 'wb') as features_file:
+        for paths in recorded_hours(record_dir):
+            stats['hours'] += 1
+            for entry in read_hour(paths):
+                stats['entries'] += 1
+                ts = entry['ts']
+                horizon = None
+                if entry['kind'] == 'features':
+                    address, price = entry['address'], entry['price']
+                    if len(entry['features']) == width and price > 0:
+                        buffer[filled] = entry['features']
+                        horizon = entry['horizon']
+                    else:
+                        stats['mismatched'] += 1
+                elif entry['kind'] == 'token':
+                    token = entry['token']
+                    address, price = token['address'], token['price']
+                    if from_scans and token.get('urgency', 0) > 0 and price > 0:
+                        build_features(
+                            token, calc_technical_score(token),
+                            token.get('social_score', 0.5), token.get('whale_score', 0.5),
+                            out=buffer[filled]
+                        )
+                        horizon = calc_time_horizon(token)
+                else:
+                    address, price = entry['address'], entry['price']
+
+                if horizon is not None:
+                    heapq.heappush(pending.setdefault(address, []), (ts + horizon, rows, price))
+                    labels.append(np.nan)
+                    timestamps.append(ts)
+                    rows += 1
+                    filled += 1
+                    if filled == chunk_rows:
+                        features_file.write(buffer.tobytes())
+                        filled = 0
+
+                heap = pending.get(address)
+                while heap and heap[0][0] <= ts:
+                    target, row, entry_price = heapq.heappop(heap)
+                    if ts - target <= tolerance:
+                        labels[row] = price / entry_price - 1
+                        stats['labelled'] += 1
+                    else:
+                        stats['expired'] += 1
+                if heap is not None and not heap:
+                    del pending[address]
+
+        features_file.write(buffer[:filled].tobytes())
+
+    np.frombuffer(labels, dtype=np.float32).tofile(os.path.join(dataset_dir, 'labels.f32'))
+    np.frombuffer(timestamps, dtype=np.float64).tofile(os.path.join(dataset_dir, 'timestamps.f64'))
+    meta = {'rows': rows, 'features': FEATURE_NAMES, 'built_at': time.time(), **stats}
+    with open(os.path.join(dataset_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+def open_dataset(dataset_dir):
+    with open(os.path.join(dataset_dir, 'meta.json')) as f:
+        meta = json.load(f)
+    rows = meta['rows']
+    features = np.memmap(os.path.join(dataset_dir, 'features.f32'), dtype=np.float32, mode='r',
+                         shape=(rows, len(meta['features'])))
+    labels = np.memmap(os.path.join(dataset_dir, 'labels.f32'), dtype=np.float32, mode='r', shape=(rows,))
+    return meta, features, labels
+
+def chunks(start, stop, size):
+    return [(offset, min(offset + size, stop)) for offset in range(start, stop, size)]
+
+def labelled(features, labels, start, stop, columns=None):
+    y = np.asarray(labels[start:stop])
+    mask = ~np.isnan(y)
+    X = np.asarray(features[start:stop])[mask]
+    return (X[:, columns] if columns is not None else X), y[mask]
+
+def train(dataset_dir, model_path, min_return=0.05, epochs=3, validation=0.2, chunk_rows=65536, seed=7):
+    import joblib
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.metrics import log_loss, roc_auc_score
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    meta, features, labels = open_dataset(dataset_dir)
+    split = int(meta['rows'] * (1 - validation))
+    train_chunks = chunks(0, split, chunk_rows)
+    rng = np.random.default_rng(seed)
+
+    probe = StandardScaler()
+    for start, stop in train_chunks:
+        X, y = labelled(features, labels, start, stop)
+        if len(y):
+            probe.partial_fit(X)
+    if not hasattr(probe, 'var_'):
+        raise ValueError(f"No labelled rows in {dataset_dir}")
+    columns = np.flatnonzero(probe.var_ > 1e-12)
+    names = [meta['features'][index] for index in columns]
+    missing = [name for name in REQUIRED_FEATURES if name not in names]
+    if missing:
+        raise ValueError(
+            f"Refusing to train {model_path}: {', '.join(missing)} never vary in {dataset_dir}. "
+            f"Record with the predictor running so prediction-time features are captured"
+        )
+
+    scaler = StandardScaler()
+    for start, stop in train_chunks:
+        X, y = labelled(features, labels, start, stop, columns)
+        if len(y):
+            scaler.partial_fit(X)
+
+    classifier = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=seed)
+    for epoch in range(epochs):
+        for index in rng.permutation(len(train_chunks)):
+            X, y = labelled(features, labels, *train_chunks[index], columns)
+            if not len(y):
+                continue
+            order = rng.permutation(len(y))
+            classifier.partial_fit(scaler.transform(X[order]), (y[order] > min_return).astype(np.int8), classes=[0, 1])
+
+    model = make_pipeline(scaler, classifier)
+    scores, truth = [], []
+    for start, stop in chunks(split, meta['rows'], chunk_rows):
+        X, y = labelled(features, labels, start, stop, columns)
+        if len(y):
+            scores.append(model.predict_proba(X)[:, 1])
+            truth.append(y > min_return)
+    metrics = {'train_rows': split, 'validation_rows': 0}
+    if scores:
+        scores, truth = np.concatenate(scores), np.concatenate(truth)
+        metrics.update({
+            'validation_rows': len(truth),
+            'positive_rate': float(truth.mean()),
+            'log_loss': float(log_loss(truth, scores, labels=[False, True])),
+            'auc': float(roc_auc_score(truth, scores)) if 0 < truth.sum() < len(truth) else None,
+            'precision_at_70': float(truth[scores >= 0.7].mean()) if (scores >= 0.7).any() else None
+        })
+
+    os.makedirs(os.path.dirname(model_path) or '.', exist_ok=True)
+    tmp_path = model_path + '.tmp'
+    joblib.dump({
+        'model': model,
+        'features': names,
+        'min_return': min_return,
+        'trained_at': time.time(),
+        'metrics': metrics
+    }, tmp_path)
+    os.replace(tmp_path, model_path)
+    return metrics
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a labelled dataset from recorded scans and train the prediction model")
+    parser.add_argument('--records', default=os.getenv('SCAN_RECORD_DIR', 'data/records'))
+    parser.add_argument('--dataset', default='data/training')
+    parser.add_argument('--model', default=os.getenv('MODEL_PATH', 'data/models/predictor.joblib'))
+    parser.add_argument('--min-return', type=float, default=0.05)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--validation', type=float, default=0.2)
+    parser.add_argument('--chunk-rows', type=int, default=65536)
+    parser.add_argument('--skip-build', action='store_true')
+    parser.add_argument('--from-scans', action='store_true',
+                        help="also build rows from scanner token entries (social and whale inputs are not recorded there)")
+    args = parser.parse_args()
+
+    if not args.skip_build:
+        started = time.perf_counter()
+        meta = build_dataset(args.records, args.dataset, args.chunk_rows, from_scans=args.from_scans)
+        print(f"📦 Built {meta['rows']} rows ({meta['labelled']} labelled) from {meta['hours']} hours "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    metrics = train(args.dataset, args.model, args.min_return, args.epochs, args.validation, args.chunk_rows)
+    print(f"🧠 Trained {args.model} in {time.perf_counter() - started:.1f}s: {metrics}")
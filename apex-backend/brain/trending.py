@@ -0,0 +1,109 @@
+import hashlib
+import time
+
+import numpy as np
+
+class TrendingDetector:
+    def __init__(self, width=2048, depth=4, bucket_seconds=10, window_seconds=300, short_seconds=60, top_k=64):
+        self.width = width
+        self.depth = depth
+        self.bucket_seconds = bucket_seconds
+        self.buckets = max(int(window_seconds // bucket_seconds), 2)
+        self.short_buckets = min(max(int(short_seconds // bucket_seconds), 1), self.buckets // 2)
+        self.short_minutes = self.short_buckets * bucket_seconds / 60
+        self.counts = np.zeros((self.buckets, depth, width), dtype=np.int32)
+        self.window = np.zeros((depth, width), dtype=np.int64)
+        self.rows = np.arange(depth)
+        self.current = 0
+        self.epoch = None
+        self.top_k = top_k
+        self.heavy = {}
+        self.floor = 0
+        self.stats = {'mentions': 0, 'rotations': 0, 'evictions': 0}
+
+    def indexes(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype='<u4') % self.width
+
+    def advance(self, now):
+        bucket = int(now // self.bucket_seconds)
+        if self.epoch is None:
+            self.epoch = bucket
+        steps = bucket - self.epoch
+        if steps <= 0:
+            return
+        for _ in range(min(steps, self.buckets)):
+            self.current = (self.current + 1) % self.buckets
+            self.window -= self.counts[self.current]
+            self.counts[self.current] = 0
+        self.epoch = bucket
+        self.stats['rotations'] += 1
+        self.refresh_heavy()
+
+    def refresh_heavy(self):
+        if not self.heavy:
+            return
+        keys = list(self.heavy)
+        indexes = np.array([self.heavy[key][0] for key in keys])
+        estimates = self.counts[:, self.rows, indexes].min(axis=2).sum(axis=0)
+        for key, estimate in zip(keys, estimates.tolist()):
+            if estimate:
+                self.heavy[key][1] = estimate
+            else:
+                del self.heavy[key]
+        self.floor = min(entry[1] for entry in self.heavy.values()) if len(self.heavy) >= self.top_k else 0
+
+    def series(self, indexes):
+        return np.roll(self.counts[:, self.rows, indexes].min(axis=1), -(self.current + 1))
+
+    def add(self, key, now=None, count=1):
+        self.advance(now or time.time())
+        indexes = self.indexes(key)
+        self.counts[self.current, self.rows, indexes] += count
+        self.window[self.rows, indexes] += count
+        self.stats['mentions'] += count
+
+        entry = self.heavy.get(key)
+        if entry is not None:
+            entry[1] += count
+            return
+        estimate = int(self.window[self.rows, indexes].min())
+        if estimate <= self.floor:
+            return
+        if len(self.heavy) >= self.top_k:
+            weakest = min(self.heavy, key=lambda name: self.heavy[name][1])
+            if self.heavy[weakest][1] >= estimate:
+                self.floor = self.heavy[weakest][1]
+                return
+            del self.heavy[weakest]
+            self.stats['evictions'] += 1
+        self.heavy[key] = [indexes, estimate]
+        if len(self.heavy) >= self.top_k:
+            self.floor = min(entry[1] for entry in self.heavy.values())
+
+    def describe(self, key, indexes):
+        series = self.series(indexes)
+        velocity = series[-self.short_buckets:].sum() / self.short_minutes
+        previous = series[-2 * self.short_buckets:-self.short_buckets].sum() / self.short_minutes
+        return {
+            'ticker': key,
+            'mentions': int(series.sum()),
+            'velocity': float(velocity),
+            'acceleration': float((velocity - previous) / self.short_minutes)
+        }
+
+    def get(self, key, now=None):
+        self.advance(now or time.time())
+        entry = self.heavy.get(key)
+        return self.describe(key, entry[0] if entry else self.indexes(key))
+
+    def is_trending(self, key):
+        return key in self.heavy
+
+    def top(self, limit=10, now=None):
+        self.advance(now or time.time())
+        ranked = sorted(self.heavy.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [self.describe(key, indexes) for key, (indexes, estimate) in ranked]
+
+    def get_stats(self):
+        return {**self.stats, 'tracked': len(self.heavy), 'memory_bytes': self.counts.nbytes}
@@ -0,0 +1,125 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import OrderedDict
+
+from runtime.ratelimit import RateLimiter
+
+ETHERSCAN_URL = "https://api.etherscan.io/api"
+
+class SeenSet:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+
+    def add(self, key):
+        if key in self.items:
+            return False
+        self.items[key] = None
+        if len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+        return True
+
+def load_wallets(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        if path.endswith('.json'):
+            return {address: float(score) for address, score in json.load(f).items()}
+        wallets = {}
+        for row in csv.reader(f):
+            if row and not row[0].startswith('#'):
+                wallets[row[0].strip()] = float(row[1]) if len(row) > 1 and row[1].strip() else 0.5
+        return wallets
+
+class WhaleTracker:
+    def __init__(self, wallets, on_transaction, cursor_path=None, rate_per_second=5,
+                 concurrency=10, poll_interval=60, page_size=100, seen_size=100000):
+        self.wallets = wallets
+        self.on_transaction = on_transaction
+        self.cursor_path = cursor_path
+        self.limiter = RateLimiter(rate_per_second)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.poll_interval = poll_interval
+        self.page_size = page_size
+        self.seen = SeenSet(seen_size)
+        self.cursors = {}
+        self.api_key = os.getenv('ETHERSCAN_API_KEY')
+        self.stats = {'requests': 0, 'new_transactions': 0, 'duplicates': 0, 'errors': 0, 'cycle_seconds': 0.0}
+
+    def load_cursors(self):
+        if self.cursor_path and os.path.exists(self.cursor_path):
+            with open(self.cursor_path) as f:
+                self.cursors = json.load(f)
+
+    def save_cursors(self):
+        if not self.cursor_path:
+            return
+        os.makedirs(os.path.dirname(self.cursor_path) or '.', exist_ok=True)
+        tmp_path = self.cursor_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.cursors, f)
+        os.replace(tmp_path, self.cursor_path)
+
+    def build_params(self, wallet):
+        params = {'module': 'account', 'action': 'txlist', 'address': wallet, 'page': 1}
+        cursor = self.cursors.get(wallet)
+        if cursor:
+            params.update({'startblock': cursor[0], 'sort': 'asc', 'offset': self.page_size})
+        else:
+            params.update({'sort': 'desc', 'offset': 10})
+        if self.api_key:
+            params['apikey'] = self.api_key
+        return params
+
+    async def poll_wallet(self, session, wallet):
+        async with self.semaphore:
+            await self.limiter.acquire()
+            self.stats['requests'] += 1
+            try:
+                async with session.get(ETHERSCAN_URL, params=self.build_params(wallet)) as resp:
+                    if resp.status != 200:
+                        self.stats['errors'] += 1
+                        return
+                    data = await resp.json()
+            except Exception as e:
+                self.stats['errors'] += 1
+                return
+
+        result = data.get('result')
+        if not isinstance(result, list):
+            return
+
+        cursor = self.cursors.get(wallet)
+        latest = cursor
+        for tx in sorted(result, key=lambda t: int(t.get('blockNumber', 0))):
+            tx_hash = tx.get('hash')
+            block = int(tx.get('blockNumber', 0))
+            if cursor and (block < cursor[0] or tx_hash == cursor[1]):
+                continue
+            if not self.seen.add(tx_hash):
+                self.stats['duplicates'] += 1
+                continue
+            self.stats['new_transactions'] += 1
+            await self.on_transaction(tx, wallet)
+            latest = [block, tx_hash]
+
+        if latest:
+            self.cursors[wallet] = latest
+
+    async def run(self, session):
+        self.load_cursors()
+        while True:
+            try:
+                started = time.monotonic()
+                await asyncio.gather(*[self.poll_wallet(session, wallet) for wallet in list(self.wallets)])
+                self.stats['cycle_seconds'] = time.monotonic() - started
+                await asyncio.to_thread(self.save_cursors)
+                await asyncio.sleep(max(self.poll_interval - self.stats['cycle_seconds'], 0))
+            except Exception as e:
+                await asyncio.sleep(self.poll_interval * 2)
+
+    def get_stats(self):
+        return {**self.stats, 'wallets': len(self.wallets), 'cursors': len(self.cursors)}
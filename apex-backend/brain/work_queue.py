@@ -0,0 +1,82 @@
+import hashlib
+import heapq
+import itertools
+import time
+from collections import deque
+
+import numpy as np
+
+class PredictionQueue:
+    def __init__(self, age_seconds=30.0, refresh_interval=60.0, high_urgency=7, wait_samples=2048):
+        self.age_seconds = age_seconds
+        self.refresh_interval = refresh_interval
+        self.high_urgency = high_urgency
+        self.heap = []
+        self.queued = {}
+        self.fingerprints = {}
+        self.counter = itertools.count()
+        self.waits = {'high': deque(maxlen=wait_samples), 'normal': deque(maxlen=wait_samples)}
+        self.stats = {'offered': 0, 'queued': 0, 'unchanged': 0, 'processed': 0, 'deferred': 0, 'dropped': 0}
+
+    def priority(self, token, now):
+        return now / self.age_seconds - (token.get('urgency', 0) / 10 + token.get('confidence', 0))
+
+    def changed(self, address, raw, now=None):
+        now = now or time.time()
+        self.stats['offered'] += 1
+        fingerprint = hashlib.blake2b(raw, digest_size=16).digest()
+        previous = self.fingerprints.get(address)
+        if previous and previous[0] == fingerprint and now - previous[1] < self.refresh_interval:
+            self.stats['unchanged'] += 1
+            return False
+        self.fingerprints[address] = (fingerprint, now)
+        return True
+
+    def push(self, address, token, now=None):
+        now = now or time.time()
+        seq = next(self.counter)
+        self.queued[address] = seq
+        heapq.heappush(self.heap, (self.priority(token, now), seq, address, token, now))
+        self.stats['queued'] += 1
+
+    def pop(self):
+        while self.heap:
+            priority, seq, address, token, enqueued_at = heapq.heappop(self.heap)
+            if self.queued.get(address) != seq:
+                continue
+            del self.queued[address]
+            return address, token, enqueued_at
+        return None
+
+    def record_wait(self, token, enqueued_at, now=None):
+        now = now or time.time()
+        band = 'high' if token.get('urgency', 0) >= self.high_urgency else 'normal'
+        self.waits[band].append(now - enqueued_at)
+        self.stats['processed'] += 1
+
+    def retain(self, addresses):
+        for address in [address for address in self.fingerprints if address not in addresses]:
+            del self.fingerprints[address]
+            if self.queued.pop(address, None) is not None:
+                self.stats['dropped'] += 1
+        if len(self.heap) > 2 * len(self.queued) + 64:
+            self.heap = [entry for entry in self.heap if self.queued.get(entry[2]) == entry[1]]
+            heapq.heapify(self.heap)
+
+    def __len__(self):
+        return len(self.queued)
+
+    def wait_stats(self, band):
+        waits = np.fromiter(self.waits[band], dtype=np.float64)
+        if not len(waits):
+            return {'samples': 0, 'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+        p50, p95 = np.percentile(waits, [50, 95]) * 1000
+        return {'samples': len(waits), 'p50_ms': float(p50), 'p95_ms': float(p95), 'max_ms': float(waits.max() * 1000)}
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            'depth': len(self.queued),
+            'wait_high_urgency': self.wait_stats('high'),
+            'wait_normal': self.wait_stats('normal')
+        }
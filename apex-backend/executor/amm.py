@@ -0,0 +1,117 @@
+import asyncio
+import secrets
+import time
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class Pool:
+    token_reserve: float
+    quote_reserve: float
+    fee: float
+    updated: float
+    quoted: float = 0.0
+    block: float = -1
+
+@dataclass(slots=True)
+class Fill:
+    tx_hash: str
+    amount_in: float
+    amount_out: float
+    price: float
+    slippage: float
+    fee_paid: float
+    block_delay: float
+
+class AMMSimulator:
+    def __init__(self, fee=0.003, block_time=0.1, default_liquidity=10000.0):
+        self.fee = fee
+        self.block_time = block_time
+        self.default_liquidity = default_liquidity
+        self.pools = {}
+        self.stats = {'swaps': 0, 'volume_usd': 0.0, 'fees_usd': 0.0, 'max_slippage': 0.0}
+
+    def block_of(self, now):
+        return now // self.block_time if self.block_time else now
+
+    def sync(self, token, price, liquidity_usd=0.0, now=None):
+        if price <= 0:
+            return None
+        now = now or time.time()
+        pool = self.pools.get(token)
+        if pool is not None and (price == pool.quoted or pool.block == self.block_of(now)):
+            pool.updated = now
+            return pool
+        if liquidity_usd > 0:
+            depth = liquidity_usd / 2
+        elif pool is not None:
+            depth = pool.quote_reserve
+        else:
+            depth = self.default_liquidity / 2
+        if pool is None:
+            pool = self.pools[token] = Pool(depth / price, depth, self.fee, 0.0)
+        else:
+            pool.quote_reserve = depth
+            pool.token_reserve = depth / price
+        pool.quoted = price
+        pool.updated = now
+        return pool
+
+    def drop(self, token):
+        self.pools.pop(token, None)
+
+    def price(self, token):
+        pool = self.pools.get(token)
+        return pool.quote_reserve / pool.token_reserve if pool else None
+
+    def quote_buy(self, token, amount_usd):
+        pool = self.pools[token]
+        amount_in = amount_usd * (1 - pool.fee)
+        return pool.token_reserve * amount_in / (pool.quote_reserve + amount_in)
+
+    def quote_sell(self, token, token_amount):
+        pool = self.pools[token]
+        amount_in = token_amount * (1 - pool.fee)
+        return pool.quote_reserve * amount_in / (pool.token_reserve + amount_in)
+
+    def buy(self, token, amount_usd):
+        pool = self.pools[token]
+        spot = pool.quote_reserve / pool.token_reserve
+        tokens_out = self.quote_buy(token, amount_usd)
+        pool.quote_reserve += amount_usd
+        pool.token_reserve -= tokens_out
+        pool.block = self.block_of(time.time())
+        return self.record(amount_usd, tokens_out, amount_usd / tokens_out, spot, amount_usd * pool.fee, amount_usd)
+
+    def sell(self, token, token_amount):
+        pool = self.pools[token]
+        spot = pool.quote_reserve / pool.token_reserve
+        usd_out = self.quote_sell(token, token_amount)
+        pool.token_reserve += token_amount
+        pool.quote_reserve -= usd_out
+        pool.block = self.block_of(time.time())
+        return self.record(token_amount, usd_out, usd_out / token_amount, spot, token_amount * pool.fee * spot, usd_out)
+
+    def record(self, amount_in, amount_out, price, spot, fee_usd, volume_usd):
+        slippage = abs(price / spot - 1)
+        self.stats['swaps'] += 1
+        self.stats['volume_usd'] += volume_usd
+        self.stats['fees_usd'] += fee_usd
+        self.stats['max_slippage'] = max(self.stats['max_slippage'], slippage)
+        return Fill(f"0x{secrets.token_hex(32)}", amount_in, amount_out, price, slippage, fee_usd, self.block_time)
+
+    async def swap_buy(self, token, amount_usd, price=None, liquidity_usd=0.0):
+        if price:
+            self.sync(token, price, liquidity_usd)
+        if self.block_time:
+            await asyncio.sleep(self.block_time)
+        return self.buy(token, amount_usd)
+
+    async def swap_sell(self, token, token_amount, price=None, liquidity_usd=0.0):
+        if price:
+            self.sync(token, price, liquidity_usd)
+        if self.block_time:
+            await asyncio.sleep(self.block_time)
+        return self.sell(token, token_amount)
+
+    def get_stats(self):
+        return {**self.stats, 'pools': len(self.pools)}
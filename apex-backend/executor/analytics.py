@@ -0,0 +1,184 @@
+import math
+import time
+from collections import deque
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.wins = 0
+        self.best = 0.0
+        self.worst = 0.0
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.total += value
+        if value > 0:
+            self.wins += 1
+        self.best = max(self.best, value)
+        self.worst = min(self.worst, value)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'std': self.std,
+            'win_rate': self.wins / self.count * 100 if self.count else 0.0,
+            'best': self.best,
+            'worst': self.worst
+        }
+
+    def export_state(self):
+        return [self.count, self.mean, self.m2, self.total, self.wins, self.best, self.worst]
+
+    def load_state(self, state):
+        self.count, self.mean, self.m2, self.total, self.wins, self.best, self.worst = state
+
+class RollingWindow:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.events = deque()
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.wins = 0
+
+    def add(self, timestamp, value):
+        self.events.append((timestamp, value))
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if value > 0:
+            self.wins += 1
+        self.evict(timestamp)
+
+    def evict(self, now):
+        cutoff = now - self.seconds
+        while self.events and self.events[0][0] < cutoff:
+            timestamp, value = self.events.popleft()
+            self.count -= 1
+            self.total -= value
+            self.total_sq -= value * value
+            if value > 0:
+                self.wins -= 1
+
+    def to_dict(self, now):
+        self.evict(now)
+        if not self.count:
+            return {'count': 0, 'pnl': 0.0, 'mean': 0.0, 'std': 0.0, 'win_rate': 0.0}
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean * mean, 0.0)
+        return {
+            'count': self.count,
+            'pnl': self.total,
+            'mean': mean,
+            'std': math.sqrt(variance),
+            'win_rate': self.wins / self.count * 100
+        }
+
+class PerformanceAnalytics:
+    def __init__(self, starting_equity, windows=None):
+        self.starting_equity = starting_equity
+        self.equity = starting_equity
+        self.peak_equity = starting_equity
+        self.max_drawdown = 0.0
+        self.pnl = RunningStats()
+        self.returns = RunningStats()
+        self.holding_time = RunningStats()
+        self.by_type = {}
+        self.by_chain = {}
+        self.windows = {
+            name: RollingWindow(seconds)
+            for name, seconds in (windows or {'1h': 3600, '24h': 86400}).items()
+        }
+
+    def record_trade(self, pnl_usd, pnl_percent, opportunity_type='', chain='',
+                     holding_time=0.0, timestamp=None):
+        timestamp = timestamp or time.time()
+
+        self.pnl.update(pnl_usd)
+        self.returns.update(pnl_percent / 100)
+        self.holding_time.update(holding_time)
+
+        self.by_type.setdefault(opportunity_type or 'UNKNOWN', RunningStats()).update(pnl_usd)
+        self.by_chain.setdefault(chain or 'unknown', RunningStats()).update(pnl_usd)
+
+        for window in self.windows.values():
+            window.add(timestamp, pnl_usd)
+
+        self.equity += pnl_usd
+        self.peak_equity = max(self.peak_equity, self.equity)
+        if self.peak_equity > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak_equity - self.equity) / self.peak_equity)
+
+    def current_drawdown(self):
+        if self.peak_equity <= 0:
+            return 0.0
+        return (self.peak_equity - self.equity) / self.peak_equity
+
+    def sharpe(self):
+        std = self.returns.std
+        return self.returns.mean / std if std > 0 else 0.0
+
+    def snapshot(self):
+        now = time.time()
+        return {
+            'closed_trades': self.pnl.count,
+            'pnl': self.pnl.to_dict(),
+            'returns': self.returns.to_dict(),
+            'sharpe_per_trade': self.sharpe(),
+            'sharpe_scaled': self.sharpe() * math.sqrt(self.returns.count),
+            'equity': self.equity,
+            'peak_equity': self.peak_equity,
+            'current_drawdown': self.current_drawdown(),
+            'max_drawdown': self.max_drawdown,
+            'avg_holding_time': self.holding_time.mean,
+            'by_opportunity_type': {name: stats.to_dict() for name, stats in self.by_type.items()},
+            'by_chain': {name: stats.to_dict() for name, stats in self.by_chain.items()},
+            'rolling': {name: window.to_dict(now) for name, window in self.windows.items()}
+        }
+
+    def export_state(self):
+        return {
+            'equity': self.equity,
+            'peak_equity': self.peak_equity,
+            'max_drawdown': self.max_drawdown,
+            'pnl': self.pnl.export_state(),
+            'returns': self.returns.export_state(),
+            'holding_time': self.holding_time.export_state(),
+            'by_type': {name: stats.export_state() for name, stats in self.by_type.items()},
+            'by_chain': {name: stats.export_state() for name, stats in self.by_chain.items()},
+            'windows': {name: list(window.events) for name, window in self.windows.items()}
+        }
+
+    def load_state(self, state):
+        self.equity = state['equity']
+        self.peak_equity = state['peak_equity']
+        self.max_drawdown = state['max_drawdown']
+        self.pnl.load_state(state['pnl'])
+        self.returns.load_state(state['returns'])
+        self.holding_time.load_state(state['holding_time'])
+
+        for target, source in ((self.by_type, state['by_type']), (self.by_chain, state['by_chain'])):
+            target.clear()
+            for name, values in source.items():
+                stats = RunningStats()
+                stats.load_state(values)
+                target[name] = stats
+
+        for name, events in state['windows'].items():
+            if name in self.windows:
+                window = RollingWindow(self.windows[name].seconds)
+                for timestamp, value in events:
+                    window.add(timestamp, value)
+                self.windows[name] = window
@@ -0,0 +1,248 @@
+import asyncio
+import bisect
+import json
+import os
+import struct
+import time
+import zlib
+
+RECORD_HEADER = struct.Struct('<BdII')
+
+KIND_OPEN = 1
+KIND_CLOSE = 2
+
+class TradeJournal:
+    def __init__(self, directory, fsync_interval=0.05, fsync_batch=256,
+                 snapshot_every=1000, snapshot_interval=60, index_every=1024):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, 'trades.journal')
+        self.snapshot_path = os.path.join(directory, 'snapshot.json')
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval
+        self.index_every = index_every
+
+        self.file = None
+        self.offset = 0
+        self.seq = 0
+        self.pending = 0
+        self.records_since_snapshot = 0
+        self.last_snapshot = time.time()
+        self.index = []
+        self.flush_requested = None
+        self.state_fn = None
+        self.stats = {'records': 0, 'fsyncs': 0, 'snapshots': 0, 'replayed': 0, 'recovery_ms': 0.0}
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.file = open(self.journal_path, 'ab', buffering=1 << 16)
+        self.offset = self.file.tell()
+
+    def recover(self, apply_fn):
+        started = time.perf_counter()
+        snapshot = self.load_snapshot()
+        state = None
+        start_offset = 0
+        self.seq = 0
+        self.index = []
+
+        if snapshot:
+            state = snapshot['state']
+            start_offset = snapshot['offset']
+            self.seq = snapshot['seq']
+            self.index = [tuple(entry) for entry in snapshot.get('index', [])]
+
+        good_offset = start_offset
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            if os.path.getsize(self.journal_path) < start_offset:
+                start_offset = good_offset = 0
+                state = None
+                self.seq = 0
+                self.index = []
+
+            pending_records = []
+            for kind, timestamp, payload, offset, end in self.iter_records(start_offset):
+                if self.seq % self.index_every == 0:
+                    self.index.append((timestamp, offset))
+                self.seq += 1
+                good_offset = end
+                pending_records.append((kind, payload))
+                replayed += 1
+
+            self.truncate(good_offset)
+        else:
+            pending_records = []
+            good_offset = 0
+            self.index = []
+
+        self.open()
+        self.offset = good_offset
+
+        if state is not None:
+            apply_fn(None, state)
+        for kind, payload in pending_records:
+            apply_fn(kind, payload)
+
+        self.records_since_snapshot = replayed
+        self.stats['replayed'] = replayed
+        self.stats['recovery_ms'] = (time.perf_counter() - started) * 1000
+        return replayed
+
+    def truncate(self, offset):
+        if os.path.getsize(self.journal_path) > offset:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(offset)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def load_snapshot(self):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                return json.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def append(self, kind, payload, timestamp=None):
+        timestamp = timestamp or time.time()
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        header = RECORD_HEADER.pack(kind, timestamp, len(body), zlib.crc32(body))
+
+        if self.seq % self.index_every == 0:
+            self.index.append((timestamp, self.offset))
+
+        self.file.write(header)
+        self.file.write(body)
+        self.offset += len(header) + len(body)
+        self.seq += 1
+        self.pending += 1
+        self.records_since_snapshot += 1
+        self.stats['records'] += 1
+
+        if self.pending >= self.fsync_batch and self.flush_requested:
+            self.flush_requested.set()
+
+    def sync(self):
+        if self.file and self.pending:
+            self.file.flush()
+            self.pending = 0
+            fd = self.file.fileno()
+            return fd
+        return None
+
+    async def flush(self):
+        fd = self.sync()
+        if fd is not None:
+            await asyncio.to_thread(os.fsync, fd)
+            self.stats['fsyncs'] += 1
+
+    async def flush_loop(self, state_fn):
+        self.state_fn = state_fn
+        self.flush_requested = asyncio.Event()
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self.flush_requested.wait(), self.fsync_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self.flush_requested.clear()
+                await self.flush()
+
+                if self.records_since_snapshot and (
+                    self.records_since_snapshot >= self.snapshot_every or
+                    time.time() - self.last_snapshot > self.snapshot_interval
+                ):
+                    await self.snapshot()
+
+            except Exception as e:
+                await asyncio.sleep(1)
+
+    async def snapshot(self):
+        snapshot = {
+            'offset': self.offset,
+            'seq': self.seq,
+            'index': list(self.index),
+            'created_at': time.time(),
+            'state': self.state_fn()
+        }
+        self.records_since_snapshot = 0
+        self.last_snapshot = time.time()
+
+        await self.flush()
+        await asyncio.to_thread(self.write_snapshot, json.dumps(snapshot, separators=(',', ':')).encode())
+        self.stats['snapshots'] += 1
+
+    def write_snapshot(self, data):
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def iter_records(self, start_offset=0):
+        with open(self.journal_path, 'rb', buffering=1 << 20) as f:
+            f.seek(start_offset)
+            offset = start_offset
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                kind, timestamp, length, crc = RECORD_HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length or zlib.crc32(body) != crc:
+                    return
+                end = offset + RECORD_HEADER.size + length
+                yield kind, timestamp, json.loads(body), offset, end
+                offset = end
+
+    def refresh_index(self):
+        snapshot = self.load_snapshot()
+        if snapshot:
+            self.index = [tuple(entry) for entry in snapshot.get('index', [])]
+
+    def index_position(self, timestamp):
+        return bisect.bisect_right(self.index, (timestamp, float('inf'))) - 1
+
+    def scan(self, start_offset, start, end, kinds, limit):
+        results = []
+        for kind, timestamp, payload, offset, record_end in self.iter_records(start_offset):
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                break
+            if kinds and kind not in kinds:
+                continue
+            results.append((kind, timestamp, payload))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def query(self, start=None, end=None, kinds=None, limit=100, newest=False):
+        if self.file:
+            self.file.flush()
+        elif not os.path.exists(self.journal_path):
+            return []
+
+        if not newest:
+            position = self.index_position(start) if start is not None else -1
+            start_offset = self.index[position][1] if position >= 0 else 0
+            return self.scan(start_offset, start, end, kinds, limit)
+
+        position = self.index_position(end) if end is not None else len(self.index) - 1
+        while True:
+            start_offset = self.index[position][1] if position >= 0 else 0
+            results = self.scan(start_offset, start, end, kinds, None)
+            if len(results) >= limit or start_offset == 0:
+                return results[-limit:]
+            if start is not None and self.index[position][0] <= start:
+                return results[-limit:]
+            position -= 1
+
+    def close(self):
+        if self.file:
+            self.sync()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
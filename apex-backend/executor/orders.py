@@ -0,0 +1,219 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+CHAIN_IDS = {'ethereum': 1, 'bsc': 56, 'polygon': 137, 'arbitrum': 42161, 'base': 8453}
+
+ROUTERS = {
+    'ethereum': '0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D',
+    'bsc': '0x10ED43C718714eb63d5aA57B78B54704E256024E',
+    'polygon': '0xa5E0829CaCEd8fFDD4De3c43696c57F7D7A678ff',
+    'arbitrum': '0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506',
+    'base': '0x4752ba5DBc23f44D87826276BF6Fd6b1C372aD24'
+}
+
+WRAPPED_NATIVE = {
+    'ethereum': '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',
+    'bsc': '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c',
+    'polygon': '0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270',
+    'arbitrum': '0x82aF49447D8a07e3bd95BD0d56f35241523fBab1',
+    'base': '0x4200000000000000000000000000000000000006'
+}
+
+SWAP_EXACT_ETH_FOR_TOKENS = bytes.fromhex('7ff36ab5')
+SWAP_EXACT_TOKENS_FOR_ETH = bytes.fromhex('18cbafe5')
+
+RESYNC_ERRORS = ('nonce too low', 'nonce too high', 'already known', 'replacement transaction underpriced')
+
+class RPCError(Exception):
+    pass
+
+def word(value):
+    return value.to_bytes(32, 'big')
+
+def address_word(address):
+    return bytes(12) + bytes.fromhex(address[2:])
+
+class SwapTemplate:
+    def __init__(self, router, recipient, native):
+        self.router = router
+        self.native = address_word(native)
+        recipient = address_word(recipient)
+        self.buy_tail = word(0x80) + recipient
+        self.sell_tail = word(0xa0) + recipient
+
+    def buy(self, token, amount_out_min, deadline):
+        return b''.join((
+            SWAP_EXACT_ETH_FOR_TOKENS, word(amount_out_min), self.buy_tail, word(deadline),
+            word(2), self.native, address_word(token)
+        ))
+
+    def sell(self, token, amount_in, amount_out_min, deadline):
+        return b''.join((
+            SWAP_EXACT_TOKENS_FOR_ETH, word(amount_in), word(amount_out_min), self.sell_tail, word(deadline),
+            word(2), address_word(token), self.native
+        ))
+
+class NonceManager:
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.next_nonce = None
+        self.lock = asyncio.Lock()
+        self.outstanding = set()
+        self.stats = {'issued': 0, 'resyncs': 0, 'rollbacks': 0}
+
+    async def sync(self):
+        self.next_nonce = await self.fetch()
+        self.stats['resyncs'] += 1
+
+    async def reserve(self):
+        async with self.lock:
+            if self.next_nonce is None:
+                await self.sync()
+            nonce = self.next_nonce
+            self.next_nonce += 1
+            self.outstanding.add(nonce)
+            self.stats['issued'] += 1
+            return nonce
+
+    def confirm(self, nonce):
+        self.outstanding.discard(nonce)
+
+    async def fail(self, nonce, error):
+        async with self.lock:
+            self.outstanding.discard(nonce)
+            message = str(error).lower()
+            if not any(reason in message for reason in RESYNC_ERRORS) and nonce == self.next_nonce - 1:
+                self.next_nonce = nonce
+                self.stats['rollbacks'] += 1
+            else:
+                await self.sync()
+
+class GasOracle:
+    def __init__(self, fetch, refresh_interval=3.0, multiplier=1.1):
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.multiplier = multiplier
+        self.price = None
+        self.updated = 0.0
+        self.stats = {'refreshes': 0, 'cold_reads': 0}
+
+    async def refresh(self):
+        self.price = await self.fetch()
+        self.updated = time.monotonic()
+        self.stats['refreshes'] += 1
+
+    async def current(self):
+        if self.price is None or time.monotonic() - self.updated > self.refresh_interval * 4:
+            self.stats['cold_reads'] += 1
+            await self.refresh()
+        return int(self.price * self.multiplier)
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+                await asyncio.sleep(self.refresh_interval)
+            except Exception as e:
+                await asyncio.sleep(self.refresh_interval * 2)
+
+def check_chain(chain, router=None):
+    if chain not in CHAIN_IDS or chain not in WRAPPED_NATIVE or (router is None and chain not in ROUTERS):
+        supported = ', '.join(sorted(set(CHAIN_IDS) & set(ROUTERS) & set(WRAPPED_NATIVE)))
+        raise ValueError(f"Unsupported trading chain {chain!r}, expected one of: {supported}")
+
+class OrderSubmitter:
+    def __init__(self, rpc_url, private_key, chain='polygon', router=None, gas_limit=300000,
+                 deadline_seconds=120, signer_threads=2):
+        check_chain(chain, router)
+        from eth_account import Account
+
+        self.rpc_url = rpc_url
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.chain_id = CHAIN_IDS[chain]
+        self.template = SwapTemplate(router or ROUTERS[chain], self.address, WRAPPED_NATIVE[chain])
+        self.gas_limit = gas_limit
+        self.deadline_seconds = deadline_seconds
+        self.nonces = NonceManager(self.fetch_nonce)
+        self.gas = GasOracle(self.fetch_gas_price)
+        self.signer = ThreadPoolExecutor(max_workers=signer_threads, thread_name_prefix='signer')
+        self.ids = itertools.count(1)
+        self.session = None
+        self.stats = {'submitted': 0, 'failed': 0, 'sign_seconds': 0.0, 'submit_seconds': 0.0}
+
+    async def start(self, session=None):
+        self.session = session or aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        await asyncio.gather(self.gas.refresh(), self.nonces.sync())
+        asyncio.create_task(self.gas.run())
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+        self.signer.shutdown(wait=False)
+
+    async def rpc(self, method, params):
+        payload = {'jsonrpc': '2.0', 'id': next(self.ids), 'method': method, 'params': params}
+        async with self.session.post(self.rpc_url, json=payload) as resp:
+            data = await resp.json(content_type=None)
+        if 'error' in data:
+            raise RPCError(data['error'].get('message', data['error']))
+        return data['result']
+
+    async def fetch_nonce(self):
+        return int(await self.rpc('eth_getTransactionCount', [self.address, 'pending']), 16)
+
+    async def fetch_gas_price(self):
+        return int(await self.rpc('eth_gasPrice', []), 16)
+
+    def sign(self, transaction):
+        started = time.perf_counter()
+        raw = self.account.sign_transaction(transaction).rawTransaction
+        self.stats['sign_seconds'] += time.perf_counter() - started
+        return raw
+
+    async def submit(self, data, value=0):
+        started = time.perf_counter()
+        gas_price = await self.gas.current()
+        nonce = await self.nonces.reserve()
+        transaction = {
+            'to': self.template.router,
+            'data': data,
+            'value': value,
+            'gas': self.gas_limit,
+            'gasPrice': gas_price,
+            'nonce': nonce,
+            'chainId': self.chain_id
+        }
+        try:
+            raw = await asyncio.get_running_loop().run_in_executor(self.signer, self.sign, transaction)
+            tx_hash = await self.rpc('eth_sendRawTransaction', ['0x' + raw.hex()])
+        except Exception as e:
+            self.stats['failed'] += 1
+            await self.nonces.fail(nonce, e)
+            raise
+        self.nonces.confirm(nonce)
+        self.stats['submitted'] += 1
+        self.stats['submit_seconds'] += time.perf_counter() - started
+        return tx_hash
+
+    async def buy(self, token, value_wei, amount_out_min):
+        deadline = int(time.time()) + self.deadline_seconds
+        return await self.submit(self.template.buy(token, amount_out_min, deadline), value_wei)
+
+    async def sell(self, token, amount_in, amount_out_min):
+        deadline = int(time.time()) + self.deadline_seconds
+        return await self.submit(self.template.sell(token, amount_in, amount_out_min, deadline))
+
+    def get_stats(self):
+        submitted = self.stats['submitted'] or 1
+        return {
+            **self.stats,
+            'mean_submit_ms': self.stats['submit_seconds'] / submitted * 1000,
+            'nonce': {**self.nonces.stats, 'next': self.nonces.next_nonce, 'outstanding': len(self.nonces.outstanding)},
+            'gas': {**self.gas.stats, 'price': self.gas.price}
+        }
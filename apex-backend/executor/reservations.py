@@ -0,0 +1,67 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+class CapitalLedger:
+    def __init__(self):
+        self.reservations = {}
+        self.reserved_usd = 0.0
+        self.stats = {'reserved': 0, 'committed': 0, 'released': 0, 'rejected_capital': 0, 'rejected_slots': 0}
+
+    def available(self, balance):
+        return balance - self.reserved_usd
+
+    def reserve(self, token_address, amount_usd, balance, open_positions, max_positions, now=None):
+        if token_address in self.reservations:
+            return False
+        if open_positions + len(self.reservations) >= max_positions:
+            self.stats['rejected_slots'] += 1
+            return False
+        if amount_usd > self.available(balance):
+            self.stats['rejected_capital'] += 1
+            return False
+        self.reservations[token_address] = (amount_usd, now or time.time())
+        self.reserved_usd += amount_usd
+        self.stats['reserved'] += 1
+        return True
+
+    def settle(self, token_address):
+        reservation = self.reservations.pop(token_address, None)
+        if reservation is None:
+            return False
+        self.reserved_usd -= reservation[0]
+        if not self.reservations:
+            self.reserved_usd = 0.0
+        return True
+
+    def commit(self, token_address):
+        if self.settle(token_address):
+            self.stats['committed'] += 1
+
+    def release(self, token_address):
+        if self.settle(token_address):
+            self.stats['released'] += 1
+
+    def get_stats(self):
+        return {**self.stats, 'open_reservations': len(self.reservations), 'reserved_usd': self.reserved_usd}
+
+class TokenLocks:
+    def __init__(self):
+        self.locks = {}
+
+    @asynccontextmanager
+    async def hold(self, token_address):
+        entry = self.locks.get(token_address)
+        if entry is None:
+            entry = self.locks[token_address] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.locks[token_address]
+
+    def __len__(self):
+        return len(self.locks)
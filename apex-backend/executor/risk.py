@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+
+class PortfolioRisk:
+    def __init__(self, max_chain_exposure=1.0, max_type_exposure=1.0, max_gross_exposure=1.0,
+                 max_portfolio_risk=0.3, volatility=0.5, factor_weight=0.5, drawdown_halt=0.3, capacity=16):
+        self.max_chain_exposure = max_chain_exposure
+        self.max_type_exposure = max_type_exposure
+        self.max_gross_exposure = max_gross_exposure
+        self.max_portfolio_risk = max_portfolio_risk
+        self.volatility = volatility
+        self.factor_weight = factor_weight
+        self.drawdown_halt = drawdown_halt
+        self.chains = {}
+        self.types = {}
+        self.chain_exposure = np.zeros(capacity)
+        self.type_exposure = np.zeros(capacity)
+        self.gross = 0.0
+        self.chain_sq = 0.0
+        self.type_sq = 0.0
+        self.position_sq = 0.0
+        self.stats = {'checks': 0, 'approved': 0, 'clipped': 0, 'rejected_drawdown': 0, 'rejected_chain': 0,
+                      'rejected_type': 0, 'rejected_gross': 0, 'rejected_risk': 0}
+
+    def slot(self, names, name, attribute):
+        index = names.get(name)
+        if index is None:
+            index = names[name] = len(names)
+            exposure = getattr(self, attribute)
+            if index >= len(exposure):
+                setattr(self, attribute, np.concatenate((exposure, np.zeros(len(exposure)))))
+        return index
+
+    def update(self, chain, opportunity_type, amount):
+        chain_index = self.slot(self.chains, chain or 'unknown', 'chain_exposure')
+        type_index = self.slot(self.types, opportunity_type or 'UNKNOWN', 'type_exposure')
+        chain_before = self.chain_exposure[chain_index]
+        type_before = self.type_exposure[type_index]
+        self.chain_exposure[chain_index] = chain_before + amount
+        self.type_exposure[type_index] = type_before + amount
+        self.chain_sq += (chain_before + amount) ** 2 - chain_before ** 2
+        self.type_sq += (type_before + amount) ** 2 - type_before ** 2
+        self.position_sq += math.copysign(amount * amount, amount)
+        self.gross += amount
+
+    def add(self, chain, opportunity_type, amount):
+        self.update(chain, opportunity_type, amount)
+
+    def remove(self, chain, opportunity_type, amount):
+        self.update(chain, opportunity_type, -amount)
+        if self.gross < 1e-9:
+            self.reset()
+
+    def reset(self):
+        self.chain_exposure[:] = 0.0
+        self.type_exposure[:] = 0.0
+        self.gross = self.chain_sq = self.type_sq = self.position_sq = 0.0
+
+    def rebuild(self, positions):
+        self.reset()
+        for position in positions:
+            self.add(position.chain, position.opportunity_type, position.amount_usd)
+
+    def portfolio_risk(self, chain_sq, type_sq, position_sq):
+        factor = self.factor_weight * (chain_sq + type_sq) / 2
+        return self.volatility * math.sqrt(max(factor + (1 - self.factor_weight) * position_sq, 0.0))
+
+    def exposure(self, names, name, exposures):
+        index = names.get(name)
+        return exposures[index] if index is not None else 0.0
+
+    def headroom(self, chains, chain_codes, opportunity_types, type_codes, equity, drawdown=0.0):
+        if equity <= 0 or drawdown >= self.drawdown_halt:
+            return np.zeros(len(chain_codes))
+        scale = (1 - drawdown / self.drawdown_halt) * equity
+        chain_room = self.max_chain_exposure * scale - np.array(
+            [self.exposure(self.chains, name, self.chain_exposure) for name in chains])[chain_codes]
+        type_room = self.max_type_exposure * scale - np.array(
+            [self.exposure(self.types, name, self.type_exposure) for name in opportunity_types])[type_codes]
+        return np.minimum(np.minimum(chain_room, type_room), self.max_gross_exposure * scale - self.gross)
+
+    def marginal_risk(self, chain, opportunity_type, amount):
+        chain_before = self.exposure(self.chains, chain or 'unknown', self.chain_exposure)
+        type_before = self.exposure(self.types, opportunity_type or 'UNKNOWN', self.type_exposure)
+        before = self.portfolio_risk(self.chain_sq, self.type_sq, self.position_sq)
+        after = self.portfolio_risk(
+            self.chain_sq + (chain_before + amount) ** 2 - chain_before ** 2,
+            self.type_sq + (type_before + amount) ** 2 - type_before ** 2,
+            self.position_sq + amount * amount
+        )
+        return after - before, after
+
+    def check(self, chain, opportunity_type, amount, equity, drawdown=0.0):
+        self.stats['checks'] += 1
+        if equity <= 0 or drawdown >= self.drawdown_halt:
+            self.stats['rejected_drawdown'] += 1
+            return 0.0
+
+        scale = 1 - drawdown / self.drawdown_halt
+        chain_room = self.max_chain_exposure * scale * equity - self.exposure(self.chains, chain or 'unknown', self.chain_exposure)
+        type_room = self.max_type_exposure * scale * equity - self.exposure(self.types, opportunity_type or 'UNKNOWN', self.type_exposure)
+        gross_room = self.max_gross_exposure * scale * equity - self.gross
+        allowed = min(amount, chain_room, type_room, gross_room)
+        if allowed <= 0:
+            reason = 'chain' if chain_room <= 0 else 'type' if type_room <= 0 else 'gross'
+            self.stats[f"rejected_{reason}"] += 1
+            return 0.0
+
+        marginal, after = self.marginal_risk(chain, opportunity_type, allowed)
+        if after > self.max_portfolio_risk * scale * equity and marginal > 0:
+            self.stats['rejected_risk'] += 1
+            return 0.0
+
+        self.stats['clipped' if allowed < amount else 'approved'] += 1
+        return allowed
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            'gross_exposure': self.gross,
+            'portfolio_risk': self.portfolio_risk(self.chain_sq, self.type_sq, self.position_sq),
+            'by_chain': {name: float(self.chain_exposure[index]) for name, index in self.chains.items()},
+            'by_opportunity_type': {name: float(self.type_exposure[index]) for name, index in self.types.items()}
+        }
@@ -0,0 +1,181 @@
+import json
+import os
+from dataclasses import asdict
+
+import numpy as np
+
+from executor.analytics import PerformanceAnalytics
+from executor.reservations import CapitalLedger
+from executor.risk import PortfolioRisk
+
+DEFAULT_PARAMS = {
+    'min_confidence': 0.8,
+    'min_expected_return': 0.2,
+    'max_risk_score': 0.4,
+    'max_position_size': 0.3,
+    'stop_loss_pct': 0.25,
+    'take_profit_pct': 2.0,
+    'max_positions': 3,
+    'max_holding_time': 1800,
+    'starting_balance': 10.0,
+    'max_chain_exposure': 1.0,
+    'max_type_exposure': 1.0,
+    'max_gross_exposure': 1.0,
+    'max_portfolio_risk': 0.3,
+    'drawdown_halt': 0.3
+}
+
+MIN_ORDER_USD = 1.0
+
+RISK_PARAMS = ('max_chain_exposure', 'max_type_exposure', 'max_gross_exposure', 'max_portfolio_risk', 'drawdown_halt')
+
+def load_strategies(path):
+    if not path or not os.path.exists(path):
+        return [{'name': 'default'}]
+    with open(path) as f:
+        return json.load(f) or [{'name': 'default'}]
+
+def categories(values, count):
+    names = {}
+    codes = np.fromiter((names.setdefault(value, len(names)) for value in values), dtype=np.intp, count=count)
+    return list(names), codes
+
+class Strategy:
+    def __init__(self, name, **params):
+        self.name = name
+        self.risk_params = {**DEFAULT_PARAMS, **params}
+        self.balance = float(self.risk_params['starting_balance'])
+        self.positions = {}
+        self.performance = {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'total_pnl': 0.0,
+            'best_trade': 0.0,
+            'worst_trade': 0.0,
+            'current_balance': self.balance
+        }
+        self.analytics = PerformanceAnalytics(self.balance)
+        self.ledger = CapitalLedger()
+        self.risk = PortfolioRisk(**{param: self.risk_params[param] for param in RISK_PARAMS})
+
+    def open_slots(self):
+        return self.risk_params['max_positions'] - len(self.positions) - len(self.ledger.reservations)
+
+    def position_size(self, prediction):
+        base_size = self.ledger.available(self.balance) * self.risk_params['max_position_size']
+
+        confidence_mult = prediction['confidence']
+        return_mult = min(prediction['expected_return'], 2.0)
+        risk_div = max(prediction['risk_score'], 0.1)
+
+        position_size = (base_size * confidence_mult * return_mult) / risk_div
+        return min(position_size, base_size)
+
+    def equity(self):
+        return self.balance + sum(position.amount_usd + position.pnl_usd for position in self.positions.values())
+
+    def position_key(self, token_address):
+        return f"position:{token_address}" if self.name == 'default' else f"position:{self.name}:{token_address}"
+
+    def export_state(self):
+        return {
+            'positions': [asdict(position) for position in self.positions.values()],
+            'balance': self.balance,
+            'performance': dict(self.performance),
+            'analytics': self.analytics.export_state()
+        }
+
+    def load_state(self, state, position_type):
+        self.positions = {p['token_address']: position_type(**p) for p in state['positions']}
+        self.balance = state['balance']
+        self.performance.update(state['performance'])
+        if 'analytics' in state:
+            self.analytics.load_state(state['analytics'])
+
+    def get_performance(self):
+        total_trades = self.performance['total_trades']
+        win_rate = (self.performance['winning_trades'] / total_trades * 100) if total_trades > 0 else 0
+
+        return {
+            **self.performance,
+            'win_rate': win_rate,
+            'positions_count': len(self.positions),
+            'available_balance': self.balance,
+            'sharpe': self.analytics.sharpe(),
+            'max_drawdown': self.analytics.max_drawdown,
+            'analytics': self.analytics.snapshot(),
+            'risk_params': self.risk_params,
+            'reservations': self.ledger.get_stats(),
+            'risk': self.risk.get_stats()
+        }
+
+class StrategySet:
+    def __init__(self, strategies):
+        self.strategies = list(strategies)
+        self.by_name = {strategy.name: strategy for strategy in self.strategies}
+        if len(self.by_name) != len(self.strategies):
+            raise ValueError("strategy names must be unique")
+        self.min_confidence = self.column('min_confidence')
+        self.min_expected_return = self.column('min_expected_return')
+        self.max_risk_score = self.column('max_risk_score')
+        self.stats = {'evaluations': 0, 'predictions': 0, 'selected': 0, 'no_headroom': 0}
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(Strategy(**config) for config in load_strategies(path))
+
+    def column(self, param):
+        return np.array([strategy.risk_params[param] for strategy in self.strategies], dtype=np.float64)
+
+    @property
+    def primary(self):
+        return self.strategies[0]
+
+    def __iter__(self):
+        return iter(self.strategies)
+
+    def __len__(self):
+        return len(self.strategies)
+
+    def get(self, name):
+        return self.by_name.get(name or 'default', self.primary)
+
+    def select(self, predictions):
+        count = len(predictions)
+        confidence = np.fromiter((p['confidence'] for p in predictions), dtype=np.float64, count=count)
+        expected_return = np.fromiter((p['expected_return'] for p in predictions), dtype=np.float64, count=count)
+        risk_score = np.fromiter((p['risk_score'] for p in predictions), dtype=np.float64, count=count)
+        has_slot = np.fromiter((strategy.open_slots() > 0 for strategy in self.strategies), dtype=bool,
+                               count=len(self.strategies))
+
+        selected = (
+            (confidence[:, None] >= self.min_confidence)
+            & (expected_return[:, None] >= self.min_expected_return)
+            & (risk_score[:, None] <= self.max_risk_score)
+            & has_slot
+        )
+        self.stats['evaluations'] += 1
+        self.stats['predictions'] += count
+
+        pairs = []
+        columns = np.flatnonzero(selected.any(axis=0))
+        if len(columns):
+            chains, chain_codes = categories((p.get('chain') or 'unknown' for p in predictions), count)
+            types, type_codes = categories((p.get('opportunity_type') or 'UNKNOWN' for p in predictions), count)
+        for column in columns:
+            strategy = self.strategies[column]
+            rows = np.flatnonzero(selected[:, column])
+            room = strategy.risk.headroom(
+                chains, chain_codes[rows], types, type_codes[rows],
+                strategy.equity(), strategy.analytics.current_drawdown()
+            )
+            self.stats['no_headroom'] += int((room < MIN_ORDER_USD).sum())
+            pairs.extend((predictions[row], strategy) for row in rows[room >= MIN_ORDER_USD])
+        self.stats['selected'] += len(pairs)
+        return pairs
+
+    def positions(self):
+        return [position for strategy in self.strategies for position in strategy.positions.values()]
+
+    def held_tokens(self):
+        return list({token for strategy in self.strategies for token in strategy.positions})
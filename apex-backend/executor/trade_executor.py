@@ -2,11 +2,18 @@ import asyncio
 import aioredis
 import json
 import time
+from collections import deque
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
-from web3 import Web3
 import os
 
+from executor.journal import TradeJournal, KIND_OPEN, KIND_CLOSE
+from executor.reservations import TokenLocks
+from executor.amm import AMMSimulator
+from executor.strategies import StrategySet, MIN_ORDER_USD
+from runtime.snapshots import snapshot_loop
+from runtime.archive import open_archive
+
 @dataclass
 class Position:
     token_address: str
@@ -20,6 +27,10 @@ class Position:
     pnl_percent: float
     pnl_usd: float
     status: str
+    opportunity_type: str = ''
+    chain: str = ''
+    quantity: float = 0.0
+    strategy: str = 'default'
 
 @dataclass
 class Trade:
@@ -30,31 +41,37 @@ class Trade:
     timestamp: float
     tx_hash: str
     status: str
+    strategy: str = 'default'
 
 class TradeExecutor:
     def __init__(self):
         self.redis = None
         self.w3 = None
         self.account = None
-        self.positions = {}
-        self.trade_history = []
-        self.balance = 10.0
-        self.performance = {
-            'total_trades': 0,
-            'winning_trades': 0,
-            'total_pnl': 0.0,
-            'best_trade': 0.0,
-            'worst_trade': 0.0,
-            'current_balance': 10.0
-        }
-        
-        self.risk_params = {
-            'max_position_size': 0.3,
-            'stop_loss_pct': 0.25,
-            'take_profit_pct': 2.0,
-            'max_positions': 3,
-            'max_holding_time': 1800
-        }
+        self.orders = None
+        self.trading_chain = os.getenv('TRADING_CHAIN', 'polygon')
+        self.live_trading = bool(os.getenv('PRIVATE_KEY')) and os.getenv('LIVE_TRADING', '').lower() in ('1', 'true', 'yes')
+        if self.live_trading:
+            from executor.orders import check_chain
+            try:
+                check_chain(self.trading_chain)
+            except ValueError as e:
+                print(f"⚠️ Live trading disabled: {e}")
+                self.live_trading = False
+        self.strategies = StrategySet.from_file(os.getenv('STRATEGIES_FILE', 'data/strategies.json'))
+        self.trade_history = deque(maxlen=int(os.getenv('TRADE_HISTORY_SIZE', 1000)))
+        self.journal = TradeJournal(os.getenv('JOURNAL_DIR', 'data/journal'))
+        self.token_locks = TokenLocks()
+        self.safety_checks = {}
+        self.archive = None
+        self.order_slots = asyncio.Semaphore(int(os.getenv('EXECUTION_CONCURRENCY', 8)))
+        self.inflight = set()
+        self.session = None
+        self.monitor_interval = float(os.getenv('POSITION_REFRESH_INTERVAL', 0.5))
+        self.amm = AMMSimulator(
+            fee=float(os.getenv('AMM_FEE', 0.003)),
+            block_time=float(os.getenv('AMM_BLOCK_TIME', 0.1))
+        )
         
     async def init(self):
         try:
@@ -63,99 +80,205 @@ class TradeExecutor:
         except:
             pass
             
-        rpc_url = os.getenv('RPC_URL', 'https://rpc.ankr.com/polygon')
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
+        replayed = await asyncio.to_thread(self.journal.recover, self.apply_journal_record)
+        print(f"📒 Journal recovered: {len(self.strategies.positions())} positions across "
+              f"{len(self.strategies)} strategies, {replayed} records replayed "
+              f"in {self.journal.stats['recovery_ms']:.1f}ms")
+        for strategy in self.strategies:
+            strategy.risk.rebuild(strategy.positions.values())
+            
         private_key = os.getenv('PRIVATE_KEY')
-        if private_key:
+        if self.live_trading:
+            from web3 import Web3
+            rpc_url = os.getenv('RPC_URL', 'https://rpc.ankr.com/polygon')
+            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
             self.account = self.w3.eth.account.from_key(private_key)
             
+        import aiohttp
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=3))
+        
+        if self.live_trading:
+            from executor.orders import OrderSubmitter
+            try:
+                self.orders = OrderSubmitter(rpc_url, private_key, chain=self.trading_chain)
+            except Exception as e:
+                print(f"⚠️ Order submitter disabled: {e}")
+        if self.orders:
+            try:
+                await self.orders.start()
+            except Exception as e:
+                print(f"⚠️ Order submitter warm-up failed: {e}")
+            
+        self.archive = open_archive('executor')
+        asyncio.create_task(self.journal.flush_loop(self.export_state))
         asyncio.create_task(self.execution_loop())
         asyncio.create_task(self.position_monitor())
+        asyncio.create_task(snapshot_loop(self.redis, 'executor', self.build_snapshot))
+        
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+        if self.orders:
+            await self.orders.close()
+            self.orders = None
+        self.trading_chain = os.getenv('TRADING_CHAIN', 'polygon')
+        self.live_trading = bool(os.getenv('PRIVATE_KEY')) and os.getenv('LIVE_TRADING', '').lower() in ('1', 'true', 'yes')
+        if self.live_trading:
+            from executor.orders import check_chain
+            try:
+                check_chain(self.trading_chain)
+            except ValueError as e:
+                print(f"⚠️ Live trading disabled: {e}")
+                self.live_trading = False
+        
+    async def build_snapshot(self):
+        return {
+            'positions': [asdict(position) for position in self.strategies.positions()],
+            'performance': await self.get_performance()
+        }
+        
+    def export_state(self):
+        return {
+            'strategies': {strategy.name: strategy.export_state() for strategy in self.strategies},
+            'trade_history': [asdict(trade) for trade in self.trade_history]
+        }
+        
+    def apply_journal_record(self, kind, payload):
+        if kind is None:
+            self.trade_history.clear()
+            self.trade_history.extend(Trade(**t) for t in payload['trade_history'])
+            states = payload.get('strategies') or {self.strategies.primary.name: payload}
+            for name, state in states.items():
+                if name in self.strategies.by_name:
+                    self.strategies.by_name[name].load_state(state, Position)
+            return
+            
+        strategy = self.strategies.get(payload.get('strategy'))
+        if kind == KIND_OPEN:
+            position = Position(**payload['position'])
+            strategy.positions[position.token_address] = position
+            self.trade_history.append(Trade(**payload['trade']))
+        elif kind == KIND_CLOSE:
+            position = Position(**payload['position'])
+            strategy.positions.pop(position.token_address, None)
+            trade = Trade(**payload['trade'])
+            self.trade_history.append(trade)
+            self.record_analytics(strategy, position, trade.timestamp)
+        else:
+            return
+            
+        strategy.balance = payload['balance']
+        strategy.performance.update(payload['performance'])
         
     async def execution_loop(self):
         while True:
             try:
                 if self.redis:
-                    prediction_keys = await self.redis.keys("prediction:*")
-                    
-                    for key in prediction_keys:
-                        prediction_data = await self.redis.get(key)
-                        if prediction_data:
-                            prediction = json.loads(prediction_data)
-                            
-                            if prediction['action'] == 'BUY':
-                                await self.evaluate_buy_signal(prediction)
+                    for prediction, strategy in await self.poll_predictions():
+                        key = (strategy.name, prediction['token_address'])
+                        if key not in self.inflight and key[1] not in strategy.positions:
+                            self.inflight.add(key)
+                            asyncio.create_task(self.run_order(strategy, prediction))
                                 
                 await asyncio.sleep(1)
                 
             except Exception as e:
                 await asyncio.sleep(5)
                 
-    async def evaluate_buy_signal(self, prediction):
+    async def poll_predictions(self):
+        prediction_keys = await self.redis.keys("prediction:*")
+        values = await self.redis.mget(prediction_keys) if prediction_keys else []
+        
+        predictions = [prediction for prediction in map(json.loads, filter(None, values))
+                       if prediction['action'] == 'BUY']
+        return self.strategies.select(predictions) if predictions else []
+        
+    async def run_order(self, strategy, prediction):
         try:
-            token_address = prediction['token_address']
+            async with self.order_slots:
+                await self.evaluate_buy_signal(strategy, prediction)
+        finally:
+            self.inflight.discard((strategy.name, prediction['token_address']))
+            self.release_pool(prediction['token_address'])
             
-            if token_address in self.positions:
-                return
-                
-            if len(self.positions) >= self.risk_params['max_positions']:
-                return
-                
-            if prediction['confidence'] < 0.8:
-                return
-                
-            if prediction['expected_return'] < 0.2:
-                return
-                
-            if prediction['risk_score'] > 0.4:
-                return
+    def release_pool(self, token_address):
+        if any(token_address in strategy.positions for strategy in self.strategies):
+            return
+        if any(key[1] == token_address for key in self.inflight):
+            return
+        self.amm.drop(token_address)
                 
-            position_size = self.calculate_position_size(prediction)
-            if position_size < 1.0:
-                return
-                
-            safety_check = await self.verify_token_safety(token_address)
-            if not safety_check:
-                return
-                
-            await self.execute_buy(prediction, position_size)
+    async def evaluate_buy_signal(self, strategy, prediction):
+        token_address = prediction['token_address']
+        try:
+            async with self.token_locks.hold((strategy.name, token_address)):
+                if token_address in strategy.positions:
+                    return
+                    
+                chain = prediction.get('chain', '')
+                opportunity_type = prediction.get('opportunity_type', '')
+                position_size = strategy.risk.check(
+                    chain, opportunity_type, strategy.position_size(prediction),
+                    strategy.equity(), strategy.analytics.current_drawdown()
+                )
+                if position_size < MIN_ORDER_USD:
+                    return
+                    
+                if not strategy.ledger.reserve(token_address, position_size, strategy.balance,
+                                               len(strategy.positions), strategy.risk_params['max_positions']):
+                    return
+                    
+                strategy.risk.add(chain, opportunity_type, position_size)
+                try:
+                    safety_check = await self.check_token_safety(token_address)
+                    if not safety_check:
+                        return
+                        
+                    await self.execute_buy(strategy, prediction, position_size)
+                finally:
+                    strategy.ledger.release(token_address)
+                    if token_address not in strategy.positions:
+                        strategy.risk.remove(chain, opportunity_type, position_size)
             
         except Exception as e:
             pass
             
-    def calculate_position_size(self, prediction):
-        base_size = self.balance * self.risk_params['max_position_size']
-        
-        confidence_mult = prediction['confidence']
-        return_mult = min(prediction['expected_return'], 2.0)
-        risk_div = max(prediction['risk_score'], 0.1)
-        
-        position_size = (base_size * confidence_mult * return_mult) / risk_div
-        return min(position_size, base_size)
+    async def check_token_safety(self, token_address, ttl=60):
+        now = time.time()
+        for address, (expires, task) in list(self.safety_checks.items()):
+            if expires < now:
+                del self.safety_checks[address]
+                
+        entry = self.safety_checks.get(token_address)
+        if entry is None:
+            entry = self.safety_checks[token_address] = (
+                now + ttl, asyncio.create_task(self.verify_token_safety(token_address))
+            )
+        return await asyncio.shield(entry[1])
         
     async def verify_token_safety(self, token_address):
         try:
             honeypot_url = f"https://api.honeypot.is/v2/IsHoneypot?address={token_address}"
             
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(honeypot_url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return not data.get('IsHoneypot', True)
+            async with self.session.get(honeypot_url) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    return not data.get('IsHoneypot', True)
             return False
         except:
             return False
             
-    async def execute_buy(self, prediction, amount_usd):
+    async def execute_buy(self, strategy, prediction, amount_usd):
         try:
             token_address = prediction['token_address']
-            entry_price = prediction['entry_price']
             
-            tx_hash = await self.simulate_buy_transaction(token_address, amount_usd, entry_price)
+            fill = await self.simulate_buy_transaction(
+                token_address, amount_usd, prediction['entry_price'], prediction.get('liquidity', 0.0)
+            )
             
-            if tx_hash:
+            if fill:
+                entry_price = fill.price
                 position = Position(
                     token_address=token_address,
                     symbol=f"TOKEN_{token_address[:6]}",
@@ -163,16 +286,21 @@ class TradeExecutor:
                     current_price=entry_price,
                     amount_usd=amount_usd,
                     entry_time=time.time(),
-                    stop_loss=entry_price * (1 - self.risk_params['stop_loss_pct']),
-                    take_profit=entry_price * (1 + self.risk_params['take_profit_pct']),
+                    stop_loss=entry_price * (1 - strategy.risk_params['stop_loss_pct']),
+                    take_profit=entry_price * (1 + strategy.risk_params['take_profit_pct']),
                     pnl_percent=0.0,
                     pnl_usd=0.0,
-                    status='OPEN'
+                    status='OPEN',
+                    opportunity_type=prediction.get('opportunity_type', ''),
+                    chain=prediction.get('chain', ''),
+                    quantity=fill.amount_out,
+                    strategy=strategy.name
                 )
                 
-                self.positions[token_address] = position
-                self.balance -= amount_usd
-                self.performance['current_balance'] = self.balance
+                strategy.positions[token_address] = position
+                strategy.balance -= amount_usd
+                strategy.ledger.commit(token_address)
+                strategy.performance['current_balance'] = strategy.balance
                 
                 trade = Trade(
                     token_address=token_address,
@@ -180,60 +308,88 @@ class TradeExecutor:
                     amount_usd=amount_usd,
                     price=entry_price,
                     timestamp=time.time(),
-                    tx_hash=tx_hash,
-                    status='EXECUTED'
+                    tx_hash=fill.tx_hash,
+                    status='EXECUTED',
+                    strategy=strategy.name
                 )
                 
                 self.trade_history.append(trade)
-                self.performance['total_trades'] += 1
+                self.archive_trade(trade, position)
+                strategy.performance['total_trades'] += 1
+                
+                self.journal.append(KIND_OPEN, {
+                    'strategy': strategy.name,
+                    'position': asdict(position),
+                    'trade': asdict(trade),
+                    'balance': strategy.balance,
+                    'performance': strategy.performance
+                }, trade.timestamp)
                 
                 if self.redis:
                     await self.redis.setex(
-                        f"position:{token_address}",
+                        strategy.position_key(token_address),
                         3600,
                         json.dumps(asdict(position))
                     )
                     
-                print(f"✅ BUY: {position.symbol} at ${entry_price} (${amount_usd})")
+                print(f"✅ BUY [{strategy.name}]: {position.symbol} at ${entry_price} "
+                      f"(${amount_usd}, slippage {fill.slippage:.2%})")
                 
         except Exception as e:
             print(f"❌ Buy execution failed: {e}")
             
-    async def simulate_buy_transaction(self, token_address, amount_usd, price):
-        await asyncio.sleep(0.1)
-        return f"0x{''.join([f'{i:02x}' for i in range(32)])}"
+    async def simulate_buy_transaction(self, token_address, amount_usd, price, liquidity=0.0):
+        return await self.amm.swap_buy(token_address, amount_usd, price, liquidity)
         
     async def position_monitor(self):
         while True:
             try:
-                for token_address, position in list(self.positions.items()):
-                    await self.update_position_price(position)
-                    
-                    should_exit, reason = self.should_exit_position(position)
-                    if should_exit:
-                        await self.execute_sell(position, reason)
-                        
-                await asyncio.sleep(5)
+                positions = self.strategies.positions()
+                await self.update_position_prices(positions)
+                await asyncio.gather(*[
+                    self.monitor_position(self.strategies.get(position.strategy), position)
+                    for position in positions
+                ])
+                
+                await asyncio.sleep(self.monitor_interval)
                 
             except Exception as e:
                 await asyncio.sleep(10)
                 
-    async def update_position_price(self, position):
+    async def monitor_position(self, strategy, position):
+        should_exit, reason = self.should_exit_position(strategy, position)
+        if should_exit:
+            async with self.token_locks.hold((strategy.name, position.token_address)):
+                if position.token_address in strategy.positions:
+                    async with self.order_slots:
+                        await self.execute_sell(strategy, position, reason)
+                        
+    async def update_position_prices(self, positions):
         try:
-            if self.redis:
-                token_data = await self.redis.get(f"token:{position.token_address}")
-                if token_data:
-                    token = json.loads(token_data)
-                    current_price = token['price']
-                    
-                    position.current_price = current_price
-                    position.pnl_percent = ((current_price - position.entry_price) / position.entry_price) * 100
-                    position.pnl_usd = position.amount_usd * (position.pnl_percent / 100)
-                    
+            if self.redis and positions:
+                tokens = list({position.token_address for position in positions})
+                values = await self.redis.mget(
+                    [f"price:{token_address}" for token_address in tokens] +
+                    [f"token:{token_address}" for token_address in tokens]
+                )
+                prices = {}
+                for token_address, price_data, token_data in zip(tokens, values, values[len(tokens):]):
+                    if price_data or token_data:
+                        token = json.loads(price_data or token_data)
+                        prices[token_address] = token['price']
+                        self.amm.sync(token_address, token['price'], token.get('liquidity', 0.0))
+                        
+                for position in positions:
+                    current_price = prices.get(position.token_address)
+                    if current_price:
+                        position.current_price = current_price
+                        position.pnl_percent = ((current_price - position.entry_price) / position.entry_price) * 100
+                        position.pnl_usd = position.amount_usd * (position.pnl_percent / 100)
+                        
         except Exception as e:
             pass
             
-    def should_exit_position(self, position):
+    def should_exit_position(self, strategy, position):
         if position.current_price <= position.stop_loss:
             return True, "STOP_LOSS"
             
@@ -241,72 +397,140 @@ class TradeExecutor:
             return True, "TAKE_PROFIT"
             
         holding_time = time.time() - position.entry_time
-        if holding_time > self.risk_params['max_holding_time']:
+        if holding_time > strategy.risk_params['max_holding_time']:
             return True, "TIME_LIMIT"
             
         return False, "HOLDING"
         
-    async def execute_sell(self, position, reason):
+    async def execute_sell(self, strategy, position, reason):
         try:
-            tx_hash = await self.simulate_sell_transaction(
+            fill = await self.simulate_sell_transaction(
                 position.token_address, 
-                position.amount_usd, 
+                position.quantity or position.amount_usd / position.entry_price, 
                 position.current_price
             )
             
-            if tx_hash:
-                exit_amount = position.amount_usd + position.pnl_usd
-                self.balance += exit_amount
-                self.performance['current_balance'] = self.balance
+            if fill:
+                exit_amount = fill.amount_out
+                position.pnl_usd = exit_amount - position.amount_usd
+                position.pnl_percent = position.pnl_usd / position.amount_usd * 100
+                strategy.balance += exit_amount
+                strategy.performance['current_balance'] = strategy.balance
                 
-                self.performance['total_pnl'] += position.pnl_usd
+                strategy.performance['total_pnl'] += position.pnl_usd
                 
                 if position.pnl_usd > 0:
-                    self.performance['winning_trades'] += 1
+                    strategy.performance['winning_trades'] += 1
                     
-                self.performance['best_trade'] = max(self.performance['best_trade'], position.pnl_usd)
-                self.performance['worst_trade'] = min(self.performance['worst_trade'], position.pnl_usd)
+                strategy.performance['best_trade'] = max(strategy.performance['best_trade'], position.pnl_usd)
+                strategy.performance['worst_trade'] = min(strategy.performance['worst_trade'], position.pnl_usd)
                 
                 trade = Trade(
                     token_address=position.token_address,
                     action='SELL',
                     amount_usd=exit_amount,
-                    price=position.current_price,
+                    price=fill.price,
                     timestamp=time.time(),
-                    tx_hash=tx_hash,
-                    status='EXECUTED'
+                    tx_hash=fill.tx_hash,
+                    status='EXECUTED',
+                    strategy=strategy.name
                 )
                 
                 self.trade_history.append(trade)
+                self.archive_trade(trade, position, reason)
                 position.status = 'CLOSED'
+                self.record_analytics(strategy, position, trade.timestamp)
                 
-                print(f"✅ SELL: {position.symbol} at ${position.current_price} "
+                self.journal.append(KIND_CLOSE, {
+                    'strategy': strategy.name,
+                    'position': asdict(position),
+                    'trade': asdict(trade),
+                    'reason': reason,
+                    'balance': strategy.balance,
+                    'performance': strategy.performance
+                }, trade.timestamp)
+                
+                print(f"✅ SELL [{strategy.name}]: {position.symbol} at ${position.current_price} "
                       f"({position.pnl_percent:+.1f}% / ${position.pnl_usd:+.2f}) - {reason}")
                 
-                del self.positions[position.token_address]
+                del strategy.positions[position.token_address]
+                strategy.risk.remove(position.chain, position.opportunity_type, position.amount_usd)
+                self.release_pool(position.token_address)
                 
                 if self.redis:
-                    await self.redis.delete(f"position:{position.token_address}")
+                    await self.redis.delete(strategy.position_key(position.token_address))
                     
         except Exception as e:
             print(f"❌ Sell execution failed: {e}")
             
-    async def simulate_sell_transaction(self, token_address, amount_usd, price):
-        await asyncio.sleep(0.1)
-        return f"0x{''.join([f'{i:02x}' for i in range(32)])}"
+    def archive_trade(self, trade, position, reason=''):
+        if self.archive:
+            self.archive.append('trades', {
+                **asdict(trade),
+                'chain': position.chain,
+                'opportunity_type': position.opportunity_type,
+                'pnl_usd': position.pnl_usd if trade.action == 'SELL' else None,
+                'pnl_percent': position.pnl_percent if trade.action == 'SELL' else None,
+                'reason': reason
+            })
+            
+    def record_analytics(self, strategy, position, timestamp):
+        strategy.analytics.record_trade(
+            position.pnl_usd,
+            position.pnl_percent,
+            position.opportunity_type,
+            position.chain,
+            timestamp - position.entry_time,
+            timestamp
+        )
+        
+    async def simulate_sell_transaction(self, token_address, quantity, price, liquidity=0.0):
+        return await self.amm.swap_sell(token_address, quantity, price, liquidity)
         
     async def get_positions(self):
-        return list(self.positions.values())
+        return self.strategies.positions()
+        
+    def held_tokens(self):
+        return self.strategies.held_tokens()
+        
+    async def get_trade_history(self, limit=100, start=None, end=None):
+        recent = [
+            asdict(trade) for trade in self.trade_history
+            if (start is None or trade.timestamp >= start) and (end is None or trade.timestamp <= end)
+        ]
+        oldest_in_memory = self.trade_history[0].timestamp if self.trade_history else time.time()
+        
+        if len(recent) >= limit or (start is not None and start >= oldest_in_memory):
+            return recent[-limit:]
+            
+        older_end = oldest_in_memory if end is None else min(end, oldest_in_memory)
+        if self.journal.file is None:
+            await asyncio.to_thread(self.journal.refresh_index)
+        records = await asyncio.to_thread(
+            self.journal.query, start, older_end, (KIND_OPEN, KIND_CLOSE), limit, True
+        )
+        older = [payload['trade'] for kind, timestamp, payload in records
+                 if payload['trade']['timestamp'] < oldest_in_memory]
+        return (older + recent)[-limit:]
         
     async def get_performance(self):
-        total_trades = self.performance['total_trades']
-        win_rate = (self.performance['winning_trades'] / total_trades * 100) if total_trades > 0 else 0
+        strategies = {strategy.name: strategy.get_performance() for strategy in self.strategies}
+        reservations = [performance.pop('reservations') for performance in strategies.values()]
+        primary = strategies[self.strategies.primary.name]
         
         return {
-            **self.performance,
-            'win_rate': win_rate,
-            'positions_count': len(self.positions),
-            'available_balance': self.balance
+            **{key: value for key, value in primary.items() if key != 'risk_params'},
+            'strategies': strategies,
+            'selection': self.strategies.stats,
+            'amm': self.amm.get_stats(),
+            'orders': self.orders.get_stats() if self.orders else None,
+            'archive': self.archive.get_stats() if self.archive else None,
+            'execution': {
+                **{key: sum(stats[key] for stats in reservations) for key in reservations[0]},
+                'inflight': len(self.inflight),
+                'locked_tokens': len(self.token_locks),
+                'safety_checks': len(self.safety_checks)
+            }
         }
 
 executor = TradeExecutor()
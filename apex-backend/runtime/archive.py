@@ -0,0 +1,221 @@
+import asyncio
+import glob
+import itertools
+import os
+import queue
+import threading
+import time
+
+TABLES = {
+    'scans': {
+        'timestamp': 'float64', 'address': 'string', 'symbol': 'string', 'chain': 'string',
+        'opportunity_type': 'string', 'price': 'float64', 'liquidity': 'float64', 'volume_1h': 'float64',
+        'market_cap': 'float64', 'change_5m': 'float64', 'change_1h': 'float64', 'momentum': 'float64',
+        'confidence': 'float64', 'urgency': 'int64', 'expected_return': 'float64'
+    },
+    'predictions': {
+        'timestamp': 'float64', 'token_address': 'string', 'action': 'string', 'chain': 'string',
+        'opportunity_type': 'string', 'confidence': 'float64', 'expected_return': 'float64',
+        'risk_score': 'float64', 'entry_price': 'float64', 'target_price': 'float64',
+        'social_score': 'float64', 'technical_score': 'float64', 'whale_score': 'float64',
+        'time_horizon': 'int64', 'liquidity': 'float64'
+    },
+    'trades': {
+        'timestamp': 'float64', 'token_address': 'string', 'strategy': 'string', 'action': 'string',
+        'chain': 'string', 'opportunity_type': 'string', 'amount_usd': 'float64', 'price': 'float64',
+        'pnl_usd': 'float64', 'pnl_percent': 'float64', 'reason': 'string', 'tx_hash': 'string'
+    }
+}
+
+KEY_COLUMNS = {'scans': 'address', 'predictions': 'token_address', 'trades': 'token_address'}
+
+def hour_key(timestamp):
+    return time.strftime('%Y%m%d%H', time.gmtime(timestamp))
+
+def schema(table):
+    import pyarrow as pa
+
+    return pa.schema([(name, getattr(pa, kind)()) for name, kind in TABLES[table].items()])
+
+class ColumnArchive:
+    def __init__(self, directory, source, flush_interval=10.0, max_rows=20000, row_group_size=8192):
+        self.directory = directory
+        self.source = source
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.row_group_size = row_group_size
+        self.buffers = {table: self.empty(table) for table in TABLES}
+        self.queue = queue.Queue()
+        self.thread = None
+        self.run_id = f"{int(time.time() * 1000):x}"
+        self.sequence = itertools.count()
+        self.compacted_hour = None
+        self.stats = {'rows': 0, 'batches': 0, 'files': 0, 'compactions': 0, 'errors': 0, 'write_seconds': 0.0}
+
+    def empty(self, table):
+        return {column: [] for column in TABLES[table]}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=f"archive-{self.source}", daemon=True)
+        self.thread.start()
+        return asyncio.create_task(self.flush_loop())
+
+    def append(self, table, record):
+        buffer = self.buffers[table]
+        for column, values in buffer.items():
+            values.append(record.get(column))
+        if len(buffer['timestamp']) >= self.max_rows:
+            self.flush_table(table)
+
+    def flush_table(self, table):
+        columns = self.buffers[table]
+        if not columns['timestamp']:
+            return
+        self.buffers[table] = self.empty(table)
+        self.queue.put((table, columns))
+
+    def flush(self):
+        for table in TABLES:
+            self.flush_table(table)
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                self.flush()
+            except Exception as e:
+                await asyncio.sleep(self.flush_interval)
+
+    def run(self):
+        self.compact_closed(time.time())
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                started = time.perf_counter()
+                self.write(*item)
+                self.stats['write_seconds'] += time.perf_counter() - started
+                if self.compacted_hour != hour_key(time.time()):
+                    self.compact_closed(time.time())
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠️ Archive write failed ({item[0]}): {e}")
+
+    def write(self, table, columns):
+        import numpy as np
+        import pyarrow as pa
+
+        data = pa.table(columns, schema=schema(table))
+        hours = np.floor_divide(np.asarray(columns['timestamp'], dtype=np.float64), 3600).astype(np.int64)
+        partitions = np.unique(hours)
+        for hour in partitions:
+            chunk = data if len(partitions) == 1 else data.take(np.flatnonzero(hours == hour))
+            directory = os.path.join(self.directory, table, f"hour={hour_key(hour * 3600)}")
+            self.write_file(chunk, os.path.join(directory, f"{self.source}.{self.run_id}.{next(self.sequence):06d}.parquet"))
+        self.stats['rows'] += len(data)
+        self.stats['batches'] += 1
+
+    def write_file(self, data, path):
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        pq.write_table(data, tmp_path, row_group_size=self.row_group_size, compression='zstd')
+        os.replace(tmp_path, path)
+        self.stats['files'] += 1
+
+    def compact_closed(self, now):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        current = f"hour={hour_key(now)}"
+        for table in TABLES:
+            for directory in glob.glob(os.path.join(self.directory, table, 'hour=*')):
+                if os.path.basename(directory) >= current:
+                    continue
+                parts = glob.glob(os.path.join(directory, f"{self.source}.*.parquet"))
+                if not parts:
+                    continue
+                target = os.path.join(directory, f"{self.source}.parquet")
+                sources = parts + ([target] if os.path.exists(target) else [])
+                data = pa.concat_tables(pq.read_table(path, schema=schema(table)) for path in sources)
+                self.write_file(data.sort_by('timestamp'), target)
+                for path in parts:
+                    os.remove(path)
+                self.stats['compactions'] += 1
+        self.compacted_hour = hour_key(now)
+
+    def close(self, timeout=10):
+        self.flush()
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            'buffered': sum(len(buffer['timestamp']) for buffer in self.buffers.values()),
+            'queued': self.queue.qsize()
+        }
+
+def open_archive(source):
+    directory = os.getenv('ARCHIVE_DIR', 'data/archive')
+    if not directory:
+        return None
+    archive = ColumnArchive(directory, source, flush_interval=float(os.getenv('ARCHIVE_FLUSH_INTERVAL', 10)))
+    archive.start()
+    return archive
+
+def archive_files(directory, table, start, end):
+    first, last = f"hour={hour_key(start)}", f"hour={hour_key(end)}"
+    files = []
+    for partition in sorted(glob.glob(os.path.join(directory, table, 'hour=*'))):
+        if first <= os.path.basename(partition) <= last:
+            files.extend(sorted(glob.glob(os.path.join(partition, '*.parquet'))))
+    return files
+
+def query(directory, table, start, end, columns=None, filters=None, points=None, limit=5000):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    if table not in TABLES:
+        raise ValueError(f"unknown table {table}")
+    fields = TABLES[table]
+    columns = [column for column in (columns or fields) if column in fields]
+    filters = {column: value for column, value in (filters or {}).items() if column in fields and value is not None}
+    files = archive_files(directory, table, start, end)
+    result = {'table': table, 'start': start, 'end': end, 'files': len(files), 'bucket': None, 'rows': []}
+    if not files:
+        return result
+
+    predicates = [('timestamp', '>=', start), ('timestamp', '<=', end)]
+    predicates += [(column, '==', value) for column, value in filters.items()]
+    read_columns = list(dict.fromkeys(['timestamp', *columns]))
+    data = pq.read_table(files, columns=read_columns, filters=predicates, schema=schema(table))
+    result['matched'] = len(data)
+
+    if points and len(data) > points:
+        bucket = max((end - start) / points, 1.0)
+        numeric = [column for column in read_columns if fields[column] != 'string' and column != 'timestamp']
+        data = data.append_column('bucket', pc.floor(pc.divide(data['timestamp'], bucket)))
+        keys = ['bucket'] + ([KEY_COLUMNS[table]] if KEY_COLUMNS[table] in filters else [])
+        grouped = data.group_by(keys).aggregate(
+            [('timestamp', 'min'), ('timestamp', 'count')] + [(column, 'mean') for column in numeric]
+        )
+        grouped = grouped.sort_by('timestamp_min')
+        data = pa.table({
+            'timestamp': grouped['timestamp_min'],
+            'count': grouped['timestamp_count'],
+            **{column: grouped[f"{column}_mean"] for column in numeric}
+        })
+        result['bucket'] = bucket
+    else:
+        data = data.sort_by('timestamp')
+
+    if len(data) > limit:
+        data = data.slice(len(data) - limit)
+    result['rows'] = data.to_pylist()
+    return result
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class LeaderElection:
+    def __init__(self, redis, name='apex:leader', ttl_ms=10000):
+        self.redis = redis
+        self.name = name
+        self.ttl_ms = ttl_ms
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.elections = 0
+        self.last_renewed = 0.0
+        self.starting = None
+
+    async def try_acquire(self):
+        acquired = await self.redis.set(self.name, self.token, nx=True, px=self.ttl_ms)
+        if acquired:
+            self.last_renewed = time.monotonic()
+        return bool(acquired)
+
+    async def renew(self):
+        renewed = bool(await self.redis.eval(RENEW_SCRIPT, 1, self.name, self.token, self.ttl_ms))
+        if renewed:
+            self.last_renewed = time.monotonic()
+        return renewed
+
+    def lease_expired(self):
+        return time.monotonic() - self.last_renewed > self.ttl_ms / 1000
+
+    async def release(self):
+        if self.is_leader:
+            self.is_leader = False
+            await self.redis.eval(RELEASE_SCRIPT, 1, self.name, self.token)
+
+    async def current_leader(self):
+        leader = await self.redis.get(self.name)
+        return leader.decode() if leader else None
+
+    async def step_down(self, on_lost):
+        self.is_leader = False
+        if self.starting and not self.starting.done():
+            self.starting.cancel()
+            await asyncio.gather(self.starting, return_exceptions=True)
+        self.starting = None
+        await on_lost()
+
+    async def campaign(self, on_elected, on_lost):
+        interval = self.ttl_ms / 3000
+        while True:
+            try:
+                if self.is_leader:
+                    if not await self.renew():
+                        print(f"⚠️  Lost leadership ({self.token})")
+                        await self.step_down(on_lost)
+                elif await self.try_acquire():
+                    self.is_leader = True
+                    self.elections += 1
+                    print(f"👑 Elected leader ({self.token})")
+                    self.starting = asyncio.create_task(on_elected())
+
+                await asyncio.sleep(interval)
+
+            except asyncio.CancelledError:
+                if self.starting:
+                    self.starting.cancel()
+                await self.release()
+                raise
+            except Exception as e:
+                if self.is_leader and self.lease_expired():
+                    print(f"⚠️  Leadership lease expired ({self.token})")
+                    await self.step_down(on_lost)
+                await asyncio.sleep(interval)
@@ -0,0 +1,57 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+listener = None
+
+def get_logger(name):
+    global listener
+    logger = logging.getLogger(name)
+    if listener is None:
+        log_queue = queue.SimpleQueue()
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+
+        root = logging.getLogger('apex')
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(logging.INFO)
+        root.propagate = False
+    return logger
+
+class RateLimitedLog:
+    def __init__(self, logger, per_key_interval=30, max_per_second=20):
+        self.logger = logger
+        self.per_key_interval = per_key_interval
+        self.max_per_second = max_per_second
+        self.last_logged = {}
+        self.window_start = 0
+        self.window_count = 0
+        self.suppressed = 0
+
+    def info(self, key, message, now=None):
+        now = now or time.time()
+        if now - self.last_logged.get(key, 0) < self.per_key_interval:
+            self.suppressed += 1
+            return False
+
+        if now - self.window_start >= 1:
+            if self.suppressed:
+                self.logger.info(f"… {self.suppressed} log lines suppressed")
+                self.suppressed = 0
+            self.window_start = now
+            self.window_count = 0
+        if self.window_count >= self.max_per_second:
+            self.suppressed += 1
+            return False
+
+        self.window_count += 1
+        self.last_logged[key] = now
+        if len(self.last_logged) > 10000:
+            cutoff = now - self.per_key_interval
+            self.last_logged = {k: t for k, t in self.last_logged.items() if t > cutoff}
+        self.logger.info(message)
+        return True
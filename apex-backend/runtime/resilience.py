@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections import deque
+
+import aiohttp
+import numpy as np
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpen(Exception):
+    pass
+
+class UpstreamError(Exception):
+    pass
+
+def is_failure(status):
+    return status >= 500 or status == 429
+
+class LatencyTracker:
+    def __init__(self, samples=256, min_samples=20, refresh_every=16):
+        self.samples = deque(maxlen=samples)
+        self.min_samples = min_samples
+        self.refresh_every = refresh_every
+        self.pending = 0
+        self.quantiles = None
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.pending += 1
+        if self.pending >= self.refresh_every and len(self.samples) >= self.min_samples:
+            self.pending = 0
+            p50, p95, p99 = np.percentile(np.fromiter(self.samples, dtype=np.float64), [50, 95, 99])
+            self.quantiles = {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+    def quantile(self, name, default):
+        return self.quantiles[name] if self.quantiles else default
+
+class CircuitBreaker:
+    def __init__(self, window=20, error_rate=0.5, min_requests=10, cooldown=5.0, max_cooldown=60.0):
+        self.results = deque(maxlen=window)
+        self.error_rate = error_rate
+        self.min_requests = min_requests
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.stats = {'opened': 0, 'rejected': 0}
+
+    def allow(self, now=None):
+        if self.state == CLOSED:
+            return True
+        now = now or time.monotonic()
+        if self.state == OPEN and now - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        self.stats['rejected'] += 1
+        return False
+
+    def record(self, success, now=None):
+        if self.state == HALF_OPEN:
+            self.probing = False
+            if success:
+                self.state = CLOSED
+                self.cooldown = self.base_cooldown
+                self.results.clear()
+            else:
+                self.trip(now, min(self.cooldown * 2, self.max_cooldown))
+            return
+
+        self.results.append(success)
+        if self.state == CLOSED and len(self.results) >= self.min_requests:
+            failures = self.results.count(False)
+            if failures / len(self.results) >= self.error_rate:
+                self.trip(now, self.cooldown)
+
+    def trip(self, now, cooldown):
+        self.state = OPEN
+        self.opened_at = now or time.monotonic()
+        self.cooldown = cooldown
+        self.stats['opened'] += 1
+
+class ResilientClient:
+    def __init__(self, timeout_floor=0.3, timeout_ceiling=2.0, timeout_multiplier=3.0,
+                 hedge_delay=None, hedge_ratio=0.1):
+        self.timeout_floor = timeout_floor
+        self.timeout_ceiling = timeout_ceiling
+        self.timeout_multiplier = timeout_multiplier
+        self.default_hedge_delay = hedge_delay if hedge_delay is not None else timeout_ceiling / 4
+        self.hedge_ratio = hedge_ratio
+        self.latency = LatencyTracker()
+        self.endpoints = {}
+        self.stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'timeouts': 0, 'errors': 0, 'rejected': 0}
+
+    def endpoint(self, key):
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = (LatencyTracker(), CircuitBreaker())
+        return endpoint
+
+    @property
+    def timeout(self):
+        measured = self.latency.quantile('p99', self.timeout_ceiling / self.timeout_multiplier) * self.timeout_multiplier
+        return min(max(measured, self.timeout_floor), self.timeout_ceiling)
+
+    def can_hedge(self):
+        return self.stats['hedged'] < self.stats['requests'] * self.hedge_ratio + 1
+
+    async def attempt(self, session, url, headers, timeout):
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            return resp.status, resp.headers, await resp.read()
+
+    async def get(self, session, key, url, headers=None):
+        tracker, breaker = self.endpoint(key)
+        if not breaker.allow():
+            self.stats['rejected'] += 1
+            raise CircuitOpen(key)
+
+        self.stats['requests'] += 1
+        timeout = self.timeout
+        started = time.perf_counter()
+        primary = asyncio.create_task(self.attempt(session, url, headers, timeout))
+        tasks = {primary}
+        try:
+            hedge_delay = min(tracker.quantile('p95', self.default_hedge_delay), timeout)
+            done, pending = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done and self.can_hedge():
+                self.stats['hedged'] += 1
+                tasks.add(asyncio.create_task(self.attempt(session, url, headers, timeout)))
+
+            error = None
+            while tasks:
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None and not is_failure(task.result()[0]):
+                        if task is not primary:
+                            self.stats['hedge_wins'] += 1
+                        elapsed = time.perf_counter() - started
+                        tracker.record(elapsed)
+                        self.latency.record(elapsed)
+                        breaker.record(True)
+                        return task.result()
+                    error = task.exception() or UpstreamError(f"HTTP {task.result()[0]} from {url}")
+
+            if isinstance(error, asyncio.TimeoutError):
+                self.stats['timeouts'] += 1
+            else:
+                self.stats['errors'] += 1
+            breaker.record(False)
+            raise error
+        except asyncio.CancelledError:
+            breaker.probing = False
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            'timeout': self.timeout,
+            'latency': self.latency.quantiles,
+            'endpoints': {
+                str(key): {'state': breaker.state, 'latency': tracker.quantiles, **breaker.stats}
+                for key, (tracker, breaker) in self.endpoints.items()
+            }
+        }
@@ -0,0 +1,42 @@
+import asyncio
+import json
+import time
+
+SNAPSHOT_TTL = 10
+
+async def publish_snapshot(redis, name, data, ttl=SNAPSHOT_TTL):
+    await redis.setex(f"snapshot:{name}", ttl, json.dumps({'published_at': time.time(), **data}))
+
+async def read_snapshot(redis, name):
+    if redis is None:
+        return None
+    data = await redis.get(f"snapshot:{name}")
+    return json.loads(data) if data else None
+
+async def read_snapshots(redis, prefix):
+    if redis is None:
+        return []
+    keys = [key async for key in redis.scan_iter(match=f"snapshot:{prefix}*", count=100)]
+    if not keys:
+        return []
+    values = await redis.mget(keys)
+    return [json.loads(value) for value in values if value]
+
+async def snapshot_loop(redis, name, build, interval=0.5):
+    while True:
+        try:
+            if redis:
+                await publish_snapshot(redis, name, await build())
+            await asyncio.sleep(interval)
+        except Exception as e:
+            await asyncio.sleep(interval * 4)
+
+def merge_scanner_stats(snapshots):
+    return {
+        'tokens_scanned': sum(s.get('tokens_scanned', 0) for s in snapshots),
+        'opportunities_found': sum(s.get('opportunities_found', 0) for s in snapshots),
+        'active_opportunities': sum(s.get('active_opportunities', 0) for s in snapshots),
+        'scan_rate': sum(s.get('scan_rate', 0) for s in snapshots),
+        'uptime_seconds': max((s.get('uptime_seconds', 0) for s in snapshots), default=0),
+        'shards': len(snapshots)
+    }
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+def plan_scanner_shards(split, shards):
+    from scanner.providers import default_providers
+    providers = default_providers()
+
+    if split == 'provider':
+        return [{name: chains} for name, chains in providers.items()]
+
+    plan = [{} for _ in range(shards)]
+    slot = 0
+    for name, chains in providers.items():
+        for chain in chains:
+            plan[slot % shards].setdefault(name, []).append(chain)
+            slot += 1
+    return [shard for shard in plan if shard]
+
+def run_role(role, options):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    if role == 'api':
+        os.environ['APEX_ROLE'] = 'api'
+        import uvicorn
+        uvicorn.run("api.main:app", host=options['host'], port=options['port'])
+        return
+
+    asyncio.run(run_engine(role, options))
+
+async def run_engine(role, options):
+    if role == 'scanner':
+        from scanner.hyperscan import scanner
+        await scanner.init(providers=options['providers'], shard=options['shard'], hot_positions=options['hot_positions'])
+    elif role == 'predictor':
+        from brain.ai_predictor import predictor
+        await predictor.init(shard=options['shard'], shards=options['shards'], monitors=options['shard'] == 0)
+    elif role == 'executor':
+        from executor.trade_executor import executor
+        await executor.init()
+
+    print(f"⚙️  {role} worker started: {options}")
+    await asyncio.Event().wait()
+
+class Supervisor:
+    def __init__(self, split='provider', scanner_shards=3, predictors=1, host='0.0.0.0', port=8000):
+        self.context = multiprocessing.get_context('spawn')
+        self.specs = []
+        self.processes = {}
+        self.restarts = {}
+
+        for index, providers in enumerate(plan_scanner_shards(split, scanner_shards)):
+            name = f"scanner-{index}"
+            self.specs.append((name, 'scanner', {'providers': providers, 'shard': name, 'hot_positions': index == 0}))
+
+        for index in range(predictors):
+            self.specs.append((f"predictor-{index}", 'predictor', {'shard': index, 'shards': predictors}))
+
+        self.specs.append(('executor', 'executor', {}))
+        self.specs.append(('api', 'api', {'host': host, 'port': port}))
+
+    def start(self, name, role, options):
+        process = self.context.Process(target=run_role, args=(role, options), name=name, daemon=True)
+        process.start()
+        self.processes[name] = process
+
+    def run(self):
+        for name, role, options in self.specs:
+            self.start(name, role, options)
+            print(f"🚀 Started {name} (pid {self.processes[name].pid})")
+
+        try:
+            while True:
+                time.sleep(1)
+                for name, role, options in self.specs:
+                    process = self.processes[name]
+                    if process.is_alive():
+                        continue
+                    restarts = self.restarts.get(name, 0)
+                    delay = min(2 ** restarts, 30)
+                    print(f"⚠️  {name} exited with code {process.exitcode}, restarting in {delay}s")
+                    time.sleep(delay)
+                    self.restarts[name] = restarts + 1
+                    self.start(name, role, options)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for process in self.processes.values():
+                process.terminate()
+            for process in self.processes.values():
+                process.join(5)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the APEX pipeline as sharded worker processes")
+    parser.add_argument('--split', choices=['provider', 'chain'], default='provider')
+    parser.add_argument('--scanner-shards', type=int, default=3)
+    parser.add_argument('--predictors', type=int, default=1)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    Supervisor(args.split, args.scanner_shards, args.predictors, args.host, args.port).run()
@@ -0,0 +1,46 @@
+import time
+from contextlib import asynccontextmanager
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+class Warmup:
+    def __init__(self, stages=()):
+        self.started = time.time()
+        self.stages = {}
+        for name in stages:
+            self.add(name)
+
+    def add(self, name):
+        self.stages.setdefault(name, {'status': PENDING, 'seconds': None, 'error': None})
+
+    def mark(self, name, status, seconds=None, error=None):
+        self.add(name)
+        self.stages[name].update(status=status, seconds=seconds, error=error)
+
+    @asynccontextmanager
+    async def stage(self, name):
+        self.mark(name, RUNNING)
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.mark(name, FAILED, time.perf_counter() - started, repr(e))
+            raise
+        self.mark(name, DONE, time.perf_counter() - started)
+
+    @property
+    def ready(self):
+        return all(stage['status'] in (DONE, SKIPPED) for stage in self.stages.values())
+
+    def snapshot(self):
+        finished = sum(1 for stage in self.stages.values() if stage['status'] in (DONE, SKIPPED))
+        return {
+            'ready': self.ready,
+            'progress': finished / len(self.stages) if self.stages else 1.0,
+            'uptime_seconds': time.time() - self.started,
+            'stages': self.stages
+        }
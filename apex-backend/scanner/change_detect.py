@@ -0,0 +1,54 @@
+import time
+
+WRITE = 'write'
+TOUCH = 'touch'
+SKIP = 'skip'
+
+class ChangeDetector:
+    def __init__(self, ttl, price_threshold=0.01, liquidity_threshold=0.05,
+                 score_threshold=0.02, return_threshold=0.05, max_age=120):
+        self.ttl = ttl
+        self.price_threshold = price_threshold
+        self.liquidity_threshold = liquidity_threshold
+        self.score_threshold = score_threshold
+        self.return_threshold = return_threshold
+        self.max_age = max_age
+        self.touch_interval = ttl / 3
+        self.fingerprints = {}
+        self.stats = {'writes': 0, 'touches': 0, 'skips': 0}
+
+    def fingerprint(self, token):
+        return (token.opportunity_type, token.providers, token.price, token.liquidity,
+                token.confidence, token.expected_return)
+
+    def changed(self, previous, current):
+        if previous[0] != current[0] or previous[1] != current[1]:
+            return True
+        if abs(current[2] - previous[2]) > previous[2] * self.price_threshold:
+            return True
+        if abs(current[3] - previous[3]) > previous[3] * self.liquidity_threshold:
+            return True
+        if abs(current[4] - previous[4]) > self.score_threshold:
+            return True
+        return abs(current[5] - previous[5]) > self.return_threshold
+
+    def check(self, key, token, now=None):
+        now = now or time.time()
+        current = self.fingerprint(token)
+        entry = self.fingerprints.get(key)
+
+        if entry is None or now - entry[1] > self.max_age or self.changed(entry[0], current):
+            self.fingerprints[key] = [current, now, now]
+            self.stats['writes'] += 1
+            return WRITE
+
+        if now - entry[2] > self.touch_interval:
+            entry[2] = now
+            self.stats['touches'] += 1
+            return TOUCH
+
+        self.stats['skips'] += 1
+        return SKIP
+
+    def forget(self, key):
+        self.fingerprints.pop(key, None)
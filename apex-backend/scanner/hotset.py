@@ -0,0 +1,60 @@
+import time
+
+from runtime.ratelimit import RateLimiter
+
+class HotSet:
+    def __init__(self, batch_size=30, position_interval=0.5, min_interval=1.0, max_interval=10.0,
+                 base_rate=0.5, max_rate=5.0):
+        self.batch_size = batch_size
+        self.position_interval = position_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.base_rate = base_rate
+        self.max_rate = max_rate
+        self.entries = {}
+        self.limiter = RateLimiter(base_rate, max_rate)
+        self.stats = {'requests': 0, 'refreshed': 0, 'positions': 0, 'tracked': 0, 'rate': base_rate, 'lag_seconds': 0.0}
+
+    def interval_for(self, urgency):
+        return self.max_interval - (self.max_interval - self.min_interval) * min(max(urgency, 0), 10) / 10
+
+    def update(self, opportunities, positions, now=None):
+        now = now or time.time()
+        wanted = {token.address: self.interval_for(token.urgency) for token in opportunities}
+        for address in positions:
+            wanted[address] = self.position_interval
+
+        for address in [address for address in self.entries if address not in wanted]:
+            del self.entries[address]
+        for address, interval in wanted.items():
+            entry = self.entries.get(address)
+            if entry is None:
+                self.entries[address] = [interval, now]
+            else:
+                entry[0] = interval
+                entry[1] = min(entry[1], now + interval)
+
+        demand = sum(1 / interval for interval in wanted.values()) / self.batch_size
+        self.limiter.rate = min(max(demand, self.base_rate), self.max_rate)
+        self.stats.update(positions=len(positions), tracked=len(self.entries), rate=self.limiter.rate)
+
+    def next_batch(self, now=None):
+        now = now or time.time()
+        if not self.entries or min(entry[1] for entry in self.entries.values()) > now:
+            return []
+        ordered = sorted(self.entries.items(), key=lambda item: (item[1][1], item[1][0]))
+        batch = [address for address, entry in ordered[:self.batch_size]]
+        self.stats['lag_seconds'] = max(now - ordered[0][1][1], 0.0)
+        return batch
+
+    def mark(self, addresses, now=None):
+        now = now or time.time()
+        for address in addresses:
+            entry = self.entries.get(address)
+            if entry:
+                entry[1] = now + entry[0]
+        self.stats['requests'] += 1
+        self.stats['refreshed'] += len(addresses)
+
+    def get_stats(self):
+        return dict(self.stats)
@@ -3,27 +3,22 @@ import aiohttp
 import aioredis
 import json
 import time
-import numpy as np
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
-import logging
+from dataclasses import asdict
+import os
 
-@dataclass
-class Token:
-    address: str
-    symbol: str
-    price: float
-    change_1h: float
-    change_5m: float
-    volume_1h: float
-    liquidity: float
-    market_cap: float
-    momentum: float
-    confidence: float
-    opportunity_type: str
-    urgency: int
-    detected_at: float
-    expected_return: float
+from runtime.snapshots import snapshot_loop, read_snapshot
+from scanner.symbol_index import symbol_index
+from scanner.merge import TokenMerger
+from scanner.change_detect import ChangeDetector, WRITE, TOUCH
+from scanner.price_history import PriceHistory
+from scanner.providers import create_provider, default_providers
+from scanner.recorder import ScanRecorder
+from scanner.hotset import HotSet
+from runtime.archive import open_archive
+from runtime.logs import get_logger, RateLimitedLog
+
+TOKEN_TTL = 300
+PRICE_TTL = 60
 
 class HyperScanner:
     def __init__(self):
@@ -31,274 +26,184 @@ class HyperScanner:
         self.sessions = {}
         self.opportunities = {}
         self.stats = {'scanned': 0, 'found': 0, 'start': time.time()}
+        self.merger = TokenMerger()
+        self.price_history = PriceHistory(
+            max_tokens=int(os.getenv('PRICE_HISTORY_TOKENS', 4000)),
+            capacity=int(os.getenv('PRICE_HISTORY_SAMPLES', 256))
+        )
+        self.changes = ChangeDetector(TOKEN_TTL)
+        self.opportunity_log = RateLimitedLog(get_logger('apex.scanner'))
+        self.shard = 'main'
+        self.providers = default_providers()
+        self.adapters = {}
+        self.hot_adapter = None
+        self.recorder = None
+        self.archive = None
+        self.hotset = HotSet(
+            position_interval=float(os.getenv('POSITION_REFRESH_INTERVAL', 0.5)),
+            max_rate=float(os.getenv('HOTSET_MAX_RATE', 5))
+        )
+        self.hot_positions = True
+        self.position_source = None
         
-    async def init(self):
+    async def init(self, providers=None, shard='main', hot_positions=True):
         try:
             self.redis = aioredis.from_url("redis://localhost:6379")
             await self.redis.ping()
         except:
             pass
             
-        timeout = aiohttp.ClientTimeout(total=2)
+        if providers is not None:
+            self.providers = {name: list(chains) for name, chains in providers.items() if chains}
+        self.shard = shard
+        self.hot_positions = hot_positions
+        symbol_index.load()
+        if os.getenv('SCAN_RECORD_DIR'):
+            self.recorder = ScanRecorder(os.getenv('SCAN_RECORD_DIR'), shard)
+            asyncio.create_task(self.recorder.flush_loop())
+        self.archive = open_archive(f"scanner-{shard}")
+            
+        timeout = aiohttp.ClientTimeout(total=5)
         connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=30)
         
-        self.sessions['dex'] = aiohttp.ClientSession(connector=connector, timeout=timeout)
-        self.sessions['tools'] = aiohttp.ClientSession(connector=connector, timeout=timeout)
-        self.sessions['gecko'] = aiohttp.ClientSession(connector=connector, timeout=timeout)
-        
-        asyncio.create_task(self.scan_dexscreener())
-        asyncio.create_task(self.scan_dextools())
-        asyncio.create_task(self.scan_geckoterminal())
+        for name, chains in self.providers.items():
+            adapter = self.adapters[name] = create_provider(name, chains)
+            self.sessions[name] = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            asyncio.create_task(self.scan_provider(adapter))
+            
+        self.sessions['hot'] = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self.hot_adapter = create_provider('dex', [])
+        asyncio.create_task(self.hot_loop(self.hot_adapter))
         asyncio.create_task(self.cleanup_loop())
+        asyncio.create_task(symbol_index.snapshot_loop(shard))
+        asyncio.create_task(snapshot_loop(self.redis, f"scanner:{shard}", self.get_stats))
         
-    async def scan_dexscreener(self):
-        chains = ['ethereum', 'bsc', 'polygon', 'arbitrum', 'base', 'solana']
-        while True:
-            try:
-                for chain in chains:
-                    url = f"https://api.dexscreener.com/latest/dex/pairs/{chain}"
-                    async with self.sessions['dex'].get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            await self.process_dexscreener(data, chain)
-                await asyncio.sleep(0.1)
-            except Exception as e:
-                await asyncio.sleep(1)
-                
-    async def scan_dextools(self):
-        chains = ['ether', 'bsc', 'polygon']
-        while True:
+    async def close(self):
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+        
+    async def scan_provider(self, adapter):
+        session = self.sessions[adapter.name]
+        while not adapter.exhausted:
             try:
-                for chain in chains:
-                    url = f"https://api.dextools.io/v1/pairs/{chain}"
-                    async with self.sessions['tools'].get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            await self.process_dextools(data, chain)
-                await asyncio.sleep(0.2)
+                async for chain, data in adapter.fetch(session):
+                    records = adapter.changed(adapter.parse_timed(data, chain), time.time())
+                    if records:
+                        await self.process_records(adapter, records)
+                await asyncio.sleep(adapter.interval)
             except Exception as e:
-                await asyncio.sleep(2)
+                await asyncio.sleep(adapter.error_backoff)
                 
-    async def scan_geckoterminal(self):
-        networks = ['eth', 'bsc', 'polygon_pos', 'arbitrum_one']
+    async def held_positions(self):
+        if not self.hot_positions:
+            return []
+        if self.position_source:
+            return self.position_source()
+        snapshot = await read_snapshot(self.redis, 'executor') if self.redis else None
+        return [position['token_address'] for position in snapshot['positions']] if snapshot else []
+        
+    async def hot_loop(self, adapter):
+        session = self.sessions['hot']
+        refreshed_at = 0
         while True:
             try:
-                for network in networks:
-                    url = f"https://api.geckoterminal.com/api/v2/networks/{network}/trending_pools"
-                    async with self.sessions['gecko'].get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            await self.process_geckoterminal(data, network)
-                await asyncio.sleep(0.5)
-            except Exception as e:
-                await asyncio.sleep(3)
-                
-    async def process_dexscreener(self, data, chain):
-        if 'pairs' not in data:
-            return
-            
-        current_time = time.time()
-        for pair in data['pairs']:
-            try:
-                base_token = pair.get('baseToken', {})
-                address = base_token.get('address', '').lower()
-                if not address:
-                    continue
+                now = time.time()
+                if now - refreshed_at >= 1.0:
+                    self.hotset.update(list(self.opportunities.values()), await self.held_positions(), now)
+                    refreshed_at = now
                     
-                price = float(pair.get('priceUsd', 0))
-                if price <= 0:
+                batch = self.hotset.next_batch(now)
+                if not batch:
+                    await asyncio.sleep(0.05)
                     continue
                     
-                change_1h = float(pair.get('priceChange', {}).get('h1', 0))
-                volume_1h = float(pair.get('volume', {}).get('h1', 0))
-                liquidity = float(pair.get('liquidity', {}).get('usd', 0))
-                market_cap = float(pair.get('marketCap', 0))
-                
-                pair_created = pair.get('pairCreatedAt', 0)
-                is_new = pair_created and (current_time - pair_created/1000) < 3600
-                
-                change_5m = self.estimate_5m_change(change_1h, volume_1h)
-                momentum = self.calc_momentum(change_1h, change_5m, volume_1h, liquidity)
-                
-                if is_new and volume_1h > 5000 and liquidity > 10000:
-                    token = self.create_new_listing_token(pair, momentum, current_time)
-                    if token:
-                        await self.cache_token(token)
-                        
-                elif change_5m > 15 and volume_1h > 10000 and liquidity > 25000:
-                    token = self.create_momentum_token(pair, momentum, change_5m, current_time)
-                    if token:
-                        await self.cache_token(token)
-                        
-                self.stats['scanned'] += 1
-                
+                await self.hotset.limiter.acquire()
+                data = await adapter.fetch_batch(session, batch)
+                self.hotset.mark(batch, time.time())
+                if data:
+                    best = {}
+                    for record in adapter.parse_timed(data, ''):
+                        if record.liquidity >= getattr(best.get(record.address), 'liquidity', -1):
+                            best[record.address] = record
+                    await self.cache_prices(best.values())
+                    records = adapter.changed(list(best.values()), time.time())
+                    if records:
+                        await self.process_records(adapter, records)
             except Exception as e:
-                continue
+                await asyncio.sleep(adapter.error_backoff)
                 
-    async def process_dextools(self, data, chain):
-        if 'data' not in data:
+    async def cache_prices(self, records):
+        if not self.redis:
             return
-            
-        current_time = time.time()
-        for item in data['data']:
-            try:
-                address = item.get('id', '').lower()
-                if not address:
-                    continue
-                    
-                price = float(item.get('price', 0))
-                change_1h = float(item.get('variation1h', 0))
-                volume = float(item.get('volume', 0))
-                liquidity = float(item.get('liquidity', 0))
-                
-                if change_1h > 20 and volume > 15000:
-                    momentum = min((change_1h / 50) * (volume / 50000), 1.0)
-                    confidence = min(momentum * 0.8 + (liquidity / 100000) * 0.2, 0.95)
-                    
-                    if confidence > 0.7:
-                        token = Token(
-                            address=address,
-                            symbol=item.get('symbol', 'UNKNOWN'),
-                            price=price,
-                            change_1h=change_1h,
-                            change_5m=change_1h / 12,
-                            volume_1h=volume,
-                            liquidity=liquidity,
-                            market_cap=float(item.get('mcap', 0)),
-                            momentum=momentum,
-                            confidence=confidence,
-                            opportunity_type='DEXTOOLS_MOMENTUM',
-                            urgency=min(int(momentum * 10), 10),
-                            detected_at=current_time,
-                            expected_return=min(change_1h / 20, 2.0)
-                        )
-                        await self.cache_token(token)
-                        
-            except Exception as e:
-                continue
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        for record in records:
+            pipe.setex(f"price:{record.address}", PRICE_TTL, json.dumps({
+                'price': record.price, 'liquidity': record.liquidity, 'ts': now
+            }))
+        await pipe.execute()
+        
+    async def process(self, name, data, chain):
+        adapter = self.adapters.get(name) or self.adapters.setdefault(name, create_provider(name))
+        await self.process_records(adapter, adapter.parse_timed(data, chain))
                 
-    async def process_geckoterminal(self, data, network):
-        if 'data' not in data:
-            return
-            
+    async def process_records(self, adapter, records):
         current_time = time.time()
-        for pool in data['data']:
+        for record in records:
             try:
-                attrs = pool.get('attributes', {})
-                base_token = attrs.get('base_token_price_usd')
-                if not base_token:
-                    continue
+                symbol_index.observe(record.symbol, record.address, record.chain, record.liquidity, current_time)
+                self.price_history.record(record.address, current_time, record.price, record.volume_1h)
+                if self.recorder:
+                    self.recorder.record_price(record.address, record.price, current_time)
+                
+                change_5m = self.price_history.change(record.address, 300, current_time)
+                if change_5m is not None:
+                    record.change_5m = change_5m
                     
-                address = pool.get('relationships', {}).get('base_token', {}).get('data', {}).get('id', '').lower()
-                if not address:
-                    continue
+                token = adapter.classify(record, current_time)
+                if token:
+                    self.apply_history(token, current_time)
+                    await self.cache_token(token, record.provider)
                     
-                price_change_24h = float(attrs.get('price_change_percentage', {}).get('h24', 0))
-                volume_24h = float(attrs.get('volume_usd', {}).get('h24', 0))
+                self.stats['scanned'] += 1
                 
-                if abs(price_change_24h) > 30 and volume_24h > 20000:
-                    momentum = min(abs(price_change_24h) / 100, 1.0)
-                    confidence = min(momentum * 0.7 + (volume_24h / 100000) * 0.3, 0.9)
-                    
-                    if confidence > 0.75:
-                        token = Token(
-                            address=address,
-                            symbol=attrs.get('name', 'UNKNOWN'),
-                            price=float(base_token),
-                            change_1h=price_change_24h / 24,
-                            change_5m=price_change_24h / 288,
-                            volume_1h=volume_24h / 24,
-                            liquidity=float(attrs.get('reserve_in_usd', 0)),
-                            market_cap=0,
-                            momentum=momentum,
-                            confidence=confidence,
-                            opportunity_type='GECKO_TRENDING',
-                            urgency=min(int(momentum * 10), 10),
-                            detected_at=current_time,
-                            expected_return=min(abs(price_change_24h) / 50, 1.5)
-                        )
-                        await self.cache_token(token)
-                        
             except Exception as e:
                 continue
                 
-    def estimate_5m_change(self, change_1h, volume_1h):
-        if change_1h == 0:
-            return 0
-        volume_factor = min(volume_1h / 10000, 3.0)
-        return change_1h * volume_factor / 12
-        
-    def calc_momentum(self, change_1h, change_5m, volume_1h, liquidity):
-        price_momentum = abs(change_5m) / 20
-        volume_momentum = min(volume_1h / 50000, 1.0)
-        liquidity_factor = min(liquidity / 100000, 1.0)
-        return min(price_momentum * 0.5 + volume_momentum * 0.3 + liquidity_factor * 0.2, 1.0)
-        
-    def create_new_listing_token(self, pair, momentum, timestamp):
-        base_token = pair.get('baseToken', {})
-        address = base_token.get('address', '').lower()
-        
-        volume_1h = float(pair.get('volume', {}).get('h1', 0))
-        liquidity = float(pair.get('liquidity', {}).get('usd', 0))
-        
-        confidence = min(momentum * 0.7 + (liquidity / 100000) * 0.3, 0.95)
-        expected_return = min(volume_1h / liquidity, 5.0) if liquidity > 0 else 0
-        
-        return Token(
-            address=address,
-            symbol=base_token.get('symbol', 'UNKNOWN'),
-            price=float(pair.get('priceUsd', 0)),
-            change_1h=float(pair.get('priceChange', {}).get('h1', 0)),
-            change_5m=0,
-            volume_1h=volume_1h,
-            liquidity=liquidity,
-            market_cap=float(pair.get('marketCap', 0)),
-            momentum=momentum,
-            confidence=confidence,
-            opportunity_type='NEW_LISTING',
-            urgency=min(int(confidence * 10), 10),
-            detected_at=timestamp,
-            expected_return=expected_return
-        )
-        
-    def create_momentum_token(self, pair, momentum, change_5m, timestamp):
-        base_token = pair.get('baseToken', {})
-        address = base_token.get('address', '').lower()
-        
-        liquidity = float(pair.get('liquidity', {}).get('usd', 0))
-        confidence = min(momentum * 0.8 + (liquidity / 200000) * 0.2, 0.9)
-        expected_return = min(change_5m / 10, 3.0)
-        
-        return Token(
-            address=address,
-            symbol=base_token.get('symbol', 'UNKNOWN'),
-            price=float(pair.get('priceUsd', 0)),
-            change_1h=float(pair.get('priceChange', {}).get('h1', 0)),
-            change_5m=change_5m,
-            volume_1h=float(pair.get('volume', {}).get('h1', 0)),
-            liquidity=liquidity,
-            market_cap=float(pair.get('marketCap', 0)),
-            momentum=momentum,
-            confidence=confidence,
-            opportunity_type='MOMENTUM_BREAK',
-            urgency=min(int(momentum * 10), 10),
-            detected_at=timestamp,
-            expected_return=expected_return
-        )
-        
-    async def cache_token(self, token):
+    def apply_history(self, token, now):
+        history = self.price_history.metrics(token.address, now)
+        for field in ('change_1m', 'change_15m', 'volatility_5m', 'vwap_5m'):
+            if history[field] is not None:
+                setattr(token, field, history[field])
+        if history['change_5m'] is not None:
+            token.change_5m = history['change_5m']
+            
+    async def cache_token(self, token, provider='dex'):
         try:
+            token = self.merger.observe(token, provider)
             self.opportunities[token.address] = token
-            self.stats['found'] += 1
             
-            if self.redis:
-                await self.redis.setex(
-                    f"token:{token.address}",
-                    300,
-                    json.dumps(asdict(token))
+            action = self.changes.check(token.address, token)
+            if action == WRITE:
+                self.stats['found'] += 1
+                if self.recorder:
+                    self.recorder.record_token(token, token.detected_at)
+                data = asdict(token)
+                if self.archive:
+                    self.archive.append('scans', {**data, 'timestamp': time.time()})
+                if self.redis:
+                    await self.redis.setex(
+                        f"token:{token.address}",
+                        TOKEN_TTL,
+                        json.dumps(data)
+                    )
+                self.opportunity_log.info(
+                    token.address,
+                    f"🎯 {token.opportunity_type}: {token.symbol} ({token.confidence:.2f} confidence)"
                 )
-                
-            print(f"🎯 {token.opportunity_type}: {token.symbol} ({token.confidence:.2f} confidence)")
+            elif action == TOUCH and self.redis:
+                await self.redis.expire(f"token:{token.address}", TOKEN_TTL)
             
         except Exception as e:
             pass
@@ -315,9 +220,15 @@ class HyperScanner:
                         
                 for address in expired:
                     del self.opportunities[address]
+                    self.changes.forget(address)
                     if self.redis:
                         await self.redis.delete(f"token:{address}")
                         
+                self.merger.expire(900, current_time)
+                symbol_index.expire(current_time)
+                for adapter in filter(None, [*self.adapters.values(), self.hot_adapter]):
+                    adapter.expire(900, current_time)
+                        
                 await asyncio.sleep(60)
                 
             except Exception as e:
@@ -336,9 +247,20 @@ class HyperScanner:
         return {
             'tokens_scanned': self.stats['scanned'],
             'opportunities_found': self.stats['found'],
+            'merge': self.merger.stats,
+            'price_history': self.price_history.get_stats(),
+            'providers': {name: {**adapter.stats, 'client': adapter.client.get_stats()} for name, adapter in self.adapters.items()},
+            'hotset': {
+                **self.hotset.get_stats(),
+                'provider': {**self.hot_adapter.stats, 'client': self.hot_adapter.client.get_stats()} if self.hot_adapter else None
+            },
+            'writes': self.changes.stats,
+            'recorder': self.recorder.get_stats() if self.recorder else None,
+            'archive': self.archive.get_stats() if self.archive else None,
             'active_opportunities': len(self.opportunities),
             'scan_rate': self.stats['scanned'] / uptime if uptime > 0 else 0,
-            'uptime_seconds': uptime
+            'uptime_seconds': uptime,
+            'shard': self.shard
         }
 
 scanner = HyperScanner()
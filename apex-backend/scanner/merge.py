@@ -0,0 +1,78 @@
+import time
+from dataclasses import replace
+
+CHAIN_ALIASES = {
+    'ether': 'ethereum',
+    'eth': 'ethereum',
+    'polygon_pos': 'polygon',
+    'arbitrum_one': 'arbitrum'
+}
+
+def normalize_chain(chain):
+    chain = (chain or '').lower()
+    return CHAIN_ALIASES.get(chain, chain)
+
+def normalize_address(address):
+    address = (address or '').lower()
+    if '_' in address:
+        address = address.rsplit('_', 1)[1]
+    return address
+
+class TokenMerger:
+    def __init__(self, window=5.0, agreement_boost=0.05, max_confidence=0.98):
+        self.window = window
+        self.agreement_boost = agreement_boost
+        self.max_confidence = max_confidence
+        self.entries = {}
+        self.stats = {'observations': 0, 'merged': 0}
+
+    def observe(self, token, provider, now=None):
+        now = now or time.time()
+        chain = normalize_chain(token.chain)
+        address = normalize_address(token.address)
+        token = replace(token, chain=chain, address=address)
+        self.stats['observations'] += 1
+
+        entry = self.entries.get((chain, address))
+        if entry is None:
+            entry = self.entries[(chain, address)] = {'observations': {}, 'updated': now}
+        entry['observations'][provider] = (token, now)
+        entry['updated'] = now
+
+        for name, (observed, seen_at) in list(entry['observations'].items()):
+            if now - seen_at > self.window:
+                del entry['observations'][name]
+
+        if len(entry['observations']) > 1:
+            self.stats['merged'] += 1
+        return self.merge(entry['observations'])
+
+    def merge(self, observations):
+        tokens = [token for token, seen_at in observations.values()]
+        if len(tokens) == 1:
+            return tokens[0]
+
+        freshest = max(tokens, key=lambda t: t.detected_at)
+        strongest = max(tokens, key=lambda t: t.confidence)
+        agreement = self.agreement_boost * (len(tokens) - 1)
+
+        return replace(
+            freshest,
+            symbol=strongest.symbol if freshest.symbol == 'UNKNOWN' else freshest.symbol,
+            liquidity=max(t.liquidity for t in tokens),
+            volume_1h=max(t.volume_1h for t in tokens),
+            market_cap=max(t.market_cap for t in tokens),
+            momentum=max(t.momentum for t in tokens),
+            confidence=min(strongest.confidence + agreement, self.max_confidence),
+            opportunity_type=strongest.opportunity_type,
+            urgency=max(t.urgency for t in tokens),
+            expected_return=strongest.expected_return,
+            providers=len(tokens)
+        )
+
+    def expire(self, max_age, now=None):
+        now = now or time.time()
+        expired = [key for key, entry in self.entries.items() if now - entry['updated'] > max_age]
+        for key in expired:
+            del self.entries[key]
+        return len(expired)
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class Token:
+    address: str
+    symbol: str
+    price: float
+    change_1h: float
+    change_5m: float
+    volume_1h: float
+    liquidity: float
+    market_cap: float
+    momentum: float
+    confidence: float
+    opportunity_type: str
+    urgency: int
+    detected_at: float
+    expected_return: float
+    chain: str = ''
+    providers: int = 1
+    change_1m: float = 0.0
+    change_15m: float = 0.0
+    volatility_5m: float = 0.0
+    vwap_5m: float = 0.0
+
+@dataclass(slots=True)
+class PairRecord:
+    provider: str
+    chain: str
+    address: str
+    symbol: str
+    price: float
+    change_1h: float
+    change_5m: Optional[float]
+    change_24h: float
+    volume_1h: float
+    volume_24h: float
+    liquidity: float
+    market_cap: float
+    created_at: float
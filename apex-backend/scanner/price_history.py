@@ -0,0 +1,158 @@
+from collections import OrderedDict
+
+import numpy as np
+
+class PriceHistory:
+    def __init__(self, max_tokens=4000, capacity=256, min_interval=5.0):
+        self.max_tokens = max_tokens
+        self.capacity = capacity
+        self.min_interval = min_interval
+
+        self.ts = self.price = self.volume = self.cum_pv = self.cum_v = None
+        self.heads = self.counts = None
+        self.slots = OrderedDict()
+        self.free = None
+        self.stats = {'samples': 0, 'evictions': 0}
+
+    def allocate(self):
+        shape = (self.max_tokens, self.capacity)
+        self.ts = np.zeros(shape)
+        self.price = np.zeros(shape)
+        self.volume = np.zeros(shape)
+        self.cum_pv = np.zeros(shape)
+        self.cum_v = np.zeros(shape)
+        self.heads = [0] * self.max_tokens
+        self.counts = [0] * self.max_tokens
+        self.free = list(range(self.max_tokens - 1, -1, -1))
+
+    def slot_for(self, address):
+        slot = self.slots.get(address)
+        if slot is not None:
+            self.slots.move_to_end(address)
+            return slot
+
+        if self.free is None:
+            self.allocate()
+        if self.free:
+            slot = self.free.pop()
+        else:
+            evicted, slot = self.slots.popitem(last=False)
+            self.stats['evictions'] += 1
+        self.heads[slot] = 0
+        self.counts[slot] = 0
+        self.slots[address] = slot
+        return slot
+
+    def record(self, address, timestamp, price, volume=0.0):
+        if price <= 0:
+            return
+        slot = self.slot_for(address)
+        count = self.counts[slot]
+        head = self.heads[slot]
+        capacity = self.capacity
+
+        if count and timestamp // self.min_interval == self.ts[slot, (head - 1) % capacity] // self.min_interval:
+            index = (head - 1) % capacity
+            previous = (index - 1) % capacity if count > 1 else None
+        else:
+            index = head
+            previous = (head - 1) % capacity if count else None
+            self.heads[slot] = (head + 1) % capacity
+            self.counts[slot] = min(count + 1, capacity)
+
+        base_pv = self.cum_pv[slot, previous] if previous is not None else 0.0
+        base_v = self.cum_v[slot, previous] if previous is not None else 0.0
+        self.ts[slot, index] = timestamp
+        self.price[slot, index] = price
+        self.volume[slot, index] = volume
+        self.cum_pv[slot, index] = base_pv + price * volume
+        self.cum_v[slot, index] = base_v + volume
+        self.stats['samples'] += 1
+
+    def physical(self, slot, k):
+        return (self.heads[slot] - self.counts[slot] + k) % self.capacity
+
+    def locate(self, slot, timestamp):
+        count = self.counts[slot]
+        start = (self.heads[slot] - count) % self.capacity
+        ts = self.ts[slot]
+        if start + count <= self.capacity:
+            return int(np.searchsorted(ts[start:start + count], timestamp, 'right')) - 1
+
+        older = ts[start:]
+        k = int(np.searchsorted(older, timestamp, 'right'))
+        if k < len(older):
+            return k - 1
+        return len(older) + int(np.searchsorted(ts[:self.heads[slot]], timestamp, 'right')) - 1
+
+    def latest(self, address):
+        slot = self.slots.get(address)
+        if slot is None or not self.counts[slot]:
+            return None
+        index = (self.heads[slot] - 1) % self.capacity
+        return self.ts[slot, index], self.price[slot, index]
+
+    def change(self, address, seconds, now=None):
+        slot = self.slots.get(address)
+        if slot is None or self.counts[slot] < 2:
+            return None
+        last = (self.heads[slot] - 1) % self.capacity
+        now = now or self.ts[slot, last]
+
+        k = self.locate(slot, now - seconds)
+        if k < 0:
+            return None
+        start = self.physical(slot, k)
+        if now - self.ts[slot, start] > seconds * 1.5:
+            return None
+        return float((self.price[slot, last] / self.price[slot, start] - 1) * 100)
+
+    def window(self, slot, seconds, now):
+        count = self.counts[slot]
+        first = max(self.locate(slot, now - seconds), 0)
+        return (self.heads[slot] - count + np.arange(first, count)) % self.capacity
+
+    def volatility(self, address, seconds, now=None):
+        slot = self.slots.get(address)
+        if slot is None or self.counts[slot] < 3:
+            return None
+        now = now or self.ts[slot, (self.heads[slot] - 1) % self.capacity]
+        prices = self.price[slot, self.window(slot, seconds, now)]
+        if len(prices) < 3:
+            return None
+        return float(np.std(np.diff(np.log(prices))))
+
+    def vwap(self, address, seconds, now=None):
+        slot = self.slots.get(address)
+        if slot is None or not self.counts[slot]:
+            return None
+        last = (self.heads[slot] - 1) % self.capacity
+        now = now or self.ts[slot, last]
+
+        k = self.locate(slot, now - seconds)
+        if k >= 0:
+            start = self.physical(slot, k)
+            pv = self.cum_pv[slot, last] - self.cum_pv[slot, start]
+            v = self.cum_v[slot, last] - self.cum_v[slot, start]
+        else:
+            first = self.physical(slot, 0)
+            pv = self.cum_pv[slot, last] - self.cum_pv[slot, first] + self.price[slot, first] * self.volume[slot, first]
+            v = self.cum_v[slot, last] - self.cum_v[slot, first] + self.volume[slot, first]
+        return float(pv / v) if v > 0 else float(self.price[slot, last])
+
+    def metrics(self, address, now=None):
+        return {
+            'change_1m': self.change(address, 60, now),
+            'change_5m': self.change(address, 300, now),
+            'change_15m': self.change(address, 900, now),
+            'volatility_5m': self.volatility(address, 300, now),
+            'vwap_5m': self.vwap(address, 300, now)
+        }
+
+    def get_stats(self):
+        return {
+            **self.stats,
+            'tokens': len(self.slots),
+            'max_tokens': self.max_tokens,
+            'memory_bytes': 5 * self.ts.nbytes if self.ts is not None else 0
+        }
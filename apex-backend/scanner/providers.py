@@ -0,0 +1,423 @@
+import asyncio
+import hashlib
+import time
+
+import aiohttp
+import orjson
+
+from runtime.ratelimit import RateLimiter
+from runtime.resilience import ResilientClient, CircuitOpen, UpstreamError
+from scanner.models import Token, PairRecord
+from scanner.merge import normalize_address
+
+EMPTY = {}
+PROVIDERS = {}
+
+def register_provider(cls):
+    PROVIDERS[cls.name] = cls
+    return cls
+
+def create_provider(name, chains=None):
+    return PROVIDERS[name](chains)
+
+def default_providers():
+    return {name: list(cls.chains) for name, cls in PROVIDERS.items() if cls.enabled_by_default}
+
+def estimate_5m_change(change_1h, volume_1h):
+    if change_1h == 0:
+        return 0
+    volume_factor = min(volume_1h / 10000, 3.0)
+    return change_1h * volume_factor / 12
+
+def calc_momentum(change_1h, change_5m, volume_1h, liquidity):
+    price_momentum = abs(change_5m) / 20
+    volume_momentum = min(volume_1h / 50000, 1.0)
+    liquidity_factor = min(liquidity / 100000, 1.0)
+    return min(price_momentum * 0.5 + volume_momentum * 0.3 + liquidity_factor * 0.2, 1.0)
+
+class ProviderAdapter:
+    name = ''
+    chains = []
+    interval = 0.1
+    error_backoff = 1.0
+    requests_per_second = None
+    enabled_by_default = True
+    exhausted = False
+    rescore_interval = 30.0
+    batch_size = 0
+    timeout_floor = 0.3
+    timeout_ceiling = 2.0
+
+    def __init__(self, chains=None):
+        self.chains = list(chains) if chains is not None else list(self.chains)
+        self.limiter = RateLimiter(self.requests_per_second) if self.requests_per_second else None
+        self.client = ResilientClient(self.timeout_floor, self.timeout_ceiling)
+        self.validators = {}
+        self.body_hashes = {}
+        self.fingerprints = {}
+        self.stats = {
+            'requests': 0, 'records': 0, 'parse_seconds': 0.0,
+            'not_modified': 0, 'unchanged_bodies': 0, 'changed_pairs': 0, 'unchanged_pairs': 0
+        }
+
+    def requests(self):
+        raise NotImplementedError
+
+    def decode(self, body):
+        return orjson.loads(body)
+
+    def conditional_headers(self, url, now):
+        validators = self.validators.get(url)
+        if not validators or now - self.body_hashes.get(url, (None, 0))[1] >= self.rescore_interval:
+            return None
+        headers = {}
+        if validators[0]:
+            headers['If-None-Match'] = validators[0]
+        if validators[1]:
+            headers['If-Modified-Since'] = validators[1]
+        return headers
+
+    def body_changed(self, url, body, now):
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        previous = self.body_hashes.get(url)
+        if previous and previous[0] == digest and now - previous[1] < self.rescore_interval:
+            self.stats['unchanged_bodies'] += 1
+            return False
+        self.body_hashes[url] = (digest, now)
+        return True
+
+    async def fetch(self, session):
+        for chain, url in self.requests():
+            if self.limiter:
+                await self.limiter.acquire()
+            self.stats['requests'] += 1
+            now = time.time()
+            try:
+                status, headers, body = await self.client.get(session, chain, url, self.conditional_headers(url, now))
+            except (CircuitOpen, UpstreamError, asyncio.TimeoutError, aiohttp.ClientError):
+                continue
+            if status == 304:
+                self.stats['not_modified'] += 1
+                continue
+            if status != 200:
+                continue
+            etag = headers.get('ETag')
+            last_modified = headers.get('Last-Modified')
+            if etag or last_modified:
+                self.validators[url] = (etag, last_modified)
+            if self.body_changed(url, body, now):
+                yield chain, self.decode(body)
+
+    def batch_request(self, addresses):
+        raise NotImplementedError
+
+    async def fetch_batch(self, session, addresses):
+        self.stats['requests'] += 1
+        status, headers, body = await self.client.get(session, 'batch', self.batch_request(addresses))
+        return self.decode(body) if status == 200 else None
+
+    def changed(self, records, now):
+        fresh = []
+        fingerprints = self.fingerprints
+        for record in records:
+            key = (record.provider, record.chain, record.address)
+            fingerprint = (
+                record.price, record.change_1h, record.change_5m, record.change_24h,
+                record.volume_1h, record.volume_24h, record.liquidity, record.market_cap
+            )
+            previous = fingerprints.get(key)
+            if previous and previous[0] == fingerprint and now - previous[1] < self.rescore_interval:
+                continue
+            fingerprints[key] = (fingerprint, now)
+            fresh.append(record)
+        self.stats['changed_pairs'] += len(fresh)
+        self.stats['unchanged_pairs'] += len(records) - len(fresh)
+        return fresh
+
+    def expire(self, max_age, now=None):
+        now = now or time.time()
+        stale = [key for key, (fingerprint, scored_at) in self.fingerprints.items() if now - scored_at > max_age]
+        for key in stale:
+            del self.fingerprints[key]
+        return len(stale)
+
+    def parse(self, data, chain):
+        raise NotImplementedError
+
+    def parse_timed(self, data, chain):
+        started = time.perf_counter()
+        records = self.parse(data, chain)
+        self.stats['parse_seconds'] += time.perf_counter() - started
+        self.stats['records'] += len(records)
+        return records
+
+    def classify(self, record, now):
+        raise NotImplementedError
+
+@register_provider
+class DexScreenerAdapter(ProviderAdapter):
+    name = 'dex'
+    chains = ['ethereum', 'bsc', 'polygon', 'arbitrum', 'base', 'solana']
+    interval = 0.1
+    error_backoff = 1.0
+
+    batch_size = 30
+
+    def requests(self):
+        for chain in self.chains:
+            yield chain, f"https://api.dexscreener.com/latest/dex/pairs/{chain}"
+
+    def batch_request(self, addresses):
+        return f"https://api.dexscreener.com/latest/dex/tokens/{','.join(addresses)}"
+
+    def parse(self, data, chain):
+        records = []
+        append = records.append
+        for pair in data.get('pairs') or ():
+            try:
+                base = pair.get('baseToken') or EMPTY
+                address = (base.get('address') or '').lower()
+                if not address:
+                    continue
+                price = float(pair.get('priceUsd') or 0)
+                if price <= 0:
+                    continue
+
+                change = pair.get('priceChange') or EMPTY
+                volume = pair.get('volume') or EMPTY
+                change_5m = change.get('m5')
+                append(PairRecord(
+                    'dex',
+                    pair.get('chainId', chain),
+                    address,
+                    base.get('symbol') or 'UNKNOWN',
+                    price,
+                    float(change.get('h1') or 0),
+                    float(change_5m) if change_5m is not None else None,
+                    float(change.get('h24') or 0),
+                    float(volume.get('h1') or 0),
+                    float(volume.get('h24') or 0),
+                    float((pair.get('liquidity') or EMPTY).get('usd') or 0),
+                    float(pair.get('marketCap') or 0),
+                    (pair.get('pairCreatedAt') or 0) / 1000
+                ))
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return records
+
+    def classify(self, record, now):
+        if record.change_5m is None:
+            record.change_5m = estimate_5m_change(record.change_1h, record.volume_1h)
+        momentum = calc_momentum(record.change_1h, record.change_5m, record.volume_1h, record.liquidity)
+        is_new = record.created_at and (now - record.created_at) < 3600
+
+        if is_new and record.volume_1h > 5000 and record.liquidity > 10000:
+            confidence = min(momentum * 0.7 + (record.liquidity / 100000) * 0.3, 0.95)
+            return self.token(
+                record, momentum, confidence, 'NEW_LISTING',
+                min(int(confidence * 10), 10),
+                min(record.volume_1h / record.liquidity, 5.0),
+                now, change_5m=0
+            )
+
+        if record.change_5m > 15 and record.volume_1h > 10000 and record.liquidity > 25000:
+            confidence = min(momentum * 0.8 + (record.liquidity / 200000) * 0.2, 0.9)
+            return self.token(
+                record, momentum, confidence, 'MOMENTUM_BREAK',
+                min(int(momentum * 10), 10),
+                min(record.change_5m / 10, 3.0),
+                now
+            )
+        return None
+
+    def token(self, record, momentum, confidence, opportunity_type, urgency, expected_return, now, change_5m=None):
+        return Token(
+            address=record.address,
+            symbol=record.symbol,
+            price=record.price,
+            change_1h=record.change_1h,
+            change_5m=record.change_5m if change_5m is None else change_5m,
+            volume_1h=record.volume_1h,
+            liquidity=record.liquidity,
+            market_cap=record.market_cap,
+            momentum=momentum,
+            confidence=confidence,
+            opportunity_type=opportunity_type,
+            urgency=urgency,
+            detected_at=now,
+            expected_return=expected_return,
+            chain=record.chain
+        )
+
+@register_provider
+class DexToolsAdapter(ProviderAdapter):
+    name = 'tools'
+    chains = ['ether', 'bsc', 'polygon']
+    interval = 0.2
+    error_backoff = 2.0
+
+    def requests(self):
+        for chain in self.chains:
+            yield chain, f"https://api.dextools.io/v1/pairs/{chain}"
+
+    def parse(self, data, chain):
+        records = []
+        append = records.append
+        for item in data.get('data') or ():
+            try:
+                address = (item.get('id') or '').lower()
+                if not address:
+                    continue
+                change_1h = float(item.get('variation1h') or 0)
+                volume = float(item.get('volume') or 0)
+                append(PairRecord(
+                    'tools', chain, address, item.get('symbol') or 'UNKNOWN',
+                    float(item.get('price') or 0),
+                    change_1h, change_1h / 12, 0.0,
+                    volume, 0.0,
+                    float(item.get('liquidity') or 0),
+                    float(item.get('mcap') or 0),
+                    0.0
+                ))
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return records
+
+    def classify(self, record, now):
+        if record.change_1h <= 20 or record.volume_1h <= 15000:
+            return None
+        momentum = min((record.change_1h / 50) * (record.volume_1h / 50000), 1.0)
+        confidence = min(momentum * 0.8 + (record.liquidity / 100000) * 0.2, 0.95)
+        if confidence <= 0.7:
+            return None
+        return Token(
+            address=record.address,
+            symbol=record.symbol,
+            price=record.price,
+            change_1h=record.change_1h,
+            change_5m=record.change_5m,
+            volume_1h=record.volume_1h,
+            liquidity=record.liquidity,
+            market_cap=record.market_cap,
+            momentum=momentum,
+            confidence=confidence,
+            opportunity_type='DEXTOOLS_MOMENTUM',
+            urgency=min(int(momentum * 10), 10),
+            detected_at=now,
+            expected_return=min(record.change_1h / 20, 2.0),
+            chain=record.chain
+        )
+
+@register_provider
+class GeckoTerminalAdapter(ProviderAdapter):
+    name = 'gecko'
+    chains = ['eth', 'bsc', 'polygon_pos', 'arbitrum_one']
+    interval = 0.5
+    error_backoff = 3.0
+    timeout_floor = 0.5
+    timeout_ceiling = 3.0
+
+    def requests(self):
+        for network in self.chains:
+            yield network, f"https://api.geckoterminal.com/api/v2/networks/{network}/trending_pools"
+
+    def parse(self, data, network):
+        records = []
+        append = records.append
+        for pool in data.get('data') or ():
+            try:
+                attrs = pool.get('attributes') or EMPTY
+                price = attrs.get('base_token_price_usd')
+                if not price:
+                    continue
+                base = ((pool.get('relationships') or EMPTY).get('base_token') or EMPTY).get('data') or EMPTY
+                address = normalize_address(base.get('id'))
+                if not address:
+                    continue
+
+                change_24h = float((attrs.get('price_change_percentage') or EMPTY).get('h24') or 0)
+                volume_24h = float((attrs.get('volume_usd') or EMPTY).get('h24') or 0)
+                append(PairRecord(
+                    'gecko', network, address, (attrs.get('name') or 'UNKNOWN').split(' / ')[0],
+                    float(price),
+                    change_24h / 24, change_24h / 288, change_24h,
+                    volume_24h / 24, volume_24h,
+                    float(attrs.get('reserve_in_usd') or 0),
+                    0.0,
+                    0.0
+                ))
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return records
+
+    def classify(self, record, now):
+        if abs(record.change_24h) <= 30 or record.volume_24h <= 20000:
+            return None
+        momentum = min(abs(record.change_24h) / 100, 1.0)
+        confidence = min(momentum * 0.7 + (record.volume_24h / 100000) * 0.3, 0.9)
+        if confidence <= 0.75:
+            return None
+        return Token(
+            address=record.address,
+            symbol=record.symbol,
+            price=record.price,
+            change_1h=record.change_1h,
+            change_5m=record.change_5m,
+            volume_1h=record.volume_1h,
+            liquidity=record.liquidity,
+            market_cap=0,
+            momentum=momentum,
+            confidence=confidence,
+            opportunity_type='GECKO_TRENDING',
+            urgency=min(int(momentum * 10), 10),
+            detected_at=now,
+            expected_return=min(abs(record.change_24h) / 50, 1.5),
+            chain=record.chain
+        )
+
+@register_provider
+class ReplayAdapter(ProviderAdapter):
+    name = 'replay'
+    chains = ['data/replay.jsonl']
+    interval = 0.0
+    enabled_by_default = False
+
+    def __init__(self, chains=None, speed=1.0, loop=False):
+        super().__init__(chains)
+        self.speed = speed
+        self.loop = loop
+        self.delegates = {}
+        self.delegate = None
+
+    async def fetch(self, session):
+        for path in self.chains:
+            started = time.monotonic()
+            first_ts = None
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = orjson.loads(line)
+                    recorded_at = entry.get('timestamp')
+                    if recorded_at is not None and self.speed > 0:
+                        first_ts = first_ts if first_ts is not None else recorded_at
+                        delay = (recorded_at - first_ts) / self.speed - (time.monotonic() - started)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    self.stats['requests'] += 1
+                    self.delegate = self.delegate_for(entry['provider'])
+                    yield entry['chain'], entry['data']
+        if not self.loop:
+            self.exhausted = True
+
+    def delegate_for(self, name):
+        delegate = self.delegates.get(name)
+        if delegate is None:
+            delegate = self.delegates[name] = create_provider(name, [])
+        return delegate
+
+    def parse(self, data, chain):
+        return self.delegate.parse(data, chain)
+
+    def classify(self, record, now):
+        return self.delegates[record.provider].classify(record, now)
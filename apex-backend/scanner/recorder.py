@@ -0,0 +1,100 @@
+import asyncio
+import glob
+import gzip
+import os
+import time
+from dataclasses import asdict
+
+import orjson
+
+def hour_key(timestamp):
+    return time.strftime('%Y%m%d%H', time.gmtime(timestamp))
+
+class ScanRecorder:
+    def __init__(self, directory, shard='main', flush_interval=1.0, price_interval=5.0, track_seconds=7200):
+        self.directory = directory
+        self.shard = shard
+        self.flush_interval = flush_interval
+        self.price_interval = price_interval
+        self.track_seconds = track_seconds
+        self.buffer = []
+        self.tracked = {}
+        self.stats = {'tokens': 0, 'prices': 0, 'features': 0, 'flushes': 0, 'bytes': 0}
+
+    def record_token(self, token, now):
+        self.tracked[token.address] = [now, 0.0]
+        self.buffer.append((now, orjson.dumps({'kind': 'token', 'ts': now, 'token': asdict(token)})))
+        self.stats['tokens'] += 1
+
+    def record_price(self, address, price, now):
+        tracked = self.tracked.get(address)
+        if tracked is None or now - tracked[1] < self.price_interval:
+            return
+        tracked[1] = now
+        self.buffer.append((now, orjson.dumps({'kind': 'price', 'ts': now, 'address': address, 'price': price})))
+        self.stats['prices'] += 1
+
+    def record_features(self, address, price, horizon, features, now):
+        self.buffer.append((now, orjson.dumps({
+            'kind': 'features', 'ts': now, 'address': address, 'price': price,
+            'horizon': horizon, 'features': features.tolist()
+        })))
+        self.stats['features'] += 1
+
+    def expire(self, now):
+        stale = [address for address, (seen_at, sampled_at) in self.tracked.items() if now - seen_at > self.track_seconds]
+        for address in stale:
+            del self.tracked[address]
+
+    def write(self, lines):
+        os.makedirs(self.directory, exist_ok=True)
+        by_hour = {}
+        for timestamp, line in lines:
+            by_hour.setdefault(hour_key(timestamp), []).append(line)
+        written = 0
+        for hour, chunk in by_hour.items():
+            path = os.path.join(self.directory, f"scan-{hour}-{self.shard}.jsonl.gz")
+            data = b'\n'.join(chunk) + b'\n'
+            with gzip.open(path, 'ab', compresslevel=3) as f:
+                f.write(data)
+            written += len(data)
+        return written
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        lines, self.buffer = self.buffer, []
+        self.stats['bytes'] += await asyncio.to_thread(self.write, lines)
+        self.stats['flushes'] += 1
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+                self.expire(time.time())
+            except Exception as e:
+                await asyncio.sleep(self.flush_interval * 5)
+
+    def get_stats(self):
+        return {**self.stats, 'tracked': len(self.tracked), 'buffered': len(self.buffer)}
+
+def recorded_hours(directory):
+    hours = {}
+    for path in glob.glob(os.path.join(directory, 'scan-*.jsonl*')):
+        hours.setdefault(os.path.basename(path).split('-')[1], []).append(path)
+    return [sorted(hours[hour]) for hour in sorted(hours)]
+
+def read_hour(paths):
+    entries = []
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        entries.append(orjson.loads(line))
+            except (EOFError, orjson.JSONDecodeError):
+                pass
+    entries.sort(key=lambda entry: entry['ts'])
+    return entries
@@ -0,0 +1,173 @@
+import asyncio
+import glob
+import json
+import os
+import time
+
+class SymbolIndex:
+    def __init__(self, directory, snapshot_interval=60, max_age=21600, max_addresses=50000):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.max_age = max_age
+        self.max_addresses = max_addresses
+        self.by_symbol = {}
+        self.by_address = {}
+        self.best = {}
+        self.seen = {}
+        self.loaded = {}
+        self.dirty = False
+        self.saved_at = 0.0
+        self.stats = {'observed': 0, 'symbols': 0, 'addresses': 0, 'snapshots': 0, 'loaded': 0, 'evicted': 0}
+
+    def observe(self, symbol, address, chain, liquidity, now=None):
+        if not symbol or not address:
+            return
+        symbol = symbol.upper()
+        address = address.lower()
+        self.stats['observed'] += 1
+
+        entry = self.by_address.get(address)
+        if entry is not None and entry[0] != symbol:
+            self.discard(address)
+        self.seen[address] = now or time.time()
+
+        candidates = self.by_symbol.get(symbol)
+        if candidates is None:
+            candidates = self.by_symbol[symbol] = {}
+
+        previous = candidates.get(address)
+        if previous and previous[0] == chain and previous[1] == liquidity:
+            return
+
+        candidates[address] = (chain, liquidity)
+        self.by_address[address] = (symbol, chain)
+        self.dirty = True
+
+        best = self.best.get(symbol)
+        if best is None or best == address and previous and liquidity < previous[1]:
+            self.best[symbol] = max(candidates, key=lambda a: candidates[a][1])
+        elif liquidity > candidates[best][1]:
+            self.best[symbol] = address
+
+    def discard(self, address):
+        symbol, chain = self.by_address.pop(address)
+        self.seen.pop(address, None)
+        candidates = self.by_symbol[symbol]
+        del candidates[address]
+        if not candidates:
+            del self.by_symbol[symbol]
+            del self.best[symbol]
+        elif self.best[symbol] == address:
+            self.best[symbol] = max(candidates, key=lambda a: candidates[a][1])
+        self.dirty = True
+
+    def expire(self, now=None):
+        now = now or time.time()
+        cutoff = now - self.max_age
+        stale = [address for address, seen_at in self.seen.items() if seen_at < cutoff]
+        excess = len(self.seen) - len(stale) - self.max_addresses
+        if excess > 0:
+            stale_set = set(stale)
+            ranked = sorted(
+                (address for address in self.by_address if address not in stale_set),
+                key=lambda address: self.by_symbol[self.by_address[address][0]][address][1]
+            )
+            stale.extend(ranked[:excess])
+        for address in stale:
+            self.discard(address)
+        self.stats['evicted'] += len(stale)
+        return len(stale)
+
+    def resolve(self, symbol):
+        return self.best.get(symbol.upper())
+
+    def candidates(self, symbol, limit=5):
+        candidates = self.by_symbol.get(symbol.upper(), {})
+        ranked = sorted(candidates.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {'address': address, 'chain': chain, 'liquidity': liquidity}
+            for address, (chain, liquidity) in ranked[:limit]
+        ]
+
+    def symbol_for(self, address):
+        entry = self.by_address.get(address.lower())
+        return entry[0] if entry else None
+
+    def export(self):
+        return [
+            [symbol, address, chain, liquidity, self.seen.get(address, 0)]
+            for symbol, candidates in self.by_symbol.items()
+            for address, (chain, liquidity) in candidates.items()
+        ]
+
+    def write(self, name, entries):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.json")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'saved_at': time.time(), 'entries': entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self.loaded[path] = os.path.getmtime(path)
+
+    def read(self):
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                mtime = os.path.getmtime(path)
+                if self.loaded.get(path) == mtime:
+                    continue
+                with open(path) as f:
+                    snapshot = json.load(f)
+                snapshots.append((path, mtime, snapshot['saved_at'], snapshot['entries']))
+            except (OSError, ValueError, KeyError):
+                continue
+        return snapshots
+
+    def apply(self, snapshots):
+        cutoff = time.time() - self.max_age
+        loaded = 0
+        for path, mtime, saved_at, entries in snapshots:
+            for symbol, address, chain, liquidity, *seen_at in entries:
+                seen_at = seen_at[0] if seen_at else saved_at
+                if seen_at >= cutoff and seen_at >= self.seen.get(address, 0):
+                    self.observe(symbol, address, chain, liquidity, seen_at)
+                    loaded += 1
+            self.loaded[path] = mtime
+        self.stats['loaded'] += loaded
+        return loaded
+
+    def load(self):
+        return self.apply(self.read())
+
+    async def save(self, name):
+        entries = self.export()
+        self.dirty = False
+        self.saved_at = time.time()
+        await asyncio.to_thread(self.write, name, entries)
+        self.stats['snapshots'] += 1
+
+    async def refresh(self):
+        return self.apply(await asyncio.to_thread(self.read))
+
+    async def snapshot_loop(self, name):
+        while True:
+            try:
+                await asyncio.sleep(self.snapshot_interval)
+                if self.dirty or time.time() - self.saved_at > self.max_age / 4:
+                    await self.save(name)
+            except Exception as e:
+                await asyncio.sleep(self.snapshot_interval)
+
+    async def refresh_loop(self, interval=30):
+        while True:
+            try:
+                await self.refresh()
+                self.expire()
+                await asyncio.sleep(interval)
+            except Exception as e:
+                await asyncio.sleep(interval)
+
+    def get_stats(self):
+        return {**self.stats, 'symbols': len(self.by_symbol), 'addresses': len(self.by_address)}
+
+symbol_index = SymbolIndex(os.getenv('SYMBOL_INDEX_DIR', 'data/symbols'))
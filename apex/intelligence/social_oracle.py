@@ -6,10 +6,13 @@ import re
 from textblob import TextBlob
 from typing import Dict, List, Optional
 
+from intelligence.trending import TrendingDetector, viral_score
+
 class SocialOracle:
     def __init__(self):
         self.session = None
         self.sentiment_cache = {}
+        self.trending = TrendingDetector()
         self.viral_patterns = {
             'moon_keywords': ['moon', 'rocket', 'gem', 'pump', '100x', 'diamond hands'],
             'warning_keywords': ['rug', 'scam', 'dump', 'exit', 'dead'],
@@ -58,23 +61,41 @@ class SocialOracle:
                 await asyncio.sleep(90)
                 
     async def simulate_twitter_analysis(self):
-        """Simulate Twitter sentiment analysis for demo"""
+        """Simulate a Twitter stream for demo"""
         import random
         
-        # Simulate finding mentions of various tokens
+        # Simulate posts mentioning various tokens
         sample_tokens = ['PEPE', 'DOGE', 'SHIB', 'FLOKI', 'WOJAK']
+        sample_posts = ['${} to the moon 🚀', '${} looks like a gem', '${} is dumping, exit now', '${} breaking out']
         
         for token in sample_tokens:
-            sentiment_score = random.uniform(0.3, 0.9)
-            viral_velocity = random.uniform(0.1, 1.0)
-            
-            self.sentiment_cache[token] = {
-                'twitter_sentiment': sentiment_score,
-                'viral_velocity': viral_velocity,
-                'mention_count': random.randint(5, 100),
-                'last_updated': time.time()
-            }
+            for _ in range(random.randint(5, 100)):
+                self.ingest_post(random.choice(sample_posts).format(token))
+                
+    def ingest_post(self, text, now=None):
+        """Count token mentions in a post and update sentiment for trending tokens"""
+        now = now or time.time()
+        mentions = self.extract_token_mentions(text)['tokens']
+        if not mentions:
+            return
+        
+        sentiment = self.analyze_text_sentiment(text)
+        for token in mentions:
+            self.trending.add(token, now)
+            if not self.trending.is_trending(token):
+                continue
             
+            # Exponentially weighted sentiment, kept only for heavy hitters
+            data = self.sentiment_cache.get(token)
+            if data is None:
+                data = self.sentiment_cache[token] = {'twitter_sentiment': sentiment}
+            data['twitter_sentiment'] = data['twitter_sentiment'] * 0.9 + sentiment * 0.1
+            data['last_updated'] = now
+        
+        if len(self.sentiment_cache) > self.trending.top_k:
+            for token in [token for token in self.sentiment_cache if not self.trending.is_trending(token)]:
+                del self.sentiment_cache[token]
+                
     async def analyze_subreddit(self, subreddit):
         """Analyze Reddit subreddit for crypto sentiment"""
         try:
@@ -129,10 +150,13 @@ class SocialOracle:
         try:
             if token_symbol in self.sentiment_cache:
                 data = self.sentiment_cache[token_symbol]
+                trend = self.trending.get(token_symbol)
                 return {
                     'social_score': data.get('twitter_sentiment', 0.5),
-                    'viral_velocity': data.get('viral_velocity', 0.1),
-                    'mention_count': data.get('mention_count', 0),
+                    'viral_velocity': viral_score(trend),
+                    'mention_count': trend['mentions'],
+                    'mention_velocity': trend['velocity'],
+                    'mention_acceleration': trend['acceleration'],
                     'freshness': time.time() - data.get('last_updated', 0)
                 }
             
@@ -0,0 +1,124 @@
+import hashlib
+import math
+import time
+from array import array
+
+class TrendingDetector:
+    """Count-Min sketch over a ring of time buckets with a top-k heavy hitter set"""
+
+    def __init__(self, width=2048, depth=4, bucket_seconds=10, window_seconds=300, short_seconds=60, top_k=64):
+        self.width = width
+        self.depth = depth
+        self.bucket_seconds = bucket_seconds
+        self.buckets = max(int(window_seconds // bucket_seconds), 2)
+        self.short_buckets = min(max(int(short_seconds // bucket_seconds), 1), self.buckets // 2)
+        self.short_minutes = self.short_buckets * bucket_seconds / 60
+        self.bucket_size = depth * width
+        self.counts = array('i', bytes(4 * self.buckets * self.bucket_size))
+        self.window = array('q', bytes(8 * self.bucket_size))
+        self.empty_bucket = array('i', bytes(4 * self.bucket_size))
+        self.current = 0
+        self.epoch = None
+        self.top_k = top_k
+        self.heavy = {}  # ticker -> [cells, estimate]
+        self.floor = 0
+        self.stats = {'mentions': 0, 'rotations': 0, 'evictions': 0}
+
+    def cells(self, key):
+        """Counter offsets for a key within one bucket, one per sketch row"""
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return [row * self.width + int.from_bytes(digest[4 * row:4 * row + 4], 'little') % self.width
+                for row in range(self.depth)]
+
+    def advance(self, now):
+        """Rotate expired buckets out of the window"""
+        bucket = int(now // self.bucket_seconds)
+        if self.epoch is None:
+            self.epoch = bucket
+        steps = bucket - self.epoch
+        if steps <= 0:
+            return
+
+        for _ in range(min(steps, self.buckets)):
+            self.current = (self.current + 1) % self.buckets
+            start = self.current * self.bucket_size
+            for offset in range(self.bucket_size):
+                value = self.counts[start + offset]
+                if value:
+                    self.window[offset] -= value
+            self.counts[start:start + self.bucket_size] = self.empty_bucket
+        self.epoch = bucket
+        self.stats['rotations'] += 1
+
+        for key, entry in list(self.heavy.items()):
+            entry[1] = sum(self.series(entry[0]))
+            if not entry[1]:
+                del self.heavy[key]
+        self.floor = min(entry[1] for entry in self.heavy.values()) if len(self.heavy) >= self.top_k else 0
+
+    def series(self, cells):
+        """Per-bucket mention estimates for a key, oldest bucket first"""
+        result = []
+        for step in range(1, self.buckets + 1):
+            start = ((self.current + step) % self.buckets) * self.bucket_size
+            result.append(min(self.counts[start + cell] for cell in cells))
+        return result
+
+    def add(self, key, now=None, count=1):
+        """Record mentions of a ticker and update the heavy hitter set"""
+        self.advance(now or time.time())
+        cells = self.cells(key)
+        start = self.current * self.bucket_size
+        for cell in cells:
+            self.counts[start + cell] += count
+            self.window[cell] += count
+        self.stats['mentions'] += count
+
+        entry = self.heavy.get(key)
+        if entry is not None:
+            entry[1] += count
+            return
+        estimate = min(self.window[cell] for cell in cells)
+        if estimate <= self.floor:
+            return
+        if len(self.heavy) >= self.top_k:
+            weakest = min(self.heavy, key=lambda name: self.heavy[name][1])
+            if self.heavy[weakest][1] >= estimate:
+                self.floor = self.heavy[weakest][1]
+                return
+            del self.heavy[weakest]
+            self.stats['evictions'] += 1
+        self.heavy[key] = [cells, estimate]
+        if len(self.heavy) >= self.top_k:
+            self.floor = min(entry[1] for entry in self.heavy.values())
+
+    def describe(self, key, cells):
+        series = self.series(cells)
+        velocity = sum(series[-self.short_buckets:]) / self.short_minutes
+        previous = sum(series[-2 * self.short_buckets:-self.short_buckets]) / self.short_minutes
+        return {
+            'ticker': key,
+            'mentions': sum(series),
+            'velocity': velocity,
+            'acceleration': (velocity - previous) / self.short_minutes
+        }
+
+    def get(self, key, now=None):
+        """Mentions, velocity (per minute) and acceleration (per minute squared) for any ticker"""
+        self.advance(now or time.time())
+        entry = self.heavy.get(key)
+        return self.describe(key, entry[0] if entry else self.cells(key))
+
+    def is_trending(self, key):
+        return key in self.heavy
+
+    def top(self, limit=10, now=None):
+        """Heavy hitters ranked by mentions in the window"""
+        self.advance(now or time.time())
+        ranked = sorted(self.heavy.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [self.describe(key, cells) for key, (cells, estimate) in ranked]
+
+def viral_score(trend, scale=5.0):
+    """Map mention velocity and acceleration onto a 0-1 virality score"""
+    velocity = max(trend['velocity'] + max(trend['acceleration'], 0.0), 0.0)
+    return 1 - math.exp(-velocity / scale)